@@ -0,0 +1,78 @@
+"""
+DivyaDrishti Adaptive Resolution
+Picks the inference imgsz from a ladder to hold a per-frame latency budget
+"""
+
+import numpy as np
+import config
+
+class AdaptiveResolution:
+    def __init__(self, ladder=None, budget_ms=None, start_imgsz=None):
+        self.ladder = sorted(ladder or config.IMGSZ_LADDER)
+        self.budget = (budget_ms or config.LATENCY_BUDGET_MS) / 1000.0
+        self.window = config.IMGSZ_WINDOW_FRAMES
+        self.hold_frames = config.IMGSZ_HOLD_FRAMES
+        self.upscale_margin = config.IMGSZ_UPSCALE_MARGIN
+
+        start_imgsz = start_imgsz or config.EXPORT_IMGSZ
+        self.index = int(np.argmin([abs(size - start_imgsz) for size in self.ladder]))
+        self.frames_at_size = 0
+        self.changes = 0
+
+    @property
+    def imgsz(self):
+        """Current inference input size"""
+        return self.ladder[self.index]
+
+    def reset(self, start_imgsz=None):
+        """Return to the starting size and forget measurements"""
+        if start_imgsz is not None:
+            self.index = int(np.argmin([abs(size - start_imgsz) for size in self.ladder]))
+        self.frames_at_size = 0
+
+    def set_budget(self, budget_ms):
+        """Change the per-frame latency budget"""
+        self.budget = budget_ms / 1000.0
+
+    def update(self, inference_times):
+        """Step imgsz down or up from recent latency; returns the size for the next frame
+
+        Only samples taken at the current size are used, and a size is held for at
+        least IMGSZ_HOLD_FRAMES so backends don't recompile on every fluctuation.
+        """
+        self.frames_at_size += 1
+        if self.frames_at_size < max(self.hold_frames, self.window):
+            return self.imgsz
+
+        samples = inference_times[-min(self.frames_at_size, self.window):]
+        if not samples:
+            return self.imgsz
+        latency = float(np.median(samples))
+
+        if latency > self.budget and self.index > 0:
+            self._step(-1, latency)
+        elif self.index < len(self.ladder) - 1:
+            # Latency scales roughly with pixel count; step up only with headroom to spare
+            predicted = latency * (self.ladder[self.index + 1] / self.imgsz) ** 2
+            if predicted < self.budget * self.upscale_margin:
+                self._step(1, latency)
+        return self.imgsz
+
+    def _step(self, direction, latency):
+        """Move one rung along the ladder"""
+        previous = self.imgsz
+        self.index += direction
+        self.frames_at_size = 0
+        self.changes += 1
+        print(f"🔄 Inference size {previous} → {self.imgsz} "
+              f"(median {latency * 1000:.1f}ms, budget {self.budget * 1000:.0f}ms)")
+
+    def get_stats(self):
+        """Get controller state"""
+        return {
+            'imgsz': self.imgsz,
+            'ladder': list(self.ladder),
+            'budget_ms': self.budget * 1000,
+            'frames_at_size': self.frames_at_size,
+            'changes': self.changes
+        }
@@ -0,0 +1,192 @@
+"""
+DivyaDrishti Annotation Renderer
+Batched cyberpunk-style box and mask drawing with cached label sprites
+"""
+
+from collections import OrderedDict
+import cv2
+import numpy as np
+import config
+
+class AnnotationRenderer:
+    def __init__(self):
+        # Grey color scheme for all detections
+        self.color = (128, 128, 128)
+        self.box_thickness = 2
+        self.corner_length = 20
+        self.corner_thickness = 3
+
+        # Segmentation overlay
+        self.mask_color = config.SEGMENTATION_MASK_COLOR
+        self.mask_alpha = config.SEGMENTATION_MASK_ALPHA
+        self.mask_buffer = None
+
+        self.font = cv2.FONT_HERSHEY_SIMPLEX
+        self.font_scale = 0.6
+        self.font_thickness = 2
+
+        # (class_name, confidence percent) or track_id -> pre-rendered label sprite
+        self.label_cache = OrderedDict()
+        self.label_cache_size = config.ANNOTATION_LABEL_CACHE_SIZE
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Ring of reusable output buffers so consumers can hold a frame while the next one is drawn
+        self.buffers = []
+        self.buffer_index = 0
+
+    def render(self, frame, detections, reuse_buffer=True):
+        """Draw all detections onto a copy of frame (a ring buffer copy unless reuse_buffer is False)"""
+        canvas = self._next_buffer(frame) if reuse_buffer else np.empty_like(frame)
+        np.copyto(canvas, frame)
+
+        if len(detections) == 0:
+            return canvas
+
+        polygons = detections.extras.get('polygon')
+        if polygons is not None:
+            self._draw_masks(canvas, polygons)
+
+        boxes = detections.xyxy.astype(np.int32)
+        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+
+        # All box outlines in one call
+        rects = np.stack([
+            np.stack([x1, y1], axis=1),
+            np.stack([x2, y1], axis=1),
+            np.stack([x2, y2], axis=1),
+            np.stack([x1, y2], axis=1)
+        ], axis=1)
+        cv2.polylines(canvas, list(rects), True, self.color, self.box_thickness)
+
+        # All corner accents in one call - each corner is an open 3-point polyline
+        cv2.polylines(canvas, list(self._corner_polylines(x1, y1, x2, y2)), False,
+                      self.color, self.corner_thickness)
+
+        # Labels are blitted from cached sprites; a track ID is its own sprite in front of the label
+        track_ids = detections.extras.get('track_id')
+        for i in range(len(detections)):
+            sprite = self._get_label_sprite(detections.get_class_name(int(detections.cls[i])),
+                                            float(detections.conf[i]))
+            x, y = int(x1[i]), int(y1[i]) - sprite.shape[0] + 1
+            track_id = int(track_ids[i]) if track_ids is not None else -1
+            if track_id >= 0:
+                id_sprite = self._get_track_sprite(track_id)
+                self._blit(canvas, id_sprite, x, y)
+                x += id_sprite.shape[1] - 1  # Share the border column
+            self._blit(canvas, sprite, x, y)
+
+        return canvas
+
+    def _draw_masks(self, canvas, polygons):
+        """Blend all instance masks onto canvas in one pass over their common bounding region"""
+        contours = [np.round(polygon).astype(np.int32) for polygon in polygons if len(polygon) >= 3]
+        if not contours:
+            return
+
+        # Work only inside the union bounding box of all masks
+        points = np.concatenate(contours)
+        height, width = canvas.shape[:2]
+        left, top = np.clip(points.min(axis=0), 0, [width - 1, height - 1])
+        right, bottom = np.clip(points.max(axis=0) + 1, 1, [width, height])
+        if left >= right or top >= bottom:
+            return
+
+        roi = canvas[top:bottom, left:right]
+        mask = self._next_mask(bottom - top, right - left)
+        cv2.fillPoly(mask, contours, 255, offset=(-int(left), -int(top)))
+
+        blended = cv2.addWeighted(roi, 1 - self.mask_alpha,
+                                  np.full_like(roi, self.mask_color), self.mask_alpha, 0)
+        np.copyto(roi, blended, where=mask[:, :, None].astype(bool))
+        cv2.polylines(canvas, contours, True, self.mask_color, 1)
+
+    def _next_mask(self, height, width):
+        """Get a zeroed single-channel mask view, growing the shared buffer as needed"""
+        if self.mask_buffer is None or self.mask_buffer.shape[0] < height or self.mask_buffer.shape[1] < width:
+            capacity = self.mask_buffer.shape if self.mask_buffer is not None else (0, 0)
+            self.mask_buffer = np.zeros((max(height, capacity[0]), max(width, capacity[1])), dtype=np.uint8)
+        mask = self.mask_buffer[:height, :width]
+        mask.fill(0)
+        return mask
+
+    def _corner_polylines(self, x1, y1, x2, y2):
+        """Build (N * 4, 3, 2) corner accent polylines for all boxes"""
+        length = self.corner_length
+        corners = np.empty((len(x1), 4, 3, 2), dtype=np.int32)
+
+        # Top-left, top-right, bottom-left, bottom-right
+        for c, (cx, cy, dx, dy) in enumerate(((x1, y1, length, length),
+                                              (x2, y1, -length, length),
+                                              (x1, y2, length, -length),
+                                              (x2, y2, -length, -length))):
+            corners[:, c, 0, 0] = cx + dx
+            corners[:, c, 0, 1] = cy
+            corners[:, c, 1, 0] = cx
+            corners[:, c, 1, 1] = cy
+            corners[:, c, 2, 0] = cx
+            corners[:, c, 2, 1] = cy + dy
+
+        return corners.reshape(-1, 3, 2)
+
+    def _get_label_sprite(self, class_name, confidence):
+        """Get the label image for a class and rounded confidence, rendering it once"""
+        percent = int(round(confidence * 100))
+        return self._get_sprite((class_name, percent), f"{class_name} {percent}%")
+
+    def _get_track_sprite(self, track_id):
+        """Get the short "#id" image drawn in front of a tracked box's label"""
+        return self._get_sprite(track_id, f"#{track_id}")
+
+    def _get_sprite(self, key, text):
+        """Get a cached text sprite, rendering it on a miss"""
+        sprite = self.label_cache.get(key)
+        if sprite is not None:
+            self.label_cache.move_to_end(key)
+            self.cache_hits += 1
+            return sprite
+
+        self.cache_misses += 1
+        (label_width, label_height), _ = cv2.getTextSize(text, self.font, self.font_scale, self.font_thickness)
+
+        # Black background with a 1px border, text inset by 5px
+        sprite = np.zeros((label_height + 11, label_width + 11, 3), dtype=np.uint8)
+        cv2.rectangle(sprite, (0, 0), (label_width + 10, label_height + 10), self.color, 1)
+        cv2.putText(sprite, text, (5, label_height + 5), self.font, self.font_scale,
+                    self.color, self.font_thickness)
+
+        self.label_cache[key] = sprite
+        if len(self.label_cache) > self.label_cache_size:
+            self.label_cache.popitem(last=False)
+        return sprite
+
+    def _blit(self, canvas, sprite, x, y):
+        """Copy sprite onto canvas at (x, y), clipped to the canvas"""
+        height, width = sprite.shape[:2]
+        canvas_height, canvas_width = canvas.shape[:2]
+
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + width, canvas_width), min(y + height, canvas_height)
+        if left >= right or top >= bottom:
+            return
+
+        canvas[top:bottom, left:right] = sprite[top - y:bottom - y, left - x:right - x]
+
+    def _next_buffer(self, frame):
+        """Get the next output buffer from the ring, reallocating on shape change"""
+        if len(self.buffers) != config.ANNOTATION_BUFFER_COUNT or \
+                self.buffers[0].shape != frame.shape or self.buffers[0].dtype != frame.dtype:
+            self.buffers = [np.empty_like(frame) for _ in range(config.ANNOTATION_BUFFER_COUNT)]
+            self.buffer_index = 0
+
+        buffer = self.buffers[self.buffer_index]
+        self.buffer_index = (self.buffer_index + 1) % len(self.buffers)
+        return buffer
+
+    def get_stats(self):
+        """Get label cache statistics"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'cached_labels': len(self.label_cache),
+            'cache_hit_rate': self.cache_hits / total if total > 0 else 0
+        }
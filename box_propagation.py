@@ -0,0 +1,156 @@
+"""
+DivyaDrishti Box Propagation
+Keyframe scheduling and Lucas-Kanade optical-flow box propagation between keyframes
+"""
+
+import warnings
+import cv2
+import numpy as np
+import config
+from detections import Detections
+
+class KeyframePropagator:
+    def __init__(self, interval=None):
+        self.base_interval = interval or config.KEYFRAME_INTERVAL
+        self.min_interval = config.KEYFRAME_MIN_INTERVAL
+        self.max_interval = config.KEYFRAME_MAX_INTERVAL
+        self.grid = config.FLOW_GRID_SIZE
+        self.scale = config.FLOW_SCALE
+        self.min_confidence = config.FLOW_MIN_CONFIDENCE
+        self.max_fb_error = config.FLOW_MAX_FB_ERROR
+        self.motion_high = config.FLOW_MOTION_HIGH
+        self.motion_low = config.FLOW_MOTION_LOW
+
+        self.lk_params = dict(winSize=(15, 15), maxLevel=2,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.reset()
+
+    def reset(self):
+        """Drop propagation state so the next frame is a keyframe"""
+        self.interval = self.base_interval
+        self.prev_gray = None
+        self.detections = None
+        self.points = None  # (N, P, 2) tracked points per box, flow-scale coordinates
+        self.frames_since_keyframe = 0
+        self.last_confidence = 1.0
+        self.last_motion = 0.0
+        self.keyframes = 0
+        self.propagated_frames = 0
+
+    def _gray(self, frame):
+        """Downscaled grayscale frame for flow"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self.scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def _seed_points(self, xyxy):
+        """Grid of points over the inner half of each box, shape (N, grid*grid, 2)"""
+        steps = (np.arange(self.grid) + 0.5) / self.grid * 0.5 + 0.25  # inner 25%-75%
+        gx, gy = np.meshgrid(steps, steps)
+        offsets = np.stack([gx.ravel(), gy.ravel()], axis=1)  # (P, 2) in box units
+
+        boxes = xyxy * self.scale
+        origins = boxes[:, None, :2]
+        sizes = (boxes[:, 2:] - boxes[:, :2])[:, None, :]
+        return (origins + offsets[None] * sizes).astype(np.float32)
+
+    def needs_keyframe(self):
+        """Check if the next frame must run full inference"""
+        return (self.detections is None or
+                self.frames_since_keyframe >= self.interval or
+                self.last_confidence < self.min_confidence)
+
+    def set_keyframe(self, frame, detections):
+        """Start propagating from freshly inferred detections; marks them as observed"""
+        detections.with_extra('propagated', np.zeros(len(detections), dtype=bool))
+        self.prev_gray = self._gray(frame)
+        self.detections = detections
+        self.points = self._seed_points(detections.xyxy) if len(detections) else None
+        self.frames_since_keyframe = 0
+        self.last_confidence = 1.0
+        self.keyframes += 1
+        return detections
+
+    def propagate(self, frame):
+        """Move the last detections with the optical flow to this frame"""
+        gray = self._gray(frame)
+        self.frames_since_keyframe += 1
+        self.propagated_frames += 1
+
+        if self.points is None or len(self.detections) == 0:
+            self.prev_gray = gray
+            return self.detections
+
+        num_boxes, num_points = self.points.shape[:2]
+        p0 = self.points.reshape(-1, 1, 2)
+        p1, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, p0, None, **self.lk_params)
+        p0_back, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, p1, None, **self.lk_params)
+
+        # Forward-backward check rejects points that drifted
+        fb_error = np.linalg.norm(p0 - p0_back, axis=2).reshape(num_boxes, num_points)
+        good = (status.reshape(num_boxes, num_points) == 1) & \
+               (status_back.reshape(num_boxes, num_points) == 1) & \
+               (fb_error < self.max_fb_error)
+
+        p0 = p0.reshape(num_boxes, num_points, 2)
+        p1 = p1.reshape(num_boxes, num_points, 2)
+        with warnings.catch_warnings():
+            # Boxes with no good points give all-NaN rows; they are dropped below
+            warnings.simplefilter("ignore", RuntimeWarning)
+            displacement = np.where(good[..., None], p1 - p0, np.nan)
+            shift = np.nan_to_num(np.nanmedian(displacement, axis=1)) / self.scale  # (N, 2) frame pixels
+
+            # Scale change from the spread of the good points around their median
+            center0 = np.nanmedian(np.where(good[..., None], p0, np.nan), axis=1)[:, None]
+            center1 = np.nanmedian(np.where(good[..., None], p1, np.nan), axis=1)[:, None]
+            spread0 = np.linalg.norm(p0 - center0, axis=2)
+            spread1 = np.linalg.norm(p1 - center1, axis=2)
+            ratio = np.where(good & (spread0 > 1e-3), spread1 / np.maximum(spread0, 1e-3), np.nan)
+            box_scale = np.clip(np.nan_to_num(np.nanmedian(ratio, axis=1), nan=1.0), 0.8, 1.25)
+
+        box_confidence = good.mean(axis=1)
+        keep = box_confidence >= self.min_confidence
+
+        d = self.detections
+        centers = d.center + shift
+        half = (d.xyxy[:, 2:] - d.xyxy[:, :2]) * 0.5 * box_scale[:, None]
+        height, width = frame.shape[:2]
+        xyxy = np.clip(np.concatenate([centers - half, centers + half], axis=1),
+                       0, [width, height, width, height])
+
+        extras = dict(d.extras)
+        extras['propagated'] = np.ones(len(d), dtype=bool)
+        if 'polygon' in extras:
+            # Masks follow their box (translation only)
+            polygons = np.empty(len(d), dtype=object)
+            for i, polygon in enumerate(extras['polygon']):
+                polygons[i] = polygon + shift[i].astype(np.float32)
+            extras['polygon'] = polygons
+        propagated = Detections(xyxy, d.conf, d.cls, d.class_names, **extras)[keep]
+
+        # Adapt K: fast motion or unreliable flow means more frequent keyframes
+        self.last_motion = float(np.median(np.linalg.norm(shift, axis=1)))
+        self.last_confidence = float(box_confidence.mean())
+        if self.last_motion > self.motion_high or self.last_confidence < self.min_confidence:
+            self.interval = max(self.min_interval, self.interval - 1)
+        elif self.last_motion < self.motion_low and self.last_confidence > (1 + self.min_confidence) / 2:
+            self.interval = min(self.max_interval, self.interval + 1)
+
+        self.prev_gray = gray
+        self.detections = propagated
+        # Re-seed on the moved boxes so lost points don't accumulate
+        self.points = self._seed_points(propagated.xyxy) if len(propagated) else None
+        return propagated
+
+    def get_stats(self):
+        """Get keyframe interval and propagation quality"""
+        total = self.keyframes + self.propagated_frames
+        return {
+            'interval': self.interval,
+            'keyframes': self.keyframes,
+            'propagated_frames': self.propagated_frames,
+            'keyframe_ratio': self.keyframes / total if total else 0,
+            'flow_confidence': self.last_confidence,
+            'motion_px': self.last_motion
+        }
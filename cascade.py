@@ -0,0 +1,82 @@
+"""
+DivyaDrishti Cascade Detection
+Cheap gate model on every frame, larger model only where the gate sees candidates
+"""
+
+from collections import deque
+import numpy as np
+import config
+import utils
+
+class DetectionCascade:
+    def __init__(self, gate_model_key=None, gate_threshold=None, escalation=None):
+        self.gate_model_key = gate_model_key or config.CASCADE_GATE_MODEL
+        self.gate_threshold = gate_threshold if gate_threshold is not None else config.CASCADE_GATE_THRESHOLD
+        self.escalation = escalation or config.CASCADE_ESCALATION
+        self.crop_margin = config.CASCADE_CROP_MARGIN
+        self.min_crop = config.CASCADE_MIN_CROP
+        self.max_crops = config.CASCADE_MAX_CROPS
+        self.max_crop_area = config.CASCADE_MAX_CROP_AREA
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Forget escalation and cost statistics"""
+        self.frames = 0
+        self.escalated_frames = 0
+        self.escalated_crops = 0
+        self.full_frame_escalations = 0
+        self.gate_times = deque(maxlen=100)
+        self.final_times = deque(maxlen=100)  # 0 for frames the gate cleared
+
+    def plan_escalation(self, gate_detections, frame_shape):
+        """Decide what the final model runs on: None (nothing), "frame", or a list of crop rects"""
+        self.frames += 1
+        if len(gate_detections) == 0:
+            return None
+
+        self.escalated_frames += 1
+        if self.escalation == "frame":
+            self.full_frame_escalations += 1
+            return "frame"
+
+        height, width = frame_shape[:2]
+        boxes = gate_detections.xyxy
+        sizes = np.maximum(boxes[:, 2:] - boxes[:, :2], 1)
+
+        # Expand each candidate for context, never below the minimum crop edge
+        half = np.maximum(sizes * (0.5 + self.crop_margin), self.min_crop / 2)
+        centers = gate_detections.center
+        rects = np.concatenate([centers - half, centers + half], axis=1)
+        rects = np.clip(rects, 0, [width, height, width, height]).astype(np.int32)
+        rects = utils.merge_overlapping_rects(rects.tolist())
+
+        crop_area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+        if len(rects) > self.max_crops or crop_area > self.max_crop_area * width * height:
+            # Crops would cost about as much as the whole frame
+            self.full_frame_escalations += 1
+            return "frame"
+
+        self.escalated_crops += len(rects)
+        return rects
+
+    def record(self, gate_time, final_time):
+        """Record per-stage cost of one frame (seconds)"""
+        self.gate_times.append(gate_time)
+        self.final_times.append(final_time)
+
+    def get_stats(self):
+        """Get escalation rate and per-stage cost"""
+        avg_gate = (sum(self.gate_times) / len(self.gate_times)) * 1000 if self.gate_times else 0
+        avg_final = (sum(self.final_times) / len(self.final_times)) * 1000 if self.final_times else 0
+        escalated = [t for t in self.final_times if t > 0]
+        return {
+            'gate_model': self.gate_model_key,
+            'frames': self.frames,
+            'escalation_rate': self.escalated_frames / self.frames if self.frames else 0,
+            'full_frame_escalations': self.full_frame_escalations,
+            'escalated_crops': self.escalated_crops,
+            'avg_gate_ms': avg_gate,
+            'avg_final_ms_when_escalated': (sum(escalated) / len(escalated)) * 1000 if escalated else 0,
+            'avg_cost_ms': avg_gate + avg_final
+        }
@@ -67,6 +67,10 @@ AVAILABLE_MODELS = {
     }
 }
 
+# Model Registry (checksums and cached metadata for AVAILABLE_MODELS)
+MODEL_REGISTRY_FILE = BASE_DIR / "model_registry.json"
+MODEL_REGISTRY_VERIFY_HASH = False  # Re-hash on every load instead of trusting unchanged size/mtime
+
 # Default Model Settings
 DEFAULT_MODEL_KEY = "foottrail"
 CURRENT_MODEL = DEFAULT_MODEL_KEY
@@ -74,15 +78,118 @@ CONFIDENCE_THRESHOLD = 0.5
 IOU_THRESHOLD = 0.45
 MAX_DETECTIONS = 1000
 
+# Inference Backend
+INFERENCE_BACKEND = "pytorch"  # "pytorch", "onnx" (ONNX Runtime) or "openvino"
+EXPORT_CACHE_DIR = BASE_DIR / "model_cache"  # Exported artifacts keyed by weights hash and imgsz
+EXPORT_IMGSZ = 640  # Input size baked into exported models
+EXPORT_DYNAMIC = False  # Dynamic input shapes (needed for adaptive resolution on exported backends)
+BACKEND_PARITY_CHECK = True  # Compare exported model output with PyTorch after export
+PARITY_MIN_MATCH_RATIO = 0.9  # Fraction of boxes that must match the PyTorch reference
+PARITY_MAX_CONF_DELTA = 0.05  # Largest allowed confidence difference on matched boxes
+
+# INT8 Quantization (CPU deployments, calibrated on SAVED_VIDEOS_DIR footage)
+QUANTIZATION_DEFAULT_MODELS = ["foottrail", "yolov11n", "yolov11s"]
+QUANTIZATION_CALIBRATION_FRAMES = 200  # Frames sampled across recorded videos
+QUANTIZATION_BENCHMARK_FRAMES = 50  # Frames used to measure speedup and accuracy delta
+SHOW_QUANTIZED_MODELS = True  # List built INT8 variants in the model dropdown
+
+# Warm Model Pool (instant model switching)
+MODEL_POOL_MAX_MODELS = 3  # Maximum warmed models kept in memory
+MODEL_POOL_MEMORY_BUDGET_MB = 1024  # Evict least recently used models above this
+MODEL_POOL_PREWARM = True  # Pre-warm the next likely model in the background
+MODEL_POOL_PREWARM_FALLBACK = "yolov11n"  # Pre-warm target before any switch history exists
+
 # Detection Settings
 DETECTION_MODE = "detect"  # "detect" or "segment"
+SEGMENTATION_MODEL = "yolov11s_seg"  # Model used when segment mode is enabled on a detection model
+SEGMENTATION_MASK_COLOR = (255, 0, 128)  # BGR mask overlay color
+SEGMENTATION_MASK_ALPHA = 0.4  # Mask overlay opacity
 
 # Performance Settings
-SKIP_FRAMES = 1  # Process every frame for best quality
-MAX_FPS = 30
+SKIP_FRAMES = 1  # Minimum frames between detector passes (1 = every frame may be inferred)
+MAX_FPS = 30  # Playback rate for files without usable timestamps
+PLAYBACK_MODE = "native"  # Files: "native" (source timestamps) or "fast" (analyze as fast as possible); live never waits
+PACING_TOLERANCE_MS = 5  # A frame released later than this past its deadline counts as missed
+PACING_RESYNC_MS = 500  # Fallen this far behind, restart the playback clock instead of racing to catch up
+BATCH_MAX_SIZE = 8  # Maximum frames per batched forward pass
+BATCH_MAX_WAIT_MS = 15  # Longest a live frame waits for a micro-batch to fill
+ANNOTATION_LABEL_CACHE_SIZE = 1024  # Cached label sprites (class, confidence %)
+ANNOTATION_BUFFER_COUNT = 3  # Reusable annotated-frame buffers; a frame is valid until this many more are drawn
+PIPELINE_QUEUE_SIZE = 4  # Default bound of the queues between pipeline stages
+PIPELINE_POLICIES = {  # Backpressure when a stage's input queue is full: "block", "drop" or "coalesce"
+    "annotate": "block",
+    "display": "coalesce",  # Only the newest frame is worth showing (the display queue holds one)
+    "record": "block"  # Every detection is logged
+}
+DISPLAY_POLL_MS = 5  # How often the Tk main thread checks for a new frame to show
+
+# Tiled Inference (high-resolution drone footage)
+TILED_INFERENCE = False  # Split large frames into overlapping tiles
+TILE_SIZE = 640  # Tile edge in pixels (also the inference imgsz)
+TILE_OVERLAP = 0.2  # Fraction of tile shared with its neighbour
+TILE_INCLUDE_FULL_FRAME = True  # Add a downscaled full-frame view for large objects
+TILE_MIN_TEXTURE = 4.0  # Skip tiles whose gray std-dev is below this (sky, water)
+TILE_MIN_MOTION = 2.0  # Static tiles that were empty are skipped below this mean diff
+TILE_REFRESH_INTERVAL = 10  # Re-run skipped static tiles at least every N frames
+TILE_ANALYSIS_SCALE = 0.125  # Downscale used for texture/motion checks
 ENABLE_GPU = True
 DEVICE = "auto"  # "auto", "cpu", "cuda", "mps"
 
+# Multi-process Detection Service (detection_service.py)
+DETECTION_WORKERS = 2  # Detector processes
+DETECTION_RING_SLOTS = 0  # Shared-memory frame slots (0 = 2 per worker)
+DETECTION_MAX_FRAME_SHAPE = (1080, 1920, 3)  # Largest frame a ring slot holds
+DETECTION_WORKER_THREADS = 0  # Intra-op threads per worker (0 = CPU cores / workers)
+
+# Preprocessing
+PREALLOCATED_PREPROCESS = True  # Letterbox/normalize into reused buffers and pass a ready tensor to the model
+PREPROCESS_DEBUG = False  # Report buffer allocations after the first frame (steady state should be zero)
+
+# Cascade Detection (gate model screens every frame, active model runs only on candidates)
+CASCADE_MODE = False  # Start with the cascade on (also toggled from the GUI)
+CASCADE_GATE_MODEL = "yolov11n"  # Cheap screening model
+CASCADE_GATE_THRESHOLD = 0.15  # Low gate confidence that triggers escalation
+CASCADE_ESCALATION = "crops"  # "crops" (regions around candidates) or "frame"
+CASCADE_CROP_MARGIN = 0.5  # Context added around each candidate, relative to its size
+CASCADE_MIN_CROP = 160  # Minimum crop edge in pixels
+CASCADE_MAX_CROPS = 4  # More crops than this escalate the full frame instead
+CASCADE_MAX_CROP_AREA = 0.5  # Crops covering more than this share of the frame escalate the full frame
+
+# Keyframe Inference (optical-flow box propagation between keyframes)
+KEYFRAME_MODE = False
+KEYFRAME_INTERVAL = 5  # Starting K: full inference every K frames
+KEYFRAME_MIN_INTERVAL = 1
+KEYFRAME_MAX_INTERVAL = 10
+FLOW_GRID_SIZE = 4  # Tracked points per box = grid x grid
+FLOW_SCALE = 0.5  # Downscale factor for optical flow
+FLOW_MIN_CONFIDENCE = 0.5  # Share of points tracked reliably; below this a box is dropped / K shrinks
+FLOW_MAX_FB_ERROR = 1.0  # Forward-backward error (pixels at flow scale) for a reliable point
+FLOW_MOTION_HIGH = 8.0  # Median box motion (pixels/frame) that shrinks K
+FLOW_MOTION_LOW = 1.0  # Median box motion below which K grows
+
+# Adaptive Input Resolution
+ADAPTIVE_IMGSZ = False  # Pick imgsz from IMGSZ_LADDER to hold LATENCY_BUDGET_MS
+IMGSZ_LADDER = [320, 480, 640, 960]
+LATENCY_BUDGET_MS = 50  # Per-frame inference budget
+IMGSZ_WINDOW_FRAMES = 15  # Recent frames (at the current size) used for the latency estimate
+IMGSZ_HOLD_FRAMES = 30  # Minimum frames between size changes (hysteresis)
+IMGSZ_UPSCALE_MARGIN = 0.7  # Step up only if the predicted latency is below this share of the budget
+
+# Motion Gating (reuse last detections on static frames)
+MOTION_GATING = True
+MOTION_GATE_METHOD = "diff"  # "diff" (frame differencing) or "mog2" (background subtraction)
+MOTION_THRESHOLD = 0.01  # Fraction of changed pixels that triggers inference
+MOTION_PIXEL_THRESHOLD = 25  # Gray-level change for a pixel to count as changed
+MOTION_GATE_MAX_INTERVAL = 15  # Force a full inference at least every N frames
+MOTION_GATE_WIDTH = 160  # Analysis width of the downscaled frame
+
+# Detection Cache (per-video sidecar replayed when a file is analyzed again)
+DETECTION_CACHE = True
+DETECTION_CACHE_CONF_FLOOR = 0.1  # Boxes are stored down to this confidence; higher thresholds filter on replay
+DETECTION_CACHE_SIDECAR = True  # Store next to the video (falls back to DETECTION_CACHE_DIR if read-only)
+DETECTION_CACHE_DIR = BASE_DIR / "detection_cache"
+DETECTION_CACHE_REPLAY_MODE = "fast"  # Pacing of a file whose detections are already cached ("fast" = decode speed)
+
 # GUI Settings - Cyberpunk Theme
 CYBERPUNK_THEME = {
     "bg_color": "#0a0a0a",
@@ -95,6 +202,10 @@ CYBERPUNK_THEME = {
     "border_color": "#333333"
 }
 
+# Startup Settings
+FAST_START = True  # Show the window immediately and load torch/ultralytics and the model in the background
+STARTUP_LOG_FILE = LOGS_DIR / "startup_timings.jsonl"  # Per-launch startup phase timings
+
 # Window Settings
 WINDOW_WIDTH = 1600
 WINDOW_HEIGHT = 1000
@@ -104,6 +215,15 @@ RESIZABLE = True
 DEFAULT_DRONE_FEED = 0
 DEFAULT_STREAM_URL = "https://sample-videos.com/zip/10/mp4/SampleVideo_1280x720_1mb.mp4"
 SUPPORTED_FORMATS = [".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm"]
+CAPTURE_RING_SIZE = 3  # Frames decoded ahead of detection (live feeds drop the oldest when full)
+CAPTURE_BACKEND = "opencv"  # "opencv" (cv2.VideoCapture) or "ffmpeg" (subprocess into reused buffers)
+FFMPEG_BINARY = "ffmpeg"
+FFPROBE_BINARY = "ffprobe"
+FFMPEG_SCALE_WIDTH = 0  # Downscale inside ffmpeg to this width (0 = native size)
+FFMPEG_TARGET_FPS = 0  # Decimate inside ffmpeg to this frame rate (0 = native rate)
+FFMPEG_THREADS = 0  # Decoder threads (0 = ffmpeg's choice)
+FFMPEG_HWACCEL = ""  # e.g. "auto", "cuda", "vaapi" ("" = software decoding)
+FFMPEG_BUFFER_COUNT = 0  # Reused frame buffers for files (0 = enough for the capture ring and pipeline queues); live frames are copied
 
 # Logging Settings
 LOG_DETECTIONS = True
@@ -118,6 +238,8 @@ AUTO_SAVE_SCREENSHOTS = False
 # Performance Monitoring
 MONITOR_PERFORMANCE = True
 PERFORMANCE_LOG_INTERVAL = 5  # seconds
+STAGE_PROFILING = False  # Time capture/preprocess/forward/postprocess/annotate/display/log stages (also --profile or the performance panel)
+STAGE_PROFILING_WINDOW = 100  # Recent samples per stage used for averages
 
 # Advanced Features
 ENABLE_SEGMENTATION = True
@@ -131,10 +253,17 @@ TRAIL_CLASSES = [
 ]
 
 # Detection Zones (for trail-specific detection)
+# Polygons are (x, y) points normalized to 0-1 of the frame size. Inference runs only on
+# crops covering enabled zones; boxes are kept if their center lies in an enabled zone and
+# their confidence is scaled by that zone's weight (the highest weight wins on overlap).
+ZONE_INFERENCE = False  # Restrict inference to DETECTION_ZONES
 DETECTION_ZONES = {
-    "trail_center": {"enabled": True, "weight": 1.0},
-    "trail_edges": {"enabled": True, "weight": 0.8},
-    "off_trail": {"enabled": False, "weight": 0.3}
+    "trail_center": {"enabled": True, "weight": 1.0,
+                     "polygon": [(0.35, 0.0), (0.65, 0.0), (0.65, 1.0), (0.35, 1.0)]},
+    "trail_edges": {"enabled": True, "weight": 0.8,
+                    "polygon": [(0.2, 0.0), (0.8, 0.0), (0.8, 1.0), (0.2, 1.0)]},
+    "off_trail": {"enabled": False, "weight": 0.3,
+                  "polygon": [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]}
 }
 
 # Alert Settings
@@ -142,6 +271,15 @@ ENABLE_ALERTS = True
 ALERT_CONFIDENCE_THRESHOLD = 0.7
 ALERT_SOUND = True
 
+# Multi-Feed Surveillance (several drones sharing one model)
+MULTI_FEED_MAX_FEEDS = 9
+MULTI_FEED_BATCH_SIZE = 4  # Frames per shared forward pass; lower-weight feeds skip rounds in proportion to their weight
+MULTI_FEED_IDLE_MS = 2  # Scheduler back-off while no feed has a frame
+MULTI_FEED_TILE_SIZE = (400, 300)  # Grid tile (width, height)
+MULTI_FEED_REFRESH_MS = 50  # Grid redraw interval
+FEED_ALERT_PRIORITY_BOOST = 4.0  # Scheduling weight multiplier while a feed has an active alert
+FEED_ALERT_HOLD_SECONDS = 5.0  # How long an alert keeps its feed boosted
+
 # Export Settings
 EXPORT_FORMAT = "csv"
 INCLUDE_TIMESTAMPS = True
@@ -152,3 +290,5 @@ INCLUDE_CONFIDENCE = True
 USE_TRACKING = True
 ENABLE_SINGLE_SHOT_DETECTION = True
 CUSTOM_TRACKER_CONFIG = "divyadrishti_tracker.yaml"
+TRACKER_REID_BUDGET_MS = 5.0  # Suspend ReID feature extraction when a frame exceeds this
+TRACKER_REID_COOLDOWN_FRAMES = 30  # Frames to run IoU-only association after exceeding the budget
@@ -0,0 +1,172 @@
+"""
+DivyaDrishti Detection Cache
+Per-video binary sidecar of raw detections, indexed by frame number, for instant re-analysis
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+import numpy as np
+import config
+from detections import Detections
+
+MAGIC = b"DDCACHE1"
+RECORD_HEADER = struct.Struct("<IH")  # frame number, detection count
+DETECTION_DTYPE = np.dtype([('xyxy', '<f4', 4), ('conf', '<f4'), ('cls', '<u2')])
+
+def calculate_video_hash(video_path, sample_size=1024 * 1024):
+    """Content hash of a video from its size and samples at the start, middle and end
+
+    Sortie videos are gigabytes; sampling keeps opening a cache instant while
+    still changing whenever the file is re-encoded or trimmed.
+    """
+    size = os.path.getsize(video_path)
+    sha256 = hashlib.sha256(str(size).encode())
+    with open(video_path, 'rb') as f:
+        for offset in (0, max(0, size // 2 - sample_size // 2), max(0, size - sample_size)):
+            f.seek(offset)
+            sha256.update(f.read(sample_size))
+    return sha256.hexdigest()
+
+class DetectionCache:
+    def __init__(self, path, key, class_names):
+        self.path = Path(path)
+        self.key = key
+        self.class_names = list(class_names)
+        self.conf_floor = key['conf_floor']
+
+        self.index = {}  # frame_number -> structured detection array
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._load_or_create()
+        self.file = open(self.path, 'ab')
+
+    @classmethod
+    def open(cls, video_path, model_hash, class_names, confidence_threshold, iou_threshold=None,
+             frame_format=None):
+        """Open (or start) the sidecar cache for a video and model
+
+        A cache recorded at a confidence floor at or below the requested
+        threshold is reused; a lower threshold starts a new recording.
+        frame_format (width, height, fps) separates decoders that scale or
+        decimate, since frame numbers and box coordinates depend on it.
+        """
+        iou_threshold = iou_threshold if iou_threshold is not None else config.IOU_THRESHOLD
+        key = {
+            'video_sha256': calculate_video_hash(video_path),
+            'model_sha256': model_hash,
+            'iou': round(float(iou_threshold), 4),
+            'conf_floor': round(float(min(confidence_threshold, config.DETECTION_CACHE_CONF_FLOOR)), 4)
+        }
+        format_tag = ""
+        if frame_format is not None:
+            key['frame_format'] = [round(float(value), 3) for value in frame_format]
+            format_tag = "." + hashlib.sha256(json.dumps(key['frame_format']).encode()).hexdigest()[:8]
+
+        name = f"{Path(video_path).name}.{key['video_sha256'][:12]}.{model_hash[:12]}{format_tag}.iou{key['iou']}.dets"
+        path = Path(video_path).with_name(name)
+        if not config.DETECTION_CACHE_SIDECAR or not os.access(path.parent, os.W_OK):
+            path = Path(config.DETECTION_CACHE_DIR) / name
+
+        existing = cls.read_header(path)
+        if existing is not None and existing['key']['conf_floor'] <= confidence_threshold:
+            key['conf_floor'] = existing['key']['conf_floor']
+        return cls(path, key, class_names)
+
+    @staticmethod
+    def read_header(path):
+        """Read a cache file header, or None if missing or unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                (length,) = struct.unpack("<I", f.read(4))
+                return json.loads(f.read(length))
+        except Exception:
+            return None
+
+    def _load_or_create(self):
+        """Index an existing matching cache, or start a new file"""
+        header = self.read_header(self.path)
+        if header is not None and header['key'] == self.key:
+            self._load_records()
+            print(f"✓ Detection cache: {len(self.index)} frames from {self.path.name}")
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header_bytes = json.dumps({'key': self.key, 'class_names': self.class_names}).encode()
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        print(f"📝 Recording detection cache: {self.path.name}")
+
+    def _load_records(self):
+        """Scan the append-only records into a frame index"""
+        data = self.path.read_bytes()
+        (length,) = struct.unpack_from("<I", data, len(MAGIC))
+        offset = len(MAGIC) + 4 + length
+        while offset + RECORD_HEADER.size <= len(data):
+            frame_number, count = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            end = start + count * DETECTION_DTYPE.itemsize
+            if end > len(data):
+                break  # Truncated by an interrupted run
+            self.index[frame_number] = np.frombuffer(data, DETECTION_DTYPE, count, start)
+            offset = end
+
+    def get(self, frame_number, confidence_threshold):
+        """Get cached detections for a frame filtered to a threshold, or None on a miss
+
+        A closed cache (detached by a model switch mid-frame) always misses.
+        """
+        if confidence_threshold < self.conf_floor:
+            self.misses += 1
+            return None
+
+        with self.lock:
+            records = None if self.file.closed else self.index.get(frame_number)
+        if records is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        records = records[records['conf'] >= confidence_threshold]
+        return Detections(records['xyxy'], records['conf'], records['cls'], self.class_names)
+
+    def put(self, frame_number, detections):
+        """Append a frame's raw detections (at or above the floor) to the cache"""
+        if frame_number in self.index:
+            return
+        keep = detections.conf >= self.conf_floor
+        records = np.empty(int(keep.sum()), dtype=DETECTION_DTYPE)
+        records['xyxy'] = detections.xyxy[keep]
+        records['conf'] = detections.conf[keep]
+        records['cls'] = detections.cls[keep]
+
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(RECORD_HEADER.pack(frame_number, len(records)) + records.tobytes())
+            self.index[frame_number] = records
+
+    def close(self):
+        """Flush and close the cache file"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def get_stats(self):
+        """Get cache hit statistics"""
+        total = self.hits + self.misses
+        return {
+            'path': str(self.path),
+            'cached_frames': len(self.index),
+            'conf_floor': self.conf_floor,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0
+        }
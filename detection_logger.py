@@ -56,7 +56,7 @@ class DetectionLogger:
             'bbox': detection['bbox'],
             'center': detection['center'],
             'area': detection['area'],
-            'detection_mode': config.DETECTION_MODE
+            'detection_mode': "propagated" if detection.get('propagated') else config.DETECTION_MODE
         }
 
         # Add to memory
@@ -72,6 +72,38 @@ class DetectionLogger:
         if len(self.detections) > config.MAX_LOG_ENTRIES:
             self.detections = self.detections[-config.MAX_LOG_ENTRIES:]
 
+    def log_detections(self, detections, frame_number=0, session_id="default"):
+        """Log all detections of a frame with a single CSV write"""
+        if not config.LOG_DETECTIONS or len(detections) == 0:
+            return
+
+        timestamp = datetime.now().isoformat()
+        log_entries = []
+        for detection in detections:
+            log_entries.append({
+                'timestamp': timestamp,
+                'session_id': session_id,
+                'frame_number': frame_number,
+                'object_class': detection['class_name'],
+                'confidence': detection['confidence'],
+                'bbox': detection['bbox'],
+                'center': detection['center'],
+                'area': detection['area'],
+                # Boxes moved by optical flow between keyframes are not observations
+                'detection_mode': "propagated" if detection.get('propagated') else config.DETECTION_MODE
+            })
+            if 'polygon' in detection:
+                # Mask outline only (JSON export), never a full-frame mask
+                log_entries[-1]['mask_polygon'] = detection['polygon'].round().astype(int).tolist()
+            self._update_session_stats(detection)
+
+        self.detections.extend(log_entries)
+        self._write_rows_to_csv(log_entries)
+
+        # Keep only recent detections in memory
+        if len(self.detections) > config.MAX_LOG_ENTRIES:
+            self.detections = self.detections[-config.MAX_LOG_ENTRIES:]
+
     def _update_session_stats(self, detection):
         """Update session statistics"""
         self.session_stats['total_detections'] += 1
@@ -87,10 +119,14 @@ class DetectionLogger:
 
     def _write_to_csv(self, log_entry):
         """Write log entry to CSV file"""
+        self._write_rows_to_csv([log_entry])
+
+    def _write_rows_to_csv(self, log_entries):
+        """Write several log entries to the CSV file in one open"""
         try:
             with open(self.log_file, 'a', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
-                writer.writerow([
+                writer.writerows([
                     log_entry['timestamp'],
                     log_entry['session_id'],
                     log_entry['frame_number'],
@@ -104,7 +140,7 @@ class DetectionLogger:
                     log_entry['center'][1],  # center_y
                     log_entry['area'],
                     log_entry['detection_mode']
-                ])
+                ] for log_entry in log_entries)
         except Exception as e:
             print(f"✗ Error writing to CSV log: {e}")
 
@@ -0,0 +1,384 @@
+"""
+DivyaDrishti Detection Service
+Multi-process detector workers fed through a shared-memory frame ring
+
+Usage:
+  python detection_service.py <video_file> [num_workers]
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+import config
+from detections import Detections
+
+def _worker_main(worker_id, shm_name, slot_shape, num_slots, task_queue, result_queue,
+                 model_key, num_threads):
+    """Worker process: read frames from the shared ring, return compact detection arrays"""
+    # Thread limits must be set before torch/OpenCV create their pools
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(num_threads)
+
+    import cv2
+    import torch
+    torch.set_num_threads(num_threads)
+    cv2.setNumThreads(num_threads)
+
+    # One model per worker, no background pre-warming of others
+    config.MODEL_POOL_PREWARM = False
+    from object_detector import MultiModelDetector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((num_slots,) + tuple(slot_shape), dtype=np.uint8, buffer=shm.buf)
+
+    try:
+        detector = MultiModelDetector()
+        if model_key and model_key != detector.current_model_key:
+            detector.switch_model(model_key)
+        result_queue.put(('ready', worker_id, list(detector.class_names)))
+
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            if task[0] == 'switch_model':
+                detector.switch_model(task[1])
+                result_queue.put(('model', worker_id, list(detector.class_names)))
+                continue
+
+            _, frame_number, slot, height, width, confidence_threshold = task
+            frame = ring[slot, :height, :width]
+
+            try:
+                start_time = time.perf_counter()
+                _, detections = detector.detect(frame, confidence_threshold=confidence_threshold,
+                                                enable_tracking=False, annotate=False)
+                inference_time = time.perf_counter() - start_time
+            except Exception as e:
+                # One bad frame (or a transient CUDA OOM) must not take the worker down
+                result_queue.put(('failed', worker_id, frame_number, slot, str(e)))
+                continue
+
+            result_queue.put(('result', worker_id, frame_number, slot,
+                              detections.xyxy, detections.conf, detections.cls,
+                              detections.extras, inference_time))
+    except Exception as e:
+        result_queue.put(('error', worker_id, str(e)))
+    finally:
+        del ring
+        shm.close()
+
+class DetectionService:
+    """N detector processes behind a shared-memory ring, results returned in frame order
+
+    Pixels never go through a pipe: the parent copies each frame into a free
+    ring slot and sends only (frame number, slot, shape). Workers run with
+    tracking off because consecutive frames land on different processes - run
+    an ObjectTracker on the ordered output if IDs are needed.
+
+    A frame whose detection fails is delivered with empty detections (and
+    counted in failed_frames) so ordering moves on; a worker that dies has
+    its frames failed the same way and gets no further work.
+    """
+
+    def __init__(self, num_workers=None, model_key=None, num_slots=None, max_frame_shape=None,
+                 threads_per_worker=None):
+        self.num_workers = num_workers or config.DETECTION_WORKERS
+        self.model_key = model_key or config.DEFAULT_MODEL_KEY
+        self.num_slots = num_slots or config.DETECTION_RING_SLOTS or 2 * self.num_workers
+        self.slot_shape = tuple(max_frame_shape or config.DETECTION_MAX_FRAME_SHAPE)
+        if threads_per_worker is None:
+            threads_per_worker = config.DETECTION_WORKER_THREADS or \
+                max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.threads_per_worker = threads_per_worker
+
+        self.context = mp.get_context("spawn")  # CUDA and torch state can't be forked safely
+        self.shm = None
+        self.ring = None
+        self.workers = []
+        self.task_queues = []
+        self.result_queue = None
+        self.collector_thread = None
+        self.running = False
+
+        # Slot bookkeeping (parent side only)
+        self.free_slots = queue.Queue()
+        self.in_flight = {}  # worker_id -> frames currently assigned (live workers only)
+        self.assigned = {}  # worker_id -> {frame_number: slot} awaiting a reply
+        self.class_names = {}  # worker_id -> class names of its active model
+        self.next_submit = 0
+
+        # Ordered reassembly
+        self.completed = {}  # frame_number -> Detections
+        self.next_deliver = 0
+        self.condition = threading.Condition()
+
+        # Statistics
+        self.worker_frames = {}
+        self.inference_times = deque(maxlen=100)
+        self.errors = deque(maxlen=20)
+        self.failed_frames = 0
+        self.dead_workers = set()
+
+    def start(self, timeout=120):
+        """Create the ring, spawn workers and wait until every model is loaded"""
+        if self.running:
+            return True
+
+        slot_bytes = int(np.prod(self.slot_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes * self.num_slots)
+        self.ring = np.ndarray((self.num_slots,) + self.slot_shape, dtype=np.uint8, buffer=self.shm.buf)
+        for slot in range(self.num_slots):
+            self.free_slots.put(slot)
+
+        self.result_queue = self.context.Queue()
+        for worker_id in range(self.num_workers):
+            task_queue = self.context.Queue()
+            process = self.context.Process(
+                target=_worker_main,
+                args=(worker_id, self.shm.name, self.slot_shape, self.num_slots, task_queue,
+                      self.result_queue, self.model_key, self.threads_per_worker),
+                daemon=True
+            )
+            process.start()
+            self.workers.append(process)
+            self.task_queues.append(task_queue)
+            self.in_flight[worker_id] = 0
+            self.assigned[worker_id] = {}
+            self.worker_frames[worker_id] = 0
+
+        print(f"🔄 Starting {self.num_workers} detector workers "
+              f"({self.threads_per_worker} threads each, {self.num_slots} ring slots)...")
+        deadline = time.time() + timeout
+        while len(self.class_names) < self.num_workers:
+            try:
+                message = self.result_queue.get(timeout=max(0.1, deadline - time.time()))
+            except queue.Empty:
+                print("✗ Detector workers did not start in time")
+                self.stop()
+                return False
+            if message[0] == 'ready':
+                self.class_names[message[1]] = message[2]
+            elif message[0] == 'error':
+                print(f"✗ Detector worker {message[1]} failed: {message[2]}")
+                self.stop()
+                return False
+
+        self.running = True
+        self.collector_thread = threading.Thread(target=self._collect_results, daemon=True)
+        self.collector_thread.start()
+        print(f"✓ Detection service ready with {self.num_workers} workers")
+        return True
+
+    def stop(self):
+        """Stop workers and release the shared ring"""
+        self.running = False
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+        for process in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if self.collector_thread:
+            self.collector_thread.join(timeout=1)
+
+        self.workers = []
+        self.task_queues = []
+        self.collector_thread = None
+        self.ring = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+        with self.condition:
+            self.condition.notify_all()
+
+    def switch_model(self, model_key):
+        """Switch the model in every worker"""
+        self.model_key = model_key
+        for task_queue in self.task_queues:
+            task_queue.put(('switch_model', model_key))
+
+    def submit(self, frame, confidence_threshold=None, timeout=None):
+        """Copy a frame into a free ring slot and dispatch it; returns its frame number
+
+        Blocks while all slots are in use (backpressure from the workers).
+        """
+        if not self.running:
+            raise RuntimeError("Detection service is not running")
+
+        height, width = frame.shape[:2]
+        if height > self.slot_shape[0] or width > self.slot_shape[1]:
+            raise ValueError(f"Frame {width}x{height} exceeds ring slot "
+                             f"{self.slot_shape[1]}x{self.slot_shape[0]}")
+
+        slot = self.free_slots.get(timeout=timeout)
+        self.ring[slot, :height, :width] = frame
+
+        if confidence_threshold is None:
+            confidence_threshold = config.CONFIDENCE_THRESHOLD
+
+        with self.condition:
+            if not self.in_flight:
+                self.free_slots.put(slot)
+                raise RuntimeError("No detector workers left")
+            frame_number = self.next_submit
+            self.next_submit += 1
+            worker_id = min(self.in_flight, key=self.in_flight.get)
+            self.in_flight[worker_id] += 1
+            self.assigned[worker_id][frame_number] = slot
+
+        self.task_queues[worker_id].put(('detect', frame_number, slot, height, width, confidence_threshold))
+        return frame_number
+
+    def _collect_results(self):
+        """Receive worker results, free their slots and store them for ordered delivery"""
+        while self.running:
+            try:
+                message = self.result_queue.get(timeout=0.1)
+            except queue.Empty:
+                # A crashed process (segfault, OOM kill) sends nothing
+                for worker_id, process in enumerate(self.workers):
+                    if self.running and worker_id not in self.dead_workers and not process.is_alive():
+                        self._worker_died(worker_id, f"exited with code {process.exitcode}")
+                continue
+            except (EOFError, OSError):
+                break
+
+            kind, worker_id = message[0], message[1]
+            if kind == 'model':
+                self.class_names[worker_id] = message[2]
+                continue
+            if kind == 'error':
+                self._worker_died(worker_id, message[2])
+                continue
+            if kind == 'failed':
+                _, _, frame_number, slot, error = message
+                print(f"✗ Detector worker {worker_id} failed on frame {frame_number}: {error}")
+                self.errors.append((worker_id, error))
+                self._complete(worker_id, frame_number, slot, None)
+                continue
+
+            _, _, frame_number, slot, xyxy, conf, cls, extras, inference_time = message
+            detections = Detections(xyxy, conf, cls, self.class_names.get(worker_id), **extras)
+            self._complete(worker_id, frame_number, slot, detections, inference_time)
+
+    def _complete(self, worker_id, frame_number, slot, detections, inference_time=None):
+        """Free a frame's slot and store its result (None = failed, delivered as empty)"""
+        with self.condition:
+            if self.assigned[worker_id].pop(frame_number, None) is None:
+                return  # Already failed when the worker was declared dead
+            if worker_id in self.in_flight:
+                self.in_flight[worker_id] -= 1
+            if detections is None:
+                self.failed_frames += 1
+                detections = Detections.empty(self.class_names.get(worker_id))
+            else:
+                self.worker_frames[worker_id] += 1
+                self.inference_times.append(inference_time)
+            self.completed[frame_number] = detections
+            self.condition.notify_all()
+        self.free_slots.put(slot)
+
+    def _worker_died(self, worker_id, error):
+        """Stop routing to a dead worker and fail the frames it still held"""
+        print(f"✗ Detector worker {worker_id} failed: {error}")
+        self.errors.append((worker_id, error))
+        with self.condition:
+            self.dead_workers.add(worker_id)
+            self.in_flight.pop(worker_id, None)
+            orphaned = list(self.assigned[worker_id].items())
+            if not self.in_flight:
+                print("✗ All detector workers have failed")
+        for frame_number, slot in orphaned:
+            self._complete(worker_id, frame_number, slot, None)
+
+    def get_result(self, timeout=None):
+        """Get the next (frame_number, detections) in submission order"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.next_deliver in self.completed or not self.running,
+                                           timeout=timeout):
+                raise TimeoutError(f"Frame {self.next_deliver} not ready")
+            if self.next_deliver not in self.completed:
+                raise RuntimeError("Detection service stopped")
+
+            frame_number = self.next_deliver
+            self.next_deliver += 1
+            return frame_number, self.completed.pop(frame_number)
+
+    def pending(self):
+        """Number of submitted frames not yet delivered"""
+        with self.condition:
+            return self.next_submit - self.next_deliver
+
+    def get_stats(self):
+        """Get per-worker throughput and latency"""
+        with self.condition:
+            return {
+                'workers': self.num_workers,
+                'threads_per_worker': self.threads_per_worker,
+                'ring_slots': self.num_slots,
+                'in_flight': dict(self.in_flight),
+                'dead_workers': sorted(self.dead_workers),
+                'failed_frames': self.failed_frames,
+                'frames_per_worker': dict(self.worker_frames),
+                'reorder_buffer': len(self.completed),
+                'avg_inference_time': (sum(self.inference_times) / len(self.inference_times)) * 1000
+                if self.inference_times else 0
+            }
+
+def main():
+    """Measure service throughput on a video file"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    import cv2
+
+    video_path = sys.argv[1]
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else config.DETECTION_WORKERS
+
+    service = DetectionService(num_workers=num_workers)
+    if not service.start():
+        return
+
+    cap = cv2.VideoCapture(video_path)
+    frames = 0
+    detections_total = 0
+    start_time = time.perf_counter()
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            service.submit(frame)
+            # Keep every slot busy, draining results in order as they complete
+            while service.pending() >= service.num_slots:
+                _, detections = service.get_result()
+                frames += 1
+                detections_total += len(detections)
+        while service.pending():
+            _, detections = service.get_result()
+            frames += 1
+            detections_total += len(detections)
+    finally:
+        cap.release()
+        elapsed = time.perf_counter() - start_time
+        stats = service.get_stats()
+        service.stop()
+
+    print(f"✓ {frames} frames in {elapsed:.1f}s ({frames / elapsed:.1f} FPS) with {num_workers} workers, "
+          f"{detections_total} detections")
+    print(f"  Frames per worker: {stats['frames_per_worker']}, "
+          f"avg inference {stats['avg_inference_time']:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+DivyaDrishti Detection Results
+Compact NumPy-backed container for per-frame detections
+"""
+
+from collections.abc import Mapping
+import numpy as np
+
+def polygon_array(polygons):
+    """Pack variable-length (K, 2) contours into a 1-D object array (one entry per detection)"""
+    packed = np.empty(len(polygons), dtype=object)
+    for i, polygon in enumerate(polygons):
+        packed[i] = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+    return packed
+
+class DetectionView(Mapping):
+    """Read-only dict view of a single detection, built lazily from the parent arrays"""
+
+    __slots__ = ('_detections', '_index')
+
+    BASE_KEYS = ('bbox', 'confidence', 'class_id', 'class_name', 'area', 'center')
+
+    def __init__(self, detections, index):
+        self._detections = detections
+        self._index = index
+
+    def __getitem__(self, key):
+        d = self._detections
+        i = self._index
+
+        if key == 'bbox':
+            return [int(v) for v in d.xyxy[i]]
+        if key == 'confidence':
+            return float(d.conf[i])
+        if key == 'class_id':
+            return int(d.cls[i])
+        if key == 'class_name':
+            return d.get_class_name(int(d.cls[i]))
+        if key == 'area':
+            return float(d.area[i])
+        if key == 'center':
+            return float(d.center[i, 0]), float(d.center[i, 1])
+        if key in d.extras:
+            value = d.extras[key][i]
+            return value.item() if isinstance(value, np.generic) else value
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.BASE_KEYS
+        yield from self._detections.extras
+
+    def __len__(self):
+        return len(self.BASE_KEYS) + len(self._detections.extras)
+
+    def __repr__(self):
+        return f"DetectionView({dict(self)})"
+
+
+class Detections:
+    """Detections for one frame stored as parallel arrays
+
+    xyxy (N, 4), conf (N,), cls (N,), area (N,) and center (N, 2) are computed
+    once in vectorized form. Extra per-detection fields (e.g. track IDs) are
+    carried as arrays in `extras`. Iterating yields dict-like views so code
+    written against the old list-of-dicts schema keeps working.
+    """
+
+    def __init__(self, xyxy, conf, cls, class_names=None, **extras):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+        self.cls = np.asarray(cls, dtype=np.int32).reshape(-1)
+        self.class_names = class_names if class_names is not None else []
+        self.extras = {key: np.asarray(value) for key, value in extras.items()}
+
+        widths = np.abs(self.xyxy[:, 2] - self.xyxy[:, 0])
+        heights = np.abs(self.xyxy[:, 3] - self.xyxy[:, 1])
+        self.area = widths * heights
+        self.center = (self.xyxy[:, :2] + self.xyxy[:, 2:]) * 0.5
+
+    @classmethod
+    def empty(cls, class_names=None):
+        """Create an empty result"""
+        return cls(np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32),
+                   np.zeros(0, dtype=np.int32), class_names)
+
+    @classmethod
+    def from_result(cls, result, class_names=None, with_masks=False):
+        """Create detections from an ultralytics result
+
+        With with_masks=True, instance masks are attached as a 'polygon' extra of
+        (K, 2) float32 contours in frame coordinates, so storage scales with the
+        mask outline rather than the frame area.
+        """
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(class_names)
+
+        extras = {}
+        if with_masks and getattr(result, 'masks', None) is not None:
+            extras['polygon'] = polygon_array(result.masks.xy)
+
+        return cls(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(),
+                   boxes.cls.cpu().numpy(), class_names, **extras)
+
+    @classmethod
+    def concatenate(cls, items, class_names=None):
+        """Join several detection sets (same extra fields) into one"""
+        items = [item for item in items if len(item) > 0]
+        if not items:
+            return cls.empty(class_names)
+        if class_names is None:
+            class_names = items[0].class_names
+
+        extra_keys = items[0].extras.keys()
+        extras = {key: np.concatenate([item.extras[key] for item in items]) for key in extra_keys}
+        return cls(np.concatenate([item.xyxy for item in items]),
+                   np.concatenate([item.conf for item in items]),
+                   np.concatenate([item.cls for item in items]),
+                   class_names, **extras)
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield DetectionView(self, i)
+
+    def __getitem__(self, index):
+        """Integer index returns a dict view; slices, masks and index arrays return Detections"""
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("detection index out of range")
+            return DetectionView(self, int(index))
+
+        extras = {key: value[index] for key, value in self.extras.items()}
+        return Detections(self.xyxy[index], self.conf[index], self.cls[index],
+                          self.class_names, **extras)
+
+    def __repr__(self):
+        return f"Detections(n={len(self)}, extras={list(self.extras)})"
+
+    def get_class_name(self, class_id):
+        """Get class name for a class id"""
+        if 0 <= class_id < len(self.class_names):
+            return self.class_names[class_id]
+        return f"class_{class_id}"
+
+    def filter(self, mask):
+        """Keep detections where mask is True"""
+        return self[np.asarray(mask, dtype=bool)]
+
+    def filter_by_confidence(self, min_confidence):
+        """Keep detections at or above a confidence"""
+        return self[self.conf >= min_confidence]
+
+    def filter_by_class(self, class_ids):
+        """Keep detections of the given class ids"""
+        return self[np.isin(self.cls, list(class_ids))]
+
+    def offset(self, dx, dy):
+        """Shift boxes (and mask polygons) in place, e.g. from crop to frame coordinates"""
+        shift = np.array([dx, dy], dtype=np.float32)
+        self.xyxy += np.tile(shift, 2)
+        self.center += shift
+        for polygon in self.extras.get('polygon', ()):
+            polygon += shift
+        return self
+
+    def with_extra(self, key, values):
+        """Attach or replace a per-detection extra field"""
+        values = np.asarray(values)
+        if len(values) != len(self):
+            raise ValueError(f"extra field '{key}' has {len(values)} values for {len(self)} detections")
+        self.extras[key] = values
+        return self
+
+    def to_dicts(self):
+        """Materialize as the legacy list-of-dicts schema"""
+        return [dict(view) for view in self]
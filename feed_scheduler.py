@@ -0,0 +1,289 @@
+"""
+DivyaDrishti Multi-Feed Scheduler
+Several drone feeds sharing one loaded model through weighted round-robin batches
+"""
+
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+import config
+from annotation_renderer import AnnotationRenderer
+from frame_capture import FrameCapture, open_video_source
+from frame_pacer import FramePacer
+from object_tracker import ObjectTracker
+
+class Feed:
+    """One video source with its own capture thread, tracker, renderer and statistics"""
+
+    def __init__(self, feed_id, source, name=None, priority=1.0, backend=None):
+        self.feed_id = feed_id
+        self.source = source
+        self.name = name or f"Drone {feed_id + 1}"
+        self.priority = float(priority)
+        self.backend = backend
+
+        self.cap = None
+        self.capture = None
+        self.pacer = None
+        self.tracker = ObjectTracker(config.CUSTOM_TRACKER_CONFIG)
+        self.renderer = AnnotationRenderer()  # Own buffer ring; frames of other feeds are alive too
+
+        self.share = 0.0  # Weighted round-robin state: slots earned, served at 1.0
+        self.alert_until = 0.0
+        self.lock = threading.Lock()
+        self.latest = None  # (frame, detections, frame_number) of the last completed frame
+        self.latest_version = 0
+
+        # Statistics
+        self.completion_times = deque(maxlen=60)
+        self.latencies = deque(maxlen=60)  # Capture to detections (seconds)
+        self.inferred_frames = 0
+        self.alerts = 0
+
+    def open(self):
+        """Open the source and start its capture thread"""
+        self.cap = open_video_source(self.source, self.backend)
+        if not self.cap.isOpened():
+            print(f"✗ {self.name}: could not open {self.source}")
+            self.cap = None
+            return False
+
+        live = FrameCapture.is_live_source(self.source)
+        self.capture = FrameCapture(self.cap, live).start()
+        self.pacer = FramePacer("live" if live else config.PLAYBACK_MODE, self.cap.get(cv2.CAP_PROP_FPS) or None)
+        print(f"✓ {self.name}: {self.source}")
+        return True
+
+    def close(self):
+        """Stop capture and release the source"""
+        if self.capture:
+            self.capture.stop()
+        if self.cap:
+            self.cap.release()
+        self.capture = None
+        self.cap = None
+
+    def alert_active(self):
+        """Check if the feed raised an alert recently"""
+        return time.perf_counter() < self.alert_until
+
+    def weight(self):
+        """Scheduling weight: priority, boosted while an alert is active"""
+        return self.priority * (config.FEED_ALERT_PRIORITY_BOOST if self.alert_active() else 1.0)
+
+    def ready(self):
+        """Check if a frame is buffered and due (files play at their own timestamps)"""
+        capture = self.capture  # May be closed concurrently by remove_feed
+        if capture is None:
+            return False
+        item = capture.peek()
+        return item is not None and self.pacer.delay(item.pts, item.frame_number) <= 0
+
+    def ended(self):
+        """Check if the source has no more frames"""
+        return self.capture is None or self.capture.ended()
+
+    def take_frame(self):
+        """Take the next frame for inference"""
+        capture = self.capture
+        if capture is None:
+            return None
+        try:
+            captured = capture.read(timeout=0)
+        except TimeoutError:
+            return None
+        if captured is not None:
+            self.pacer.wait(captured.pts, captured.frame_number)
+        return captured
+
+    def complete(self, captured, detections, confidence_threshold, tracking):
+        """Track, check alerts and publish the detections of one frame"""
+        if tracking:
+            detections = self.tracker.update(detections, captured.frame)
+            # Low-confidence boxes survive only when they continue a track
+            detections = detections.filter((detections.conf >= confidence_threshold) |
+                                           (detections.extras['track_id'] >= 0))
+
+        now = time.perf_counter()
+        if config.ENABLE_ALERTS and len(detections) and \
+                np.any(detections.conf >= config.ALERT_CONFIDENCE_THRESHOLD):
+            if not self.alert_active():
+                self.alerts += 1
+            self.alert_until = now + config.FEED_ALERT_HOLD_SECONDS
+
+        self.inferred_frames += 1
+        self.completion_times.append(now)
+        self.latencies.append(now - captured.timestamp)
+        with self.lock:
+            self.latest = (captured.frame, detections, captured.frame_number)
+            self.latest_version += 1
+        return detections
+
+    def get_latest(self):
+        """Get (version, (frame, detections, frame_number)) of the newest result"""
+        with self.lock:
+            return self.latest_version, self.latest
+
+    def get_stats(self):
+        """Get per-feed FPS, latency and drops"""
+        times = self.completion_times
+        fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0
+        latencies = list(self.latencies)
+        capture_stats = self.capture.get_stats() if self.capture else {}
+        return {
+            'name': self.name,
+            'source': str(self.source),
+            'priority': self.priority,
+            'weight': self.weight(),
+            'alert': self.alert_active(),
+            'alerts': self.alerts,
+            'fps': fps,
+            'inferred_frames': self.inferred_frames,
+            'avg_latency_ms': (sum(latencies) / len(latencies)) * 1000 if latencies else 0,
+            'dropped': capture_stats.get('dropped', 0),
+            'ended': self.ended()
+        }
+
+class FeedScheduler:
+    """Feeds frames from many sources into shared batched forward passes
+
+    Each round every ready feed earns a fraction of a slot proportional to
+    its weight and is served (one freshest frame, batched into a single
+    detect_batch call) once it has earned a whole one. The heaviest feed earns
+    one slot per round, a feed of half its weight runs every other round, and
+    when the earnings would exceed batch_size they are scaled down so all
+    feeds share the batch by weight. A feed with an active alert therefore
+    gets FEED_ALERT_PRIORITY_BOOST times the inference rate of an otherwise
+    equal feed, whether or not the feeds fit in one batch.
+    """
+
+    def __init__(self, detector, logger=None, batch_size=None):
+        self.detector = detector
+        self.logger = logger
+        self.batch_size = batch_size or config.MULTI_FEED_BATCH_SIZE
+        self.confidence_threshold = config.CONFIDENCE_THRESHOLD
+        self.feeds = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+
+        # Statistics
+        self.batch_sizes = deque(maxlen=100)
+        self.batch_times = deque(maxlen=100)
+
+    def add_feed(self, source, name=None, priority=1.0, backend=None):
+        """Open a source and add it to the rotation (returns the Feed or None)"""
+        with self.lock:
+            if len(self.feeds) >= config.MULTI_FEED_MAX_FEEDS:
+                print(f"⚠️ At most {config.MULTI_FEED_MAX_FEEDS} feeds are supported")
+                return None
+            feed_id = max((feed.feed_id for feed in self.feeds), default=-1) + 1
+
+        feed = Feed(feed_id, source, name, priority, backend)
+        if not feed.open():
+            return None
+        with self.lock:
+            self.feeds.append(feed)
+        return feed
+
+    def remove_feed(self, feed):
+        """Take a feed out of the rotation and close it"""
+        with self.lock:
+            if feed in self.feeds:
+                self.feeds.remove(feed)
+        feed.close()
+
+    def set_priority(self, feed, priority):
+        """Set a feed's base scheduling weight"""
+        feed.priority = max(0.1, float(priority))
+
+    def set_confidence_threshold(self, confidence_threshold):
+        """Set the threshold used for subsequent batches"""
+        self.confidence_threshold = confidence_threshold
+
+    def start(self):
+        """Start the scheduling thread"""
+        if not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop scheduling and close every feed"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+        with self.lock:
+            feeds, self.feeds = self.feeds, []
+        for feed in feeds:
+            feed.close()
+
+    def _pick(self, ready):
+        """Choose up to batch_size feeds in proportion to their weights"""
+        weights = [feed.weight() for feed in ready]
+        # The heaviest feed earns at most one slot per round; under contention all share batch_size
+        scale = min(1.0 / max(weights), self.batch_size / sum(weights))
+
+        candidates = []
+        for feed, weight in zip(ready, weights):
+            feed.share = min(2.0, feed.share + weight * scale)
+            if feed.share >= 1.0 - 1e-9:
+                candidates.append(feed)
+
+        # Longest-owed first when more feeds are owed a slot than the batch holds
+        candidates.sort(key=lambda feed: (feed.share, feed.weight()), reverse=True)
+        chosen = candidates[:self.batch_size]
+        for feed in chosen:
+            feed.share -= 1.0
+        return chosen
+
+    def _run(self):
+        """Scheduling loop"""
+        while self.running:
+            with self.lock:
+                feeds = list(self.feeds)
+            ready = [feed for feed in feeds if feed.ready()]
+            if not ready:
+                time.sleep(config.MULTI_FEED_IDLE_MS / 1000)
+                continue
+
+            batch = []
+            for feed in self._pick(ready):
+                captured = feed.take_frame()
+                if captured is not None:
+                    batch.append((feed, captured))
+            if not batch:
+                continue
+
+            confidence_threshold = self.confidence_threshold
+            tracking = self.detector.tracking_enabled
+            # Tracking needs low-confidence boxes for its second association stage
+            if tracking:
+                inference_conf = min([confidence_threshold] + [feed.tracker.track_low_thresh for feed, _ in batch])
+            else:
+                inference_conf = confidence_threshold
+
+            start_time = time.perf_counter()
+            outputs = self.detector.detect_batch([captured.frame for _, captured in batch], inference_conf,
+                                                 max_batch_size=self.batch_size, annotate=False)
+            self.batch_times.append(time.perf_counter() - start_time)
+            self.batch_sizes.append(len(batch))
+
+            for (feed, captured), (_, detections) in zip(batch, outputs):
+                detections = feed.complete(captured, detections, confidence_threshold, tracking)
+                if self.logger is not None:
+                    self.logger.log_detections(detections, captured.frame_number, session_id=feed.name)
+
+    def get_stats(self):
+        """Get scheduler and per-feed statistics"""
+        with self.lock:
+            feeds = list(self.feeds)
+        return {
+            'feeds': [feed.get_stats() for feed in feeds],
+            'batch_size': self.batch_size,
+            'avg_batch_size': sum(self.batch_sizes) / len(self.batch_sizes) if self.batch_sizes else 0,
+            'avg_batch_time': (sum(self.batch_times) / len(self.batch_times)) * 1000 if self.batch_times else 0
+        }
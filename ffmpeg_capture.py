@@ -0,0 +1,254 @@
+"""
+DivyaDrishti FFmpeg Capture
+Raw frames piped from an ffmpeg subprocess into preallocated NumPy buffers
+
+Usage:
+  python ffmpeg_capture.py <video_file> [width] [fps]   (decode FPS: OpenCV vs FFmpeg)
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import cv2
+import numpy as np
+import config
+
+def ffmpeg_available():
+    """Check that ffmpeg and ffprobe are on the PATH"""
+    return shutil.which(config.FFMPEG_BINARY) is not None and shutil.which(config.FFPROBE_BINARY) is not None
+
+def _parse_rate(rate):
+    """Parse an ffprobe rate such as "30000/1001" (0 if unknown)"""
+    try:
+        numerator, _, denominator = str(rate).partition("/")
+        return float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+def probe_video(source):
+    """Get width, height, fps and frame count of the first video stream"""
+    command = [config.FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate,nb_frames:format=duration",
+               "-of", "json", str(source)]
+    output = subprocess.run(command, capture_output=True, check=True, timeout=30).stdout
+    info = json.loads(output)
+    stream = info['streams'][0]
+
+    fps = _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+    duration = float(info.get('format', {}).get('duration') or 0)
+    nb_frames = str(stream.get('nb_frames', ''))
+    if nb_frames.isdigit():
+        frame_count = int(nb_frames)
+    else:
+        frame_count = int(round(duration * fps)) if duration and fps else 0
+
+    return {
+        'width': int(stream['width']),
+        'height': int(stream['height']),
+        'fps': fps,
+        'frame_count': frame_count,
+        'duration': duration
+    }
+
+def default_buffer_count():
+    """Enough buffers for every frame the capture ring and pipeline queues can hold at once"""
+    stages_in_flight = 5  # capture, detect, annotate, display, record
+    return config.CAPTURE_RING_SIZE + 3 * config.PIPELINE_QUEUE_SIZE + stages_in_flight
+
+class FFmpegCapture:
+    """cv2.VideoCapture-compatible reader decoding through an ffmpeg subprocess
+
+    Downscaling (width) and frame-rate decimation (fps) run inside ffmpeg, and
+    file frames are read straight into a rotating pool of preallocated buffers.
+    A returned frame stays valid for buffer_count - 1 further reads, which holds
+    because a file capture only reads ahead as fast as the consumer takes frames.
+    Live sources keep decoding (and dropping) while the consumer still holds
+    earlier frames, so they decode into one scratch buffer and return a copy.
+    Positions are derived from the frame index, which is exact for
+    constant-rate (or decimated) output.
+    """
+
+    def __init__(self, source, width=None, fps=None, buffer_count=None, threads=None):
+        self.source = source
+        self.live = not os.path.isfile(str(source))
+        self.process = None
+        self.frames_read = 0
+        self.buffers = []
+        self.views = []
+        self.next_buffer = 0
+
+        try:
+            info = probe_video(source)
+        except Exception as e:
+            print(f"✗ ffprobe could not read {source}: {e}")
+            return
+
+        width = width if width is not None else config.FFMPEG_SCALE_WIDTH
+        fps = fps if fps is not None else config.FFMPEG_TARGET_FPS
+        threads = threads if threads is not None else config.FFMPEG_THREADS
+
+        filters = []
+        self.source_fps = info['fps']
+        self.fps = self.source_fps
+        if fps and (not self.source_fps or fps < self.source_fps):
+            filters.append(f"fps={fps}")
+            self.fps = float(fps)
+
+        self.width, self.height = info['width'], info['height']
+        if width and width < info['width']:
+            self.width = width - width % 2
+            self.height = max(2, int(round(info['height'] * self.width / info['width'] / 2)) * 2)
+            filters.append(f"scale={self.width}:{self.height}:flags=area")
+
+        self.frame_count = info['frame_count']
+        if self.frame_count and self.source_fps and self.fps != self.source_fps:
+            self.frame_count = int(self.frame_count * self.fps / self.source_fps)
+
+        if self.live:
+            buffer_count = 1  # Scratch buffer only; frames are copied out
+        else:
+            buffer_count = buffer_count or config.FFMPEG_BUFFER_COUNT or default_buffer_count()
+        self.frame_bytes = self.width * self.height * 3
+        self.buffers = [np.empty((self.height, self.width, 3), dtype=np.uint8) for _ in range(buffer_count)]
+        self.views = [memoryview(buffer).cast('B') for buffer in self.buffers]
+
+        command = [config.FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-nostdin"]
+        if config.FFMPEG_HWACCEL:
+            command += ["-hwaccel", config.FFMPEG_HWACCEL]
+        if threads:
+            command += ["-threads", str(threads)]
+        if self.live:
+            # Network streams: don't let ffmpeg buffer ahead of us
+            command += ["-fflags", "nobuffer", "-flags", "low_delay"]
+        command += ["-i", str(source)]
+        if filters:
+            command += ["-vf", ",".join(filters)]
+        command += ["-an", "-sn", "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"]
+
+        try:
+            self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                            bufsize=self.frame_bytes)
+        except OSError as e:
+            print(f"✗ Could not start ffmpeg: {e}")
+            self.process = None
+
+    def isOpened(self):
+        """Check if the decoder is running"""
+        return self.process is not None
+
+    def read(self):
+        """Read the next frame into the next pool buffer (copied out for live sources); returns (ok, frame)"""
+        if self.process is None:
+            return False, None
+
+        view = self.views[self.next_buffer]
+        filled = 0
+        while filled < self.frame_bytes:
+            count = self.process.stdout.readinto(view[filled:])
+            if not count:
+                # End of stream (or ffmpeg exited)
+                self.release()
+                return False, None
+            filled += count
+
+        frame = self.buffers[self.next_buffer]
+        self.next_buffer = (self.next_buffer + 1) % len(self.buffers)
+        self.frames_read += 1
+        if self.live:
+            # The consumer may hold this frame for any number of later reads
+            frame = frame.copy()
+        return True, frame
+
+    def get(self, prop):
+        """Subset of cv2.VideoCapture.get (0 for unsupported properties)"""
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps or 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frames_read)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            # Timestamp of the frame last returned
+            return max(self.frames_read - 1, 0) / self.fps * 1000 if self.fps else 0.0
+        return 0.0
+
+    def set(self, prop, value):
+        """Properties are fixed at construction (width/fps arguments)"""
+        return False
+
+    def release(self):
+        """Stop ffmpeg"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+def benchmark(video_path, width=0, fps=0):
+    """Decode a file with both backends and report frames per second
+
+    The OpenCV path resizes and decimates in Python so both produce the same frames.
+    """
+    results = {}
+
+    cap = cv2.VideoCapture(video_path)
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    stride = max(1, int(round(source_fps / fps))) if fps and source_fps else 1
+    frames = 0
+    start_time = time.perf_counter()
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        index += 1
+        if (index - 1) % stride:
+            continue
+        if width and width < frame.shape[1]:
+            height = int(round(frame.shape[0] * width / frame.shape[1] / 2)) * 2
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        frames += 1
+    cap.release()
+    results['opencv'] = (frames, time.perf_counter() - start_time)
+
+    cap = FFmpegCapture(video_path, width=width, fps=fps)
+    frames = 0
+    start_time = time.perf_counter()
+    while True:
+        ret, _ = cap.read()
+        if not ret:
+            break
+        frames += 1
+    cap.release()
+    results['ffmpeg'] = (frames, time.perf_counter() - start_time)
+
+    return results
+
+def main():
+    """Compare decode FPS of the OpenCV and FFmpeg backends"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+    if not ffmpeg_available():
+        print("✗ ffmpeg/ffprobe not found on PATH")
+        return
+
+    video_path = sys.argv[1]
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    fps = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    print(f"⏱️ Decoding {video_path} (width={width or 'native'}, fps={fps or 'native'})...")
+    for backend, (frames, elapsed) in benchmark(video_path, width, fps).items():
+        print(f"  {backend:<7} {frames} frames in {elapsed:.2f}s ({frames / elapsed if elapsed else 0:.1f} FPS)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+DivyaDrishti Frame Capture
+Video decoding on its own thread into a small bounded frame ring
+"""
+
+import os
+import threading
+import time
+from collections import deque, namedtuple
+import cv2
+import config
+from stage_profiler import PROFILER
+
+# frame_number counts frames read from the source, so gaps show where frames were dropped;
+# pts is the source timestamp in seconds (files only); dropped is the number discarded since the previous read
+CapturedFrame = namedtuple('CapturedFrame', ['frame', 'frame_number', 'timestamp', 'pts', 'dropped'])
+
+def open_video_source(source, backend=None):
+    """Open a source with the configured decoder (camera indices always use OpenCV)"""
+    backend = backend or config.CAPTURE_BACKEND
+    if backend == "ffmpeg" and isinstance(source, str):
+        from ffmpeg_capture import FFmpegCapture, ffmpeg_available
+        if ffmpeg_available():
+            return FFmpegCapture(source)
+        print("⚠️ ffmpeg not found, using the OpenCV decoder")
+    return cv2.VideoCapture(source)
+
+class FrameCapture:
+    """Reads a source ahead of the consumer so decoding never blocks inference
+
+    Live sources (cameras, streams) use a drop-oldest ring and read() returns
+    the freshest frame, so latency stays bounded when the consumer falls
+    behind. Files are read losslessly: the capture thread waits for space.
+    """
+
+    def __init__(self, cap, live, ring_size=None):
+        self.cap = cap
+        self.live = live
+        self.ring_size = ring_size or config.CAPTURE_RING_SIZE
+        self.ring = deque()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.finished = False
+
+        # Statistics
+        self.frames_read = 0
+        self.dropped_total = 0
+        self.dropped_since_read = 0
+        self.latencies = deque(maxlen=100)  # Capture-to-consumer delay (seconds)
+
+    @staticmethod
+    def is_live_source(source):
+        """Cameras and network streams are live; local files can be read losslessly"""
+        return not (isinstance(source, str) and os.path.isfile(source))
+
+    def start(self):
+        """Start the capture thread"""
+        if self.live:
+            # Keep OpenCV's own queue short; our ring does the buffering
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop the capture thread (the caller releases the VideoCapture afterwards)"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+
+    def _capture_loop(self):
+        """Decode frames into the ring until the source ends or stop() is called"""
+        try:
+            while self.running:
+                with PROFILER.span("capture"):
+                    ret, frame = self.cap.read()
+                if not ret:
+                    break
+
+                pts = None if self.live else self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                item = CapturedFrame(frame, self.frames_read, time.perf_counter(), pts, 0)
+                self.frames_read += 1
+
+                with self.condition:
+                    if self.live:
+                        while len(self.ring) >= self.ring_size:
+                            self.ring.popleft()
+                            self._count_dropped(1)
+                    else:
+                        self.condition.wait_for(lambda: len(self.ring) < self.ring_size or not self.running)
+                    if not self.running:
+                        break
+                    self.ring.append(item)
+                    self.condition.notify_all()
+        except Exception as e:
+            print(f"✗ Capture error: {e}")
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def _count_dropped(self, count):
+        """Record discarded frames (caller holds the condition)"""
+        self.dropped_total += count
+        self.dropped_since_read += count
+        PROFILER.count("dropped_frames", count)
+
+    def peek(self):
+        """Get the frame read() would return next without taking it (None if none is buffered)"""
+        with self.condition:
+            if not self.ring:
+                return None
+            return self.ring[-1] if self.live else self.ring[0]
+
+    def ended(self):
+        """Check if the source has ended and every frame was taken"""
+        with self.condition:
+            return self.finished and not self.ring
+
+    def read(self, timeout=None):
+        """Get the next frame to process, or None once the source has ended
+
+        Raises TimeoutError if no frame arrives within timeout.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.ring or self.finished, timeout=timeout):
+                raise TimeoutError("No frame from capture")
+            if not self.ring:
+                return None
+
+            if self.live:
+                # Freshest frame wins; anything older is already stale
+                item = self.ring.pop()
+                self._count_dropped(len(self.ring))
+                self.ring.clear()
+            else:
+                item = self.ring.popleft()
+
+            item = item._replace(dropped=self.dropped_since_read)
+            self.dropped_since_read = 0
+            self.condition.notify_all()
+
+        self.latencies.append(time.perf_counter() - item.timestamp)
+        return item
+
+    def get(self, timeout=None):
+        """Same contract as StageQueue.get, so a FrameCapture can feed a PipelineStage"""
+        return self.read(timeout=timeout)
+
+    def get_stats(self):
+        """Get capture throughput, drops and queueing latency"""
+        latencies = list(self.latencies)
+        return {
+            'live': self.live,
+            'ring_size': self.ring_size,
+            'buffered': len(self.ring),
+            'frames_read': self.frames_read,
+            'dropped': self.dropped_total,
+            'drop_ratio': self.dropped_total / self.frames_read if self.frames_read else 0,
+            'avg_latency_ms': (sum(latencies) / len(latencies)) * 1000 if latencies else 0,
+            'max_latency_ms': max(latencies) * 1000 if latencies else 0
+        }
@@ -0,0 +1,93 @@
+"""
+DivyaDrishti Frame Pacing
+Deadline scheduling from source timestamps instead of a fixed per-frame sleep
+"""
+
+import time
+from collections import deque
+import config
+
+PACING_MODES = ("native", "fast", "live")
+
+class FramePacer:
+    """Holds each frame until its presentation deadline
+
+    "native" plays files at source speed using their timestamps (PTS): a
+    frame is released at anchor + (pts - anchor_pts), so time spent on
+    inference comes out of the wait instead of adding to it. "fast" analyzes
+    as fast as the pipeline allows and "live" never waits, since a live
+    source already delivers frames in real time.
+    """
+
+    def __init__(self, mode, fallback_fps=None):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode '{mode}', expected one of {PACING_MODES}")
+        self.mode = mode
+        self.fallback_fps = fallback_fps or config.MAX_FPS
+        self.tolerance = config.PACING_TOLERANCE_MS / 1000
+        self.resync_after = config.PACING_RESYNC_MS / 1000
+        self.reset()
+
+    def reset(self):
+        """Forget the timing anchor and statistics"""
+        self.anchor_time = None
+        self.anchor_pts = None
+        self.last_pts = None
+        self.frames = 0
+        self.missed = 0
+        self.resyncs = 0
+        self.release_times = deque(maxlen=60)
+        self.lateness = deque(maxlen=60)  # Seconds past the deadline for late frames
+
+    def _frame_pts(self, pts, frame_number):
+        """Use the source timestamp, or the frame index at the fallback rate if it is missing/unusable"""
+        if pts is None or pts < 0 or (self.last_pts is not None and pts <= self.last_pts and frame_number > 0):
+            if self.last_pts is None:
+                return frame_number / self.fallback_fps
+            return self.last_pts + 1.0 / self.fallback_fps
+        return pts
+
+    def delay(self, pts=None, frame_number=0):
+        """Seconds until a frame is due, without waiting (0 when due or not pacing)"""
+        if self.mode != "native" or self.anchor_time is None:
+            return 0.0
+        pts = self._frame_pts(pts, frame_number)
+        return max(0.0, self.anchor_time + (pts - self.anchor_pts) - time.perf_counter())
+
+    def wait(self, pts=None, frame_number=0):
+        """Block until the frame is due (native mode) and record the achieved cadence"""
+        now = time.perf_counter()
+        if self.mode == "native":
+            pts = self._frame_pts(pts, frame_number)
+            self.last_pts = pts
+            if self.anchor_time is None:
+                self.anchor_time, self.anchor_pts = now, pts
+
+            deadline = self.anchor_time + (pts - self.anchor_pts)
+            if now < deadline:
+                time.sleep(deadline - now)
+                now = time.perf_counter()
+            elif now - deadline > self.tolerance:
+                self.missed += 1
+                self.lateness.append(now - deadline)
+                if now - deadline > self.resync_after:
+                    # Too far behind to catch up by skipping sleeps - restart the clock here
+                    self.anchor_time, self.anchor_pts = now, pts
+                    self.resyncs += 1
+
+        self.frames += 1
+        self.release_times.append(now)
+
+    def get_stats(self):
+        """Get achieved cadence and missed deadlines"""
+        times = self.release_times
+        cadence = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0
+        return {
+            'mode': self.mode,
+            'frames': self.frames,
+            'cadence_fps': cadence,
+            'missed_deadlines': self.missed,
+            'miss_ratio': self.missed / self.frames if self.frames else 0,
+            'avg_lateness_ms': (sum(self.lateness) / len(self.lateness)) * 1000 if self.lateness else 0,
+            'resyncs': self.resyncs
+        }
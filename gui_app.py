@@ -8,6 +8,7 @@ from tkinter import ttk, filedialog, messagebox
 import cv2
 import threading
 import time
+from collections import namedtuple
 from datetime import datetime
 from PIL import Image, ImageTk
 import numpy as np
@@ -17,24 +18,42 @@ import os
 
 import config
 import utils
-from object_detector import MultiModelDetector
 from detection_logger import DetectionLogger
 from performance_monitor import PerformanceMonitor
+from motion_gate import MotionGate
+from frame_capture import FrameCapture, open_video_source
+from pipeline import Pipeline
+from frame_pacer import FramePacer
+from detections import Detections
+from stage_profiler import PROFILER
+
+# One frame moving through the detect -> annotate -> display / record stages
+# display holds panel-sized copies, so nothing queued for the Tk thread points into reused buffers
+ProcessedFrame = namedtuple('ProcessedFrame', ['frame', 'processed_frame', 'detections',
+                                               'frame_number', 'inferred', 'display'])
 
 class DivyaDrishtiGUI:
-    def __init__(self, root):
+    def __init__(self, root, startup_timer=None):
         self.root = root
+        self.startup_timer = startup_timer or utils.PhaseTimer("startup")
         self.root.title(config.WINDOW_TITLE)
         self.root.geometry(f"{config.WINDOW_WIDTH}x{config.WINDOW_HEIGHT}")
         self.root.configure(bg=config.CYBERPUNK_THEME["bg_color"])
 
-        # Initialize components
-        self.detector = MultiModelDetector()
+        # Initialize components (the detector imports torch/ultralytics and is loaded in the background)
+        self.detector = None
         self.logger = DetectionLogger()
         self.performance_monitor = PerformanceMonitor()
+        self.motion_gate = MotionGate()
+        self.last_detections = Detections.empty()
 
         # Drone feed capture variables
         self.cap = None
+        self.capture = None  # Capture thread feeding the pipeline
+        self.pipeline = None  # capture -> detect -> annotate -> display / record stages
+        self.pacer = None  # Releases frames at their presentation deadline
+        self.capture_backend = config.CAPTURE_BACKEND
+        self.multi_feed_window = None  # Grid of concurrent feeds sharing the detector
         self.is_running = False
         self.video_source = config.DEFAULT_DRONE_FEED
         self.confidence_threshold = config.CONFIDENCE_THRESHOLD
@@ -48,6 +67,7 @@ class DivyaDrishtiGUI:
         # GUI state
         self.segmentation_enabled = False
         self.auto_save_enabled = config.AUTO_SAVE_SCREENSHOTS
+        self.processed_panel_visible = True  # Refreshed from the Tk thread in update_gui
 
         # Drone location simulation
         self.drone_lat = 32.7767
@@ -66,15 +86,64 @@ class DivyaDrishtiGUI:
         # Start performance monitoring
         self.performance_monitor.start_monitoring()
 
-        # Update model display
-        self.update_model_display()
-
         # Start GUI update loop
         self.update_gui()
 
+        # Window is interactive from here; the model finishes loading behind it
+        self.root.update_idletasks()
+        self.startup_timer.mark("window_ready")
+        if config.FAST_START:
+            self.update_status("⏳ Loading AI detection model...")
+            threading.Thread(target=self.load_detector, daemon=True).start()
+        else:
+            self.load_detector()
+
+    def load_detector(self):
+        """Import torch/ultralytics and load the detection model, then hand it to the GUI"""
+        try:
+            from object_detector import MultiModelDetector
+            self.startup_timer.mark("detector_imported")
+
+            detector = MultiModelDetector()
+            self.startup_timer.mark("model_loaded")
+        except Exception as e:
+            print(f"✗ Detector initialization failed: {e}")
+            detector = None
+
+        if config.FAST_START:
+            self.root.after(0, lambda: self.on_detector_ready(detector))
+        else:
+            self.on_detector_ready(detector)
+
+    def on_detector_ready(self, detector):
+        """Enable detection controls once the model is loaded (Tk thread)"""
+        if detector is None or not detector.is_model_loaded():
+            self.start_button.config(text="✗ MODEL UNAVAILABLE")
+            self.update_status("❌ AI detection model failed to load")
+            self.startup_timer.save()
+            return
+
+        self.detector = detector
+        self.model_combo.config(values=[display for key, display in self.detector.get_model_list_for_gui()])
+        self.update_model_display()
+        self.tracking_button.config(text=f"📍 TRACKING: {'ON' if self.detector.tracking_enabled else 'OFF'}")
+        self.update_cascade_button()
+        self.start_button.config(text="🚀 START SURVEILLANCE", state=tk.NORMAL)
+
+        elapsed = self.startup_timer.mark("ready")
+        self.startup_timer.save()
+        self.update_status(f"✅ AI detection model ready ({elapsed:.1f}s)")
+
         # Log system info
         utils.log_system_info()
 
+    def detector_ready(self):
+        """Check if the detector has finished loading, telling the user if not"""
+        if self.detector is None:
+            self.update_status("⏳ AI detection model is still loading...")
+            return False
+        return True
+
     def setup_cyberpunk_theme(self):
         """Setup cyberpunk theme styling"""
         # Use standard TTK widgets with manual styling
@@ -152,21 +221,22 @@ class DivyaDrishtiGUI:
                 fg=config.CYBERPUNK_THEME["primary_color"],
                 bg=config.CYBERPUNK_THEME["bg_color"]).pack(side=tk.LEFT)
 
-        # Get model list from detector
-        model_options = [display for key, display in self.detector.get_model_list_for_gui()]
+        # Model list from config until the detector (with its INT8 variants) has loaded
+        model_options = [f"{info['icon']} {info['name']} - {info['description']}"
+                         for info in config.AVAILABLE_MODELS.values()]
         self.model_var = tk.StringVar()
 
         # Set default model
-        current_model_info = self.detector.get_current_model_info()
+        current_model_info = config.AVAILABLE_MODELS.get(config.DEFAULT_MODEL_KEY)
         if current_model_info:
             default_display = f"{current_model_info['icon']} {current_model_info['name']} - {current_model_info['description']}"
             self.model_var.set(default_display)
 
-        model_combo = ttk.Combobox(model_frame, textvariable=self.model_var,
-                                  values=model_options,
-                                  state="readonly", width=35)
-        model_combo.pack(side=tk.LEFT, padx=(10, 0))
-        model_combo.bind("<<ComboboxSelected>>", self.on_model_change)
+        self.model_combo = ttk.Combobox(model_frame, textvariable=self.model_var,
+                                       values=model_options,
+                                       state="readonly", width=35)
+        self.model_combo.pack(side=tk.LEFT, padx=(10, 0))
+        self.model_combo.bind("<<ComboboxSelected>>", self.on_model_change)
 
         # Drone feed source selection
         source_frame = tk.Frame(main_controls, bg=config.CYBERPUNK_THEME["bg_color"])
@@ -197,12 +267,13 @@ class DivyaDrishtiGUI:
         button_frame = tk.Frame(main_controls, bg=config.CYBERPUNK_THEME["bg_color"])
         button_frame.pack(side=tk.RIGHT)
 
-        self.start_button = tk.Button(button_frame, text="🚀 START SURVEILLANCE",
+        self.start_button = tk.Button(button_frame, text="⏳ LOADING MODEL...",
                                      command=self.start_detection,
                                      font=('Consolas', 11, 'bold'),
                                      fg=config.CYBERPUNK_THEME["text_color"],
                                      bg=config.CYBERPUNK_THEME["primary_color"],
-                                     activebackground=config.CYBERPUNK_THEME["accent_color"])
+                                     activebackground=config.CYBERPUNK_THEME["accent_color"],
+                                     state=tk.DISABLED)
         self.start_button.pack(side=tk.LEFT, padx=(0, 10))
 
         self.stop_button = tk.Button(button_frame, text="⏹️ STOP SURVEILLANCE",
@@ -226,6 +297,25 @@ class DivyaDrishtiGUI:
                                            bg=config.CYBERPUNK_THEME["button_color"])
         self.segmentation_button.pack(side=tk.LEFT, padx=(0, 10))
 
+        # Tracking toggle
+        self.tracking_button = tk.Button(toggles_frame,
+                                       text=f"📍 TRACKING: {'ON' if config.USE_TRACKING else 'OFF'}",
+                                       command=self.toggle_tracking,
+                                       font=('Consolas', 10, 'bold'),
+                                       fg=config.CYBERPUNK_THEME["text_color"],
+                                       bg=config.CYBERPUNK_THEME["primary_color"] if config.USE_TRACKING
+                                       else config.CYBERPUNK_THEME["button_color"])
+        self.tracking_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Cascade toggle (nano gate model escalating to the active model)
+        self.cascade_button = tk.Button(toggles_frame,
+                                      text=f"🪜 CASCADE: {'ON' if config.CASCADE_MODE else 'OFF'}",
+                                      command=self.toggle_cascade,
+                                      font=('Consolas', 10, 'bold'),
+                                      fg=config.CYBERPUNK_THEME["text_color"],
+                                      bg=config.CYBERPUNK_THEME["button_color"])
+        self.cascade_button.pack(side=tk.LEFT, padx=(0, 10))
+
         # Auto-record toggle
         self.autosave_button = tk.Button(toggles_frame,
                                        text="📹 AUTO-RECORD: OFF",
@@ -235,6 +325,24 @@ class DivyaDrishtiGUI:
                                        bg=config.CYBERPUNK_THEME["button_color"])
         self.autosave_button.pack(side=tk.LEFT, padx=(0, 10))
 
+        # Decoder toggle (applies from the next start)
+        self.decoder_button = tk.Button(toggles_frame,
+                                      text=f"🎞️ DECODER: {self.capture_backend.upper()}",
+                                      command=self.toggle_decoder,
+                                      font=('Consolas', 10, 'bold'),
+                                      fg=config.CYBERPUNK_THEME["text_color"],
+                                      bg=config.CYBERPUNK_THEME["button_color"])
+        self.decoder_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Multi-feed grid
+        self.multi_feed_button = tk.Button(toggles_frame,
+                                         text="🛰️ MULTI-FEED",
+                                         command=self.open_multi_feed,
+                                         font=('Consolas', 10, 'bold'),
+                                         fg=config.CYBERPUNK_THEME["text_color"],
+                                         bg=config.CYBERPUNK_THEME["button_color"])
+        self.multi_feed_button.pack(side=tk.LEFT, padx=(0, 10))
+
         # Confidence slider
         confidence_frame = tk.Frame(toggles_frame, bg=config.CYBERPUNK_THEME["bg_color"])
         confidence_frame.pack(side=tk.RIGHT)
@@ -350,6 +458,16 @@ class DivyaDrishtiGUI:
                                   font=('Consolas', 11, 'bold'))
         perf_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
+        # Stage profiling toggle (adds the per-stage breakdown below)
+        self.profiling_button = tk.Button(perf_frame,
+                                        text=f"⏱️ STAGE PROFILING: {'ON' if PROFILER.enabled else 'OFF'}",
+                                        command=self.toggle_profiling,
+                                        font=('Consolas', 9, 'bold'),
+                                        fg=config.CYBERPUNK_THEME["text_color"],
+                                        bg=config.CYBERPUNK_THEME["primary_color"] if PROFILER.enabled
+                                        else config.CYBERPUNK_THEME["button_color"])
+        self.profiling_button.pack(side=tk.BOTTOM, fill=tk.X)
+
         self.perf_text = tk.Text(perf_frame, height=8, wrap=tk.WORD,
                                 bg=config.CYBERPUNK_THEME["bg_color"],
                                 fg=config.CYBERPUNK_THEME["text_color"],
@@ -374,9 +492,8 @@ class DivyaDrishtiGUI:
                                    bg=config.CYBERPUNK_THEME["bg_color"])
         self.status_label.pack(side=tk.LEFT)
 
-        # Device info
-        device_info = utils.get_device_info()
-        self.device_label = tk.Label(status_frame, text=f"🖥️ {device_info}",
+        # Device info (querying it imports torch; filled in by on_detector_ready)
+        self.device_label = tk.Label(status_frame, text="🖥️ Detecting device...",
                                    font=('Consolas', 10),
                                    fg=config.CYBERPUNK_THEME["accent_color"],
                                    bg=config.CYBERPUNK_THEME["bg_color"])
@@ -397,14 +514,10 @@ class DivyaDrishtiGUI:
         self.frame_label.pack(side=tk.RIGHT, padx=(10, 0))
 
     def on_model_change(self, event=None):
-        """Handle model change"""
-        if self.is_running:
-            messagebox.showwarning("Warning", "Please stop detection before changing models.")
-            # Reset to current model
-            current_model_info = self.detector.get_current_model_info()
-            if current_model_info:
-                default_display = f"{current_model_info['icon']} {current_model_info['name']} - {current_model_info['description']}"
-                self.model_var.set(default_display)
+        """Handle model change (safe mid-surveillance - the active model keeps running until the new one is ready)"""
+        if not self.detector_ready():
+            default_model = config.AVAILABLE_MODELS[config.DEFAULT_MODEL_KEY]
+            self.model_var.set(f"{default_model['icon']} {default_model['name']} - {default_model['description']}")
             return
 
         selected_display = self.model_var.get()
@@ -441,6 +554,8 @@ class DivyaDrishtiGUI:
 
     def update_model_display(self):
         """Update model information in the GUI"""
+        if self.detector is None:
+            return
         model_info = self.detector.get_current_model_info()
         if model_info:
             # Update device label with model info
@@ -479,31 +594,133 @@ class DivyaDrishtiGUI:
             self.update_status(f"📁 Selected: {file_path}")
 
     def toggle_segmentation(self):
-        """Toggle segmentation mode"""
+        """Toggle segmentation mode (the model switch runs off the Tk thread)"""
+        if not self.detector_ready():
+            return
+
         if self.is_running:
             messagebox.showwarning("Warning", "Please stop detection before changing modes.")
             return
 
-        self.segmentation_enabled = not self.segmentation_enabled
-        mode = "segment" if self.segmentation_enabled else "detect"
+        enabled = not self.segmentation_enabled
+        mode = "segment" if enabled else "detect"
+        self.segmentation_button.config(state=tk.DISABLED)
+        self.update_status(f"🔄 Switching to {mode} mode...")
 
-        # Update detector mode
-        success = self.detector.switch_mode(mode)
-        if success:
-            button_text = f"🤖 AI ANALYSIS: {'ON' if self.segmentation_enabled else 'OFF'}"
-            self.segmentation_button.config(text=button_text)
+        # Segment mode may cold-load (or download) the segmentation model
+        def switch_mode_thread():
+            success = self.detector.switch_mode(mode)
+            self.root.after(0, lambda: self.on_segmentation_switched(enabled, success))
 
-            if self.segmentation_enabled:
-                self.segmentation_button.config(bg=config.CYBERPUNK_THEME["primary_color"])
-            else:
-                self.segmentation_button.config(bg=config.CYBERPUNK_THEME["button_color"])
+        threading.Thread(target=switch_mode_thread, daemon=True).start()
 
-            self.update_status(f"🤖 AI analysis {'enabled' if self.segmentation_enabled else 'disabled'}")
-        else:
-            self.segmentation_enabled = not self.segmentation_enabled  # Revert
+    def on_segmentation_switched(self, enabled, success):
+        """Finish a segmentation toggle on the Tk thread"""
+        self.segmentation_button.config(state=tk.NORMAL)
+        if not success:
+            self.update_status("❌ Failed to switch detection mode")
             messagebox.showerror("Error", "Failed to switch detection mode")
+            return
+
+        self.segmentation_enabled = enabled
+        button_text = f"🤖 AI ANALYSIS: {'ON' if enabled else 'OFF'}"
+        self.segmentation_button.config(text=button_text)
+
+        # Segment mode may have swapped in a segmentation model
+        model_info = self.detector.get_current_model_info()
+        if model_info:
+            self.model_var.set(f"{model_info['icon']} {model_info['name']} - {model_info['description']}")
+        self.update_model_display()
+
+        if enabled:
+            self.segmentation_button.config(bg=config.CYBERPUNK_THEME["primary_color"])
+        else:
+            self.segmentation_button.config(bg=config.CYBERPUNK_THEME["button_color"])
+
+        self.update_status(f"🤖 AI analysis {'enabled' if enabled else 'disabled'}")
+
+    def toggle_tracking(self):
+        """Toggle BoT-SORT object tracking"""
+        if not self.detector_ready():
+            return
+
+        self.detector.set_tracking(not self.detector.tracking_enabled)
+        enabled = self.detector.tracking_enabled
+        self.tracking_button.config(text=f"📍 TRACKING: {'ON' if enabled else 'OFF'}")
 
+        if enabled:
+            self.tracking_button.config(bg=config.CYBERPUNK_THEME["primary_color"])
+        else:
+            self.tracking_button.config(bg=config.CYBERPUNK_THEME["button_color"])
 
+        self.update_status(f"📍 Tracking {'enabled' if enabled else 'disabled'}")
+
+    def toggle_profiling(self):
+        """Toggle per-stage timing spans and counters"""
+        PROFILER.set_enabled(not PROFILER.enabled)
+        enabled = PROFILER.enabled
+        self.profiling_button.config(text=f"⏱️ STAGE PROFILING: {'ON' if enabled else 'OFF'}")
+
+        if enabled:
+            self.profiling_button.config(bg=config.CYBERPUNK_THEME["primary_color"])
+        else:
+            self.profiling_button.config(bg=config.CYBERPUNK_THEME["button_color"])
+
+        self.update_status(f"⏱️ Stage profiling {'enabled' if enabled else 'disabled'}")
+
+    def toggle_cascade(self):
+        """Toggle cascade mode (loading the gate model runs off the Tk thread)"""
+        if not self.detector_ready():
+            return
+
+        enabled = not self.detector.cascade_enabled
+        self.cascade_button.config(state=tk.DISABLED)
+        if enabled:
+            self.update_status(f"🔄 Loading cascade gate {self.detector.cascade.gate_model_key}...")
+
+        def cascade_thread():
+            success = self.detector.set_cascade(enabled)
+            self.root.after(0, lambda: self.on_cascade_toggled(enabled, success))
+
+        threading.Thread(target=cascade_thread, daemon=True).start()
+
+    def on_cascade_toggled(self, enabled, success):
+        """Finish a cascade toggle on the Tk thread"""
+        self.update_cascade_button()
+        if success:
+            self.update_status(f"🪜 Cascade {'enabled' if enabled else 'disabled'}")
+        else:
+            self.update_status("❌ Could not load the cascade gate model")
+
+    def update_cascade_button(self):
+        """Show the detector's cascade state on its button"""
+        enabled = self.detector is not None and self.detector.cascade_enabled
+        self.cascade_button.config(text=f"🪜 CASCADE: {'ON' if enabled else 'OFF'}", state=tk.NORMAL,
+                                   bg=config.CYBERPUNK_THEME["primary_color"] if enabled
+                                   else config.CYBERPUNK_THEME["button_color"])
+
+    def toggle_decoder(self):
+        """Switch between the OpenCV and FFmpeg video decoders"""
+        self.capture_backend = "ffmpeg" if self.capture_backend == "opencv" else "opencv"
+        self.decoder_button.config(text=f"🎞️ DECODER: {self.capture_backend.upper()}")
+        suffix = " (applies on next start)" if self.is_running else ""
+        self.update_status(f"🎞️ Video decoder: {self.capture_backend}{suffix}")
+
+    def open_multi_feed(self):
+        """Open the multi-feed grid (the model serves one of the two views at a time)"""
+        if not self.detector_ready():
+            return
+        if self.is_running:
+            messagebox.showwarning("Warning", "Stop single-feed surveillance before starting multi-feed!")
+            return
+        if self.multi_feed_window is not None:
+            self.multi_feed_window.window.lift()
+            return
+
+        from multi_feed_view import MultiFeedWindow
+
+        self.multi_feed_window = MultiFeedWindow(self)
+        self.update_status("🛰️ Multi-feed surveillance opened")
 
     def toggle_autosave(self):
         """Toggle auto-record surveillance"""
@@ -566,7 +783,7 @@ class DivyaDrishtiGUI:
 
     def start_detection(self):
         """Start drone surveillance"""
-        if not self.detector.is_model_loaded():
+        if self.detector is None or not self.detector.is_model_loaded():
             messagebox.showerror("Error", "AI detection model not loaded!")
             return
 
@@ -574,13 +791,28 @@ class DivyaDrishtiGUI:
             messagebox.showwarning("Warning", "Please select a drone feed source!")
             return
 
+        if self.multi_feed_window is not None:
+            messagebox.showwarning("Warning", "Close multi-feed surveillance first!")
+            return
+
         try:
             # Initialize video capture
-            self.cap = cv2.VideoCapture(self.video_source)
+            self.cap = open_video_source(self.video_source, self.capture_backend)
             if not self.cap.isOpened():
                 messagebox.showerror("Error", f"Could not open video source: {self.video_source}")
                 return
 
+            # New source - track IDs start over
+            self.detector.reset_tracker()
+            self.motion_gate.reset()
+            self.last_detections = Detections.empty()
+            self.open_detection_cache()
+
+            # Decode on its own thread: lossless for files, freshest-frame for live feeds
+            live = FrameCapture.is_live_source(self.video_source)
+            self.capture = FrameCapture(self.cap, live).start()
+            self.pacer = FramePacer(self.pacing_mode(live), self.cap.get(cv2.CAP_PROP_FPS) or None)
+
             # Start detection
             self.is_running = True
             self.frame_count = 0
@@ -591,74 +823,204 @@ class DivyaDrishtiGUI:
             self.stop_button.config(state=tk.NORMAL)
             self.update_status("🚀 Surveillance started")
 
-            # Start detection thread
-            self.detection_thread = threading.Thread(target=self.detection_loop, daemon=True)
-            self.detection_thread.start()
+            # Start the processing pipeline; the display stage runs on the Tk main thread
+            self.pipeline = self.build_pipeline()
+            self.pipeline.start()
+            self.root.after(config.DISPLAY_POLL_MS, self.poll_display)
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start detection: {e}")
             self.is_running = False
 
-    def stop_detection(self):
-        """Stop detection"""
-        self.is_running = False
+    def pacing_mode(self, live):
+        """Live sources never wait; cached replays stream at decode speed"""
+        if live:
+            return "live"
+        cache_stats = self.detector.get_detection_cache_stats()
+        if cache_stats and cache_stats['cached_frames']:
+            return config.DETECTION_CACHE_REPLAY_MODE
+        return config.PLAYBACK_MODE
+
+    def open_detection_cache(self):
+        """Attach the sidecar detection cache when analyzing a video file"""
+        if not config.DETECTION_CACHE or not isinstance(self.video_source, str) or \
+                not os.path.isfile(self.video_source):
+            return
 
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        try:
+            from detection_cache import DetectionCache
 
-        # Update UI
-        self.start_button.config(state=tk.NORMAL)
+            model_hash = self.detector.get_model_hash()
+            if model_hash is None:
+                print("⚠️ Detection cache disabled: model weights file not found")
+                return
+
+            # Tracking re-associates low-confidence boxes, so they must be in the cache too
+            confidence_threshold = self.confidence_threshold
+            if self.detector.tracking_enabled:
+                confidence_threshold = min(confidence_threshold, self.detector.tracker.track_low_thresh)
+
+            frame_format = (self.cap.get(cv2.CAP_PROP_FRAME_WIDTH), self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
+                            self.cap.get(cv2.CAP_PROP_FPS))
+            cache = DetectionCache.open(self.video_source, model_hash, self.detector.class_names,
+                                        confidence_threshold, frame_format=frame_format)
+            self.detector.set_detection_cache(cache)
+        except Exception as e:
+            print(f"⚠️ Detection cache unavailable: {e}")
+
+    def stop_detection(self, wait=False):
+        """Stop detection"""
+        self.finish_detection(wait)
+
+        # Update UI (Start comes back once teardown finishes)
         self.stop_button.config(state=tk.DISABLED)
         self.update_status("⏹️ Surveillance stopped")
 
         # Clear video displays
         self.clear_video_displays()
 
-    def detection_loop(self):
-        """Main detection loop"""
-        while self.is_running and self.cap and self.cap.isOpened():
-            try:
-                ret, frame = self.cap.read()
-                if not ret:
-                    break
-
-                # Process frame with standard YOLO detection
-                start_time = time.time()
-                processed_frame, detections = self.detector.detect(
-                    frame,
-                    confidence_threshold=self.confidence_threshold
-                )
-                inference_time = time.time() - start_time
-
-                # Update performance monitor
-                self.performance_monitor.update_fps(inference_time)
-
-                # Log detections
-                for detection in detections:
-                    self.logger.log_detection(detection, self.frame_count)
+    def build_pipeline(self):
+        """Connect capture -> detect -> annotate -> display / record with bounded queues"""
+        pipeline = Pipeline()
+        annotate_queue = pipeline.add_queue("annotate")
+        display_queue = pipeline.add_queue("display", maxsize=1)  # Newest frame only, no added lag
+        record_queue = pipeline.add_queue("record")
+
+        pipeline.add_stage("detect", self.detect_stage, self.capture, [annotate_queue])
+        pipeline.add_stage("annotate", self.annotate_stage, annotate_queue, [display_queue, record_queue])
+        pipeline.add_stage("record", self.record_stage, record_queue)
+        # Tk widgets may only be touched from the main thread
+        pipeline.add_stage("display", self.display_stage, display_queue, threaded=False)
+        return pipeline
+
+    def detect_stage(self, captured):
+        """Pipeline stage: run (or motion-gate) detection on a captured frame"""
+        # Files play at their own timestamps; inference time comes out of the wait
+        self.pacer.wait(captured.pts, captured.frame_number)
+
+        frame = captured.frame
+        self.performance_monitor.record_capture(time.perf_counter() - captured.timestamp,
+                                                captured.dropped)
+
+        # Static frames reuse the last detections instead of running the detector
+        inferred = self.motion_gate.should_infer(frame)
+        if inferred:
+            start_time = time.time()
+            _, detections = self.detector.detect(
+                frame,
+                confidence_threshold=self.confidence_threshold,
+                annotate=False,
+                frame_number=captured.frame_number
+            )
+            inference_time = time.time() - start_time
+            tracker_time = self.detector.last_tracker_time
+            self.last_detections = detections
+
+            # Update performance monitor (tracker cost reported separately)
+            self.performance_monitor.update_fps(inference_time - tracker_time)
+            self.performance_monitor.record_tracker_time(tracker_time)
+            PROFILER.count("inferred_frames")
+            PROFILER.count("detections", len(detections))
+        else:
+            detections = self.last_detections
+            self.performance_monitor.update_fps()
+
+        self.performance_monitor.record_inference(inferred)
+        self.frame_count += 1
+        PROFILER.count("frames")
+
+        return ProcessedFrame(frame, None, detections, captured.frame_number, inferred, None)
+
+    def annotate_stage(self, item):
+        """Pipeline stage: draw detections when someone will look at them"""
+        if self.annotation_needed():
+            processed_frame = self.detector.annotate(item.frame, item.detections)
+            if self.auto_save_enabled and item.detections:
+                # The renderer reuses its buffers; the recorder may run several frames behind
+                processed_frame = processed_frame.copy()
+        else:
+            processed_frame = item.frame
+
+        # Shrink for the panels here, off the Tk thread: the renderer and the capture
+        # reuse their buffers as soon as this stage moves on to the next frame
+        original_display = self.display_copy(item.frame)
+        processed_display = original_display if processed_frame is item.frame else self.display_copy(processed_frame)
+        return item._replace(processed_frame=processed_frame, display=(original_display, processed_display))
+
+    def display_copy(self, frame):
+        """Panel-sized frame that owns its pixels"""
+        display = utils.resize_frame_for_display(frame, 580, 400)
+        return display.copy() if display is frame else display
+
+    def record_stage(self, item):
+        """Pipeline stage: log fresh detections and auto-save screenshots"""
+        if item.inferred:
+            # Only fresh results, reused ones would be duplicates
+            with PROFILER.span("log"):
+                self.logger.log_detections(item.detections, item.frame_number)
+
+        if self.auto_save_enabled and item.detections:
+            with PROFILER.span("screenshot"):
+                utils.save_screenshot(item.processed_frame, "auto_detection")
+
+    def display_stage(self, item):
+        """Pipeline stage (main thread): show the newest processed frame"""
+        with PROFILER.span("display"):
+            self.update_video_displays(*item.display)
+
+    def poll_display(self):
+        """Drive the display stage from the Tk event loop until the pipeline ends"""
+        pipeline = self.pipeline
+        if pipeline is None or not self.is_running:
+            return
 
-                # Auto-save screenshots if enabled
-                if self.auto_save_enabled and detections:
-                    utils.save_screenshot(processed_frame, "auto_detection")
+        if pipeline.stages["display"].process(timeout=0):
+            self.root.after(config.DISPLAY_POLL_MS, self.poll_display)
+        else:
+            # Source ended (or a stage closed the queues)
+            self.finish_detection()
 
-                # Update displays
-                self.update_video_displays(frame, processed_frame)
+    def finish_detection(self, wait=False):
+        """Tear down the pipeline and release the source
 
-                # Update counters
-                self.frame_count += 1
+        Joining stage threads can take a while, so it runs off the Tk thread
+        unless wait is set (on exit, when there is no event loop to call back into).
+        """
+        self.is_running = False
+        self.start_button.config(state=tk.DISABLED)
+        pipeline, self.pipeline = self.pipeline, None
+        capture, self.capture = self.capture, None
+        cap, self.cap = self.cap, None
+
+        def teardown_thread():
+            if pipeline:
+                pipeline.stop()
+            self.release_capture(capture, cap)
+            if self.detector is not None:
+                self.detector.set_detection_cache(None)
+            if not wait:
+                self.root.after(0, self.on_detection_finished)
+
+        if wait:
+            teardown_thread()
+        else:
+            threading.Thread(target=teardown_thread, daemon=True).start()
 
-                # Control frame rate
-                time.sleep(1.0 / config.MAX_FPS)
+    def on_detection_finished(self):
+        """Re-enable Start once the previous run is fully torn down"""
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
 
-            except Exception as e:
-                print(f"Detection loop error: {e}")
-                break
+    def release_capture(self, capture, cap):
+        """Stop the capture thread, then release the video source it reads from"""
+        if capture:
+            capture.stop()
+        if cap:
+            cap.release()
 
-        # Cleanup
-        if self.cap:
-            self.cap.release()
-        self.is_running = False
+    def annotation_needed(self):
+        """Check if anyone will look at the annotated frame (display or recorder)"""
+        return self.auto_save_enabled or self.processed_panel_visible
 
     def update_video_displays(self, original_frame, processed_frame):
         """Update video display panels"""
@@ -709,12 +1071,26 @@ class DivyaDrishtiGUI:
             # Update frame count
             self.frame_label.config(text=f"🎬 FRAMES: {self.frame_count:,}")
 
+            # Skip annotation while the analysis panel is hidden (e.g. window minimized)
+            self.processed_panel_visible = bool(self.processed_label.winfo_viewable())
+
             # Update drone location
             self.update_drone_location()
 
             # Update detection log
             self.update_detection_log()
 
+            # Queue depths and stage occupancy
+            if self.pipeline is not None:
+                self.performance_monitor.record_pipeline(self.pipeline.get_stats())
+            if self.pacer is not None:
+                self.performance_monitor.record_pacing(self.pacer.get_stats())
+            if self.detector is not None:
+                self.performance_monitor.record_tiling(self.detector.get_tile_stats()
+                                                       if self.detector.tiling_enabled else None)
+                self.performance_monitor.record_cascade(self.detector.get_cascade_stats()
+                                                        if self.detector.cascade_enabled else None)
+
             # Update performance display
             self.update_performance_display()
 
@@ -757,7 +1133,9 @@ class DivyaDrishtiGUI:
     def on_closing(self):
         """Handle application closing"""
         if self.is_running:
-            self.stop_detection()
+            self.stop_detection(wait=True)
+        if self.multi_feed_window is not None:
+            self.multi_feed_window.close()
 
         # Stop performance monitoring
         self.performance_monitor.stop_monitoring()
@@ -771,10 +1149,10 @@ class DivyaDrishtiGUI:
 
         self.root.destroy()
 
-def main():
+def main(startup_timer=None):
     """Main application entry point"""
     root = tk.Tk()
-    app = DivyaDrishtiGUI(root)
+    app = DivyaDrishtiGUI(root, startup_timer)
 
     # Handle window closing
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
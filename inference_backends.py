@@ -0,0 +1,236 @@
+"""
+DivyaDrishti Inference Backends
+PyTorch, ONNX Runtime and OpenVINO model loading with cached exported artifacts
+"""
+
+import importlib.util
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+import cv2
+import numpy as np
+from ultralytics import YOLO
+import config
+import utils
+from detections import Detections
+
+def get_model_task(model_info):
+    """Get the ultralytics task name for a model entry"""
+    return "segment" if model_info.get("type") == "segmentation" else "detect"
+
+def resolve_weights_path(model_info):
+    """Get a local path to a model's .pt weights, downloading official weights if needed"""
+    model_path = Path(model_info["path"])
+    if model_path.exists():
+        return model_path
+
+    # YOLO downloads official weights on construction
+    model = YOLO(str(model_path))
+    return Path(getattr(model, 'ckpt_path', None) or model_path)
+
+class PyTorchBackend:
+    name = "pytorch"
+
+    def __init__(self, imgsz=None):
+        self.imgsz = imgsz or config.EXPORT_IMGSZ
+
+    def is_available(self):
+        """Check if the backend runtime is installed"""
+        return True
+
+    def load(self, model_key, model_info, device, weights_hash=None):
+        """Load a model ready for inference (weights_hash: registry SHA-256 of the weights, if known)"""
+        model = YOLO(model_info["path"])
+        if device != "cpu":
+            model.to(device)
+        return model
+
+    def get_info(self, model_key):
+        """Get backend details for display"""
+        return {'backend': self.name}
+
+class ExportedBackend(PyTorchBackend):
+    """Base for backends that run an exported artifact cached under EXPORT_CACHE_DIR"""
+
+    export_format = None
+    runtime_module = None
+
+    def __init__(self, imgsz=None):
+        super().__init__(imgsz)
+        self.cache_dir = Path(config.EXPORT_CACHE_DIR)
+        self.metadata = {}  # model_key -> cached artifact metadata
+
+    def is_available(self):
+        return importlib.util.find_spec(self.runtime_module) is not None
+
+    def load(self, model_key, model_info, device, weights_hash=None):
+        artifact = self.get_artifact(model_key, model_info, weights_hash)
+        return YOLO(str(artifact), task=get_model_task(model_info))
+
+    def get_info(self, model_key):
+        info = {'backend': self.name}
+        info.update(self.metadata.get(model_key, {}))
+        return info
+
+    def export_args(self):
+        """Extra arguments for model.export"""
+        return {}
+
+    def artifact_dir(self, model_key, weights_hash):
+        """Get the cache directory for a model, keyed by weights hash, imgsz and dynamic shape"""
+        shape = "dynamic" if config.EXPORT_DYNAMIC else "static"
+        return self.cache_dir / f"{model_key}-{weights_hash[:16]}-{self.imgsz}-{shape}-{self.name}"
+
+    def get_artifact(self, model_key, model_info, weights_hash=None):
+        """Get the exported artifact for a model, exporting it on first use
+
+        Pass the registry's weights_hash when the weights are already validated;
+        without it the whole .pt is hashed to find the cache entry.
+        """
+        weights = resolve_weights_path(model_info)
+        weights_hash = weights_hash or utils.calculate_file_hash(weights)
+        artifact_dir = self.artifact_dir(model_key, weights_hash)
+        metadata_file = artifact_dir / "metadata.json"
+
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                artifact = artifact_dir / metadata['artifact']
+                if metadata.get('dynamic') != config.EXPORT_DYNAMIC:
+                    print(f"🔄 Cached {self.name.upper()} export has a different input shape mode, re-exporting")
+                elif artifact.exists():
+                    self.metadata[model_key] = metadata
+                    print(f"✓ Using cached {self.name.upper()} export: {artifact}")
+                    return artifact
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable export cache {artifact_dir}: {e}")
+
+        return self._export(model_key, model_info, weights, weights_hash, artifact_dir)
+
+    def _export(self, model_key, model_info, weights, weights_hash, artifact_dir):
+        """Export weights to this backend's format and store it in the cache"""
+        print(f"📦 Exporting {model_info['name']} to {self.name.upper()} (imgsz={self.imgsz})...")
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+
+        torch_model = YOLO(str(weights))
+        exported = Path(torch_model.export(format=self.export_format, imgsz=self.imgsz,
+                                           dynamic=config.EXPORT_DYNAMIC, verbose=False,
+                                           **self.export_args()))
+
+        artifact = artifact_dir / exported.name
+        if artifact.is_dir():
+            shutil.rmtree(artifact)
+        elif artifact.exists():
+            artifact.unlink()
+        shutil.move(str(exported), str(artifact))
+
+        metadata = {
+            'model_key': model_key,
+            'weights': str(weights),
+            'weights_sha256': weights_hash,
+            'imgsz': self.imgsz,
+            'dynamic': config.EXPORT_DYNAMIC,
+            'format': self.name,
+            'artifact': artifact.name,
+            'exported_at': datetime.now().isoformat()
+        }
+
+        if config.BACKEND_PARITY_CHECK:
+            exported_model = YOLO(str(artifact), task=get_model_task(model_info))
+            metadata['parity'] = check_parity(torch_model, exported_model, imgsz=self.imgsz)
+            status = "✓" if metadata['parity']['passed'] else "⚠️"
+            print(f"{status} {self.name.upper()} parity: {metadata['parity']['matched']}/"
+                  f"{metadata['parity']['reference_count']} boxes matched, "
+                  f"max confidence delta {metadata['parity']['max_conf_delta']:.3f}")
+
+        with open(artifact_dir / "metadata.json", 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+
+        self.metadata[model_key] = metadata
+        print(f"✓ Exported {model_info['name']} to {artifact}")
+        return artifact
+
+class OnnxBackend(ExportedBackend):
+    name = "onnx"
+    export_format = "onnx"
+    runtime_module = "onnxruntime"
+
+    def export_args(self):
+        return {'simplify': True}
+
+class OpenVinoBackend(ExportedBackend):
+    name = "openvino"
+    export_format = "openvino"
+    runtime_module = "openvino"
+
+INFERENCE_BACKENDS = {
+    "pytorch": PyTorchBackend,
+    "onnx": OnnxBackend,
+    "openvino": OpenVinoBackend
+}
+
+def get_backend(name=None):
+    """Create an inference backend by name, falling back to PyTorch if its runtime is missing"""
+    name = (name or config.INFERENCE_BACKEND).lower()
+    backend_class = INFERENCE_BACKENDS.get(name)
+    if backend_class is None:
+        print(f"⚠️ Unknown inference backend '{name}', using PyTorch")
+        return PyTorchBackend()
+
+    backend = backend_class()
+    if not backend.is_available():
+        print(f"⚠️ {name} runtime not installed ({backend.runtime_module}), using PyTorch")
+        return PyTorchBackend()
+    return backend
+
+def _parity_image():
+    """Get a real-world test image for parity checks"""
+    try:
+        from ultralytics.utils import ASSETS
+        image = cv2.imread(str(ASSETS / "bus.jpg"))
+        if image is not None:
+            return image
+    except Exception:
+        pass
+
+    # Deterministic noise still exercises the full pre/post-processing path
+    return np.random.default_rng(0).integers(0, 256, (640, 640, 3), dtype=np.uint8)
+
+def check_parity(reference_model, candidate_model, image=None, imgsz=None, iou_threshold=0.5):
+    """Compare detections from an exported model against the PyTorch reference"""
+    if image is None:
+        image = _parity_image()
+    imgsz = imgsz or config.EXPORT_IMGSZ
+
+    reference = Detections.from_result(reference_model(image, conf=0.25, imgsz=imgsz, verbose=False)[0])
+    candidate = Detections.from_result(candidate_model(image, conf=0.25, imgsz=imgsz, verbose=False)[0])
+
+    matched = 0
+    mean_iou = 0.0
+    max_conf_delta = 0.0
+    if len(reference) > 0 and len(candidate) > 0:
+        ious = utils.calculate_box_iou_matrix(reference.xyxy, candidate.xyxy)
+        ious[reference.cls[:, None] != candidate.cls[None, :]] = 0
+        best = ious.argmax(axis=1)
+        best_iou = ious[np.arange(len(reference)), best]
+        hits = best_iou >= iou_threshold
+
+        matched = int(hits.sum())
+        if matched:
+            mean_iou = float(best_iou[hits].mean())
+            max_conf_delta = float(np.abs(reference.conf[hits] - candidate.conf[best[hits]]).max())
+
+    expected = max(len(reference), len(candidate))
+    passed = (expected == 0 or matched / expected >= config.PARITY_MIN_MATCH_RATIO) and \
+        max_conf_delta <= config.PARITY_MAX_CONF_DELTA
+
+    return {
+        'reference_count': len(reference),
+        'candidate_count': len(candidate),
+        'matched': matched,
+        'mean_iou': mean_iou,
+        'max_conf_delta': max_conf_delta,
+        'passed': bool(passed)
+    }
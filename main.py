@@ -8,6 +8,8 @@ Main entry point for the application
 
 import sys
 import os
+import importlib.util
+from importlib import metadata
 from pathlib import Path
 
 # Add current directory to Python path
@@ -16,48 +18,41 @@ sys.path.insert(0, str(current_dir))
 
 import config
 import utils
-from gui_app import main as gui_main
-
-def check_dependencies():
-    """Check if all required dependencies are installed"""
-    missing_deps = []
-
-    try:
-        import torch
-        import torchvision
-        print(f"✓ PyTorch {torch.__version__} installed")
-    except ImportError:
-        missing_deps.append("torch")
 
+# Startup phases are measured from here
+STARTUP_TIMER = utils.PhaseTimer("startup")
+
+# (import name, distribution name, display name)
+REQUIRED_PACKAGES = [
+    ("torch", "torch", "PyTorch"),
+    ("torchvision", "torchvision", "TorchVision"),
+    ("ultralytics", "ultralytics", "Ultralytics"),
+    ("cv2", "opencv-python", "OpenCV"),
+    ("PIL", "pillow", "Pillow"),
+    ("numpy", "numpy", "NumPy"),
+    ("pandas", "pandas", "Pandas")
+]
+
+def get_package_version(distribution):
+    """Get an installed package version from its metadata, without importing it"""
     try:
-        import ultralytics
-        print(f"✓ Ultralytics {ultralytics.__version__} installed")
-    except ImportError:
-        missing_deps.append("ultralytics")
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return "(version unknown)"
 
-    try:
-        import cv2
-        print(f"✓ OpenCV {cv2.__version__} installed")
-    except ImportError:
-        missing_deps.append("opencv-python")
-
-    try:
-        import PIL
-        print(f"✓ Pillow {PIL.__version__} installed")
-    except ImportError:
-        missing_deps.append("pillow")
+def check_dependencies():
+    """Check if all required dependencies are installed
 
-    try:
-        import numpy
-        print(f"✓ NumPy {numpy.__version__} installed")
-    except ImportError:
-        missing_deps.append("numpy")
+    Only looks packages up - heavy modules (torch, ultralytics, pandas) are
+    imported later, when the detector loads.
+    """
+    missing_deps = []
 
-    try:
-        import pandas
-        print(f"✓ Pandas {pandas.__version__} installed")
-    except ImportError:
-        missing_deps.append("pandas")
+    for module_name, distribution, display_name in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(module_name) is None:
+            missing_deps.append(distribution)
+        else:
+            print(f"✓ {display_name} {get_package_version(distribution)} installed")
 
     return missing_deps
 
@@ -100,7 +95,14 @@ def setup_environment():
     if not check_foottrail_model():
         return False
 
-    # Check GPU availability
+    STARTUP_TIMER.mark("environment_checked")
+
+    print("\n✓ Environment setup complete!")
+    print("=" * 60)
+    return True
+
+def check_gpu_support():
+    """Check GPU availability (imports torch, so only for --check)"""
     print("\n🖥️ Checking GPU Support...")
     try:
         import torch
@@ -113,10 +115,6 @@ def setup_environment():
     except Exception as e:
         print(f"⚠️ GPU check failed: {e}")
 
-    print("\n✓ Environment setup complete!")
-    print("=" * 60)
-    return True
-
 def print_usage():
     """Print usage information"""
     print(f"""
@@ -129,6 +127,7 @@ OPTIONS:
   --help, -h     Show this help message
   --version, -v  Show version information
   --check        Check system requirements only
+  --profile      Start with per-stage profiling on (also toggled in the performance panel)
   --gui          Start GUI application (default)
 
 FEATURES:
@@ -169,13 +168,20 @@ def main():
         return
 
     if "--check" in args:
+        check_gpu_support()
         print("\n✅ System check completed successfully!")
         return
 
+    if "--profile" in args:
+        from stage_profiler import PROFILER
+        PROFILER.set_enabled(True)
+
     # Start GUI application
     try:
         print("\n🚀 Starting DivyaDrishti GUI...")
-        gui_main()
+        from gui_app import main as gui_main
+        STARTUP_TIMER.mark("gui_imported")
+        gui_main(STARTUP_TIMER)
     except KeyboardInterrupt:
         print("\n\n👋 Application interrupted by user")
     except Exception as e:
@@ -0,0 +1,117 @@
+"""
+DivyaDrishti Micro-Batcher
+Groups frames from live feeds into small batches with bounded added latency
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import config
+from detections import Detections
+
+class MicroBatcher:
+    def __init__(self, detector, max_batch_size=None, max_wait_ms=None, confidence_threshold=None):
+        self.detector = detector
+        self.max_batch_size = max_batch_size or config.BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.BATCH_MAX_WAIT_MS) / 1000.0
+        self.confidence_threshold = confidence_threshold or config.CONFIDENCE_THRESHOLD
+
+        self.pending = queue.Queue()
+        self.running = False
+        self.worker_thread = None
+
+        # Statistics
+        self.batch_sizes = deque(maxlen=100)
+        self.batch_times = deque(maxlen=100)
+        self.total_frames = 0
+
+    def start(self):
+        """Start the batching worker thread"""
+        if not self.running:
+            self.running = True
+            self.worker_thread = threading.Thread(target=self._run, daemon=True)
+            self.worker_thread.start()
+
+    def stop(self):
+        """Stop the worker and fail any frames still waiting"""
+        self.running = False
+        if self.worker_thread:
+            self.worker_thread.join(timeout=1)
+            self.worker_thread = None
+
+        while True:
+            try:
+                _, future = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+
+    def set_confidence_threshold(self, confidence_threshold):
+        """Set the threshold used for subsequent batches"""
+        self.confidence_threshold = confidence_threshold
+
+    def submit(self, frame):
+        """Queue a frame for detection, returns a Future of (annotated_frame, detections)"""
+        future = Future()
+        self.pending.put((frame, future))
+        return future
+
+    def detect(self, frame, timeout=None):
+        """Queue a frame and wait for its detections"""
+        return self.submit(frame).result(timeout=timeout)
+
+    def _collect_batch(self):
+        """Wait for a first frame, then gather more until the batch is full or max_wait passes"""
+        try:
+            batch = [self.pending.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Worker loop"""
+        while self.running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            frames = [frame for frame, _ in batch]
+            start_time = time.perf_counter()
+            try:
+                outputs = self.detector.detect_batch(frames, self.confidence_threshold,
+                                                     max_batch_size=self.max_batch_size)
+            except Exception as e:
+                print(f"✗ Micro-batch error: {e}")
+                outputs = [(frame, Detections.empty()) for frame in frames]
+
+            self.batch_times.append(time.perf_counter() - start_time)
+            self.batch_sizes.append(len(batch))
+            self.total_frames += len(batch)
+
+            for (_, future), output in zip(batch, outputs):
+                if not future.cancelled():
+                    future.set_result(output)
+
+    def get_stats(self):
+        """Get batching statistics"""
+        if not self.batch_sizes:
+            return {'avg_batch_size': 0, 'avg_batch_time': 0, 'total_frames': self.total_frames}
+
+        return {
+            'avg_batch_size': sum(self.batch_sizes) / len(self.batch_sizes),
+            'avg_batch_time': (sum(self.batch_times) / len(self.batch_times)) * 1000,  # ms
+            'total_frames': self.total_frames
+        }
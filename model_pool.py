@@ -0,0 +1,155 @@
+"""
+DivyaDrishti Warm Model Pool
+Bounded LRU cache of loaded and warmed YOLO models for instant switching
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+import config
+
+class WarmModelPool:
+    def __init__(self, max_models=None, memory_budget_mb=None):
+        self.max_models = max_models if max_models is not None else config.MODEL_POOL_MAX_MODELS
+        if memory_budget_mb is None:
+            memory_budget_mb = config.MODEL_POOL_MEMORY_BUDGET_MB
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+
+        self.entries = OrderedDict()  # model_key -> entry, least recently used first
+        self.lock = threading.RLock()
+
+        # Switch history used to guess the next model to pre-warm
+        self.transitions = defaultdict(lambda: defaultdict(int))
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, model_key):
+        with self.lock:
+            return model_key in self.entries
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def keys(self):
+        """Get pooled model keys, least recently used first"""
+        with self.lock:
+            return list(self.entries.keys())
+
+    def get(self, model_key):
+        """Get a warmed model entry and mark it as most recently used"""
+        with self.lock:
+            entry = self.entries.get(model_key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(model_key)
+            entry['last_used'] = time.time()
+            self.hits += 1
+            return entry
+
+    def put(self, model_key, model, class_names, protect=()):
+        """Add a warmed model to the pool and evict least recently used models over budget"""
+        entry = {
+            'model': model,
+            'class_names': list(class_names),
+            'size_bytes': self._estimate_model_size(model),
+            'loaded_at': time.time(),
+            'last_used': time.time()
+        }
+
+        with self.lock:
+            self.entries[model_key] = entry
+            self.entries.move_to_end(model_key)
+            return self._evict(protect=set(protect) | {model_key})
+
+    def remove(self, model_key):
+        """Drop a model from the pool"""
+        with self.lock:
+            return self.entries.pop(model_key, None) is not None
+
+    def clear(self):
+        """Drop all pooled models"""
+        with self.lock:
+            self.entries.clear()
+
+    def _evict(self, protect):
+        """Evict least recently used models until count and memory budget are met"""
+        evicted = []
+        while self._over_budget():
+            victim = next((key for key in self.entries if key not in protect), None)
+            if victim is None:
+                break
+            self.entries.pop(victim)
+            self.evictions += 1
+            evicted.append(victim)
+            print(f"🗑️ Evicted {victim} from warm model pool")
+        return evicted
+
+    def _over_budget(self):
+        """Check if the pool exceeds its model count or memory budget"""
+        if self.max_models and len(self.entries) > self.max_models:
+            return True
+        if self.memory_budget and self.get_memory_usage() > self.memory_budget:
+            return True
+        return False
+
+    def get_memory_usage(self):
+        """Get estimated memory used by pooled models in bytes"""
+        with self.lock:
+            return sum(entry['size_bytes'] for entry in self.entries.values())
+
+    def _estimate_model_size(self, model):
+        """Estimate model memory from parameter and buffer tensors"""
+        try:
+            module = model.model
+            size = sum(p.numel() * p.element_size() for p in module.parameters())
+            size += sum(b.numel() * b.element_size() for b in module.buffers())
+            return size
+        except Exception:
+            pass
+
+        # Exported models keep their artifact path in model.model
+        for path in (getattr(model, 'ckpt_path', None), getattr(model, 'model', None)):
+            try:
+                return os.path.getsize(path)
+            except Exception:
+                continue
+        return 0
+
+    def record_switch(self, from_key, to_key):
+        """Record a model switch for next-model prediction"""
+        if from_key and to_key and from_key != to_key:
+            with self.lock:
+                self.transitions[from_key][to_key] += 1
+
+    def predict_next(self, current_key):
+        """Predict the model most likely to be requested after the current one"""
+        with self.lock:
+            candidates = self.transitions.get(current_key)
+            if candidates:
+                return max(candidates.items(), key=lambda item: item[1])[0]
+
+        fallback = config.MODEL_POOL_PREWARM_FALLBACK
+        if fallback and fallback != current_key:
+            return fallback
+        return None
+
+    def get_stats(self):
+        """Get pool statistics"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'models': list(self.entries.keys()),
+                'memory_mb': self.get_memory_usage() / (1024 * 1024),
+                'memory_budget_mb': self.memory_budget / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,126 @@
+"""
+DivyaDrishti Model Registry
+Manifest of model checksums and cached metadata (class names, input shape, load/warm-up times)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+import config
+import utils
+
+MIN_MODEL_SIZE = 1024  # Anything smaller is certainly not a model
+
+class ModelRegistry:
+    def __init__(self, manifest_path=None):
+        self.manifest_path = Path(manifest_path or config.MODEL_REGISTRY_FILE)
+        self.lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        """Load the manifest"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable model registry {self.manifest_path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write the manifest (caller holds the lock)"""
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except Exception as e:
+            print(f"⚠️ Could not save model registry: {e}")
+
+    def get(self, model_key):
+        """Get the registry entry for a model"""
+        with self.lock:
+            entry = self.entries.get(model_key)
+            return dict(entry) if entry else None
+
+    def _stat(self, path):
+        """Get (size, mtime_ns) used to detect unchanged files without hashing"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def validate(self, model_key, path):
+        """Check a model file against the registry
+
+        Returns "missing", "unregistered", "unchanged", "changed" (a custom model
+        was replaced) or "corrupted" (downloaded weights no longer match their hash).
+        An unchanged size and mtime is trusted without reading the file.
+        """
+        path = Path(path)
+        if not path.exists():
+            return "missing"
+
+        size, mtime_ns = self._stat(path)
+        if size < MIN_MODEL_SIZE:
+            return "corrupted"
+
+        entry = self.get(model_key)
+        if entry is None or Path(entry['path']).resolve() != path.resolve():
+            return "unregistered"
+
+        if entry['size'] == size and entry['mtime_ns'] == mtime_ns and not config.MODEL_REGISTRY_VERIFY_HASH:
+            return "unchanged"
+
+        if utils.calculate_file_hash(path) == entry['sha256']:
+            # Touched but identical - refresh the stat so the next check is O(1) again
+            with self.lock:
+                self.entries[model_key].update({'size': size, 'mtime_ns': mtime_ns})
+                self._save()
+            return "unchanged"
+
+        # Official weights are immutable, so a different hash means a damaged download
+        return "changed" if path.is_absolute() else "corrupted"
+
+    def cached_metadata(self, model_key, path):
+        """Get cached metadata if the model file is unchanged since it was registered"""
+        if self.validate(model_key, path) != "unchanged":
+            return None
+        return self.get(model_key)
+
+    def register(self, model_key, path, class_names, input_shape, task, load_time, warmup_time):
+        """Record a freshly loaded model (hashes the file once)"""
+        path = Path(path)
+        size, mtime_ns = self._stat(path)
+        entry = {
+            'path': str(path),
+            'sha256': utils.calculate_file_hash(path),
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'class_names': list(class_names),
+            'input_shape': list(input_shape),
+            'task': task,
+            'load_time': load_time,
+            'warmup_time': warmup_time,
+            'registered_at': datetime.now().isoformat()
+        }
+        with self.lock:
+            self.entries[model_key] = entry
+            self._save()
+        return entry
+
+    def record_load(self, model_key, load_time):
+        """Update the measured load time of a registered model"""
+        with self.lock:
+            if model_key in self.entries:
+                self.entries[model_key]['load_time'] = load_time
+                self.entries[model_key]['last_loaded_at'] = datetime.now().isoformat()
+                self._save()
+
+    def remove(self, model_key):
+        """Forget a model (e.g. after deleting a corrupted file)"""
+        with self.lock:
+            if self.entries.pop(model_key, None) is not None:
+                self._save()
@@ -0,0 +1,83 @@
+"""
+DivyaDrishti Motion Gate
+Cheap pre-stage that decides whether a frame needs a full detector pass
+"""
+
+import cv2
+import numpy as np
+import config
+
+class MotionGate:
+    def __init__(self, method=None, threshold=None, max_interval=None):
+        self.method = method or config.MOTION_GATE_METHOD
+        self.threshold = threshold if threshold is not None else config.MOTION_THRESHOLD
+        self.max_interval = max_interval or config.MOTION_GATE_MAX_INTERVAL
+        self.min_interval = max(1, config.SKIP_FRAMES)
+        self.analysis_width = config.MOTION_GATE_WIDTH
+        self.pixel_threshold = config.MOTION_PIXEL_THRESHOLD
+
+        self.enabled = config.MOTION_GATING
+        self.reset()
+
+    def reset(self):
+        """Forget the reference frame so the next frame is always inferred"""
+        self.reference = None
+        self.subtractor = None
+        self.frames_since_inference = None
+        self.last_motion = 0.0
+
+    def set_threshold(self, threshold):
+        """Tune the fraction of changed pixels that counts as motion"""
+        self.threshold = float(threshold)
+
+    def _prepare(self, frame):
+        """Downscale, gray and blur a frame for differencing"""
+        height, width = frame.shape[:2]
+        scale = self.analysis_width / width
+        small = cv2.resize(frame, (self.analysis_width, max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def _measure_motion(self, small):
+        """Fraction of pixels that changed since the last inferred frame"""
+        if self.method == "mog2":
+            if self.subtractor is None:
+                self.subtractor = cv2.createBackgroundSubtractorMOG2(history=100, detectShadows=False)
+            mask = self.subtractor.apply(small)
+            return float(np.count_nonzero(mask)) / mask.size
+
+        if self.reference is None or self.reference.shape != small.shape:
+            return 1.0
+        diff = cv2.absdiff(small, self.reference)
+        return float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+    def should_infer(self, frame):
+        """Check if frame needs a detector pass, or the last detections can be reused"""
+        if not self.enabled:
+            return True
+
+        # First frame after a reset
+        if self.frames_since_inference is None:
+            self.reference = self._prepare(frame)
+            self.frames_since_inference = 0
+            self.last_motion = 1.0
+            return True
+
+        self.frames_since_inference += 1
+
+        # SKIP_FRAMES stride - no work at all on in-between frames
+        if self.frames_since_inference < self.min_interval:
+            return False
+
+        small = self._prepare(frame)
+        self.last_motion = self._measure_motion(small)
+
+        if self.last_motion >= self.threshold or self.frames_since_inference >= self.max_interval:
+            # Compare future frames against this one so slow drift still accumulates
+            self.reference = small
+            self.frames_since_inference = 0
+            return True
+
+        return False
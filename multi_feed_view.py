@@ -0,0 +1,170 @@
+"""
+DivyaDrishti Multi-Feed View
+Grid window for watching several drone feeds analyzed concurrently
+"""
+
+import math
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import cv2
+from PIL import Image, ImageTk
+import config
+import utils
+from feed_scheduler import FeedScheduler
+
+class MultiFeedWindow:
+    """Toplevel grid of feeds sharing the main window's detector"""
+
+    def __init__(self, app):
+        self.app = app
+        self.scheduler = FeedScheduler(app.detector, app.logger)
+        self.scheduler.set_confidence_threshold(app.confidence_threshold)
+        self.tiles = {}  # Feed -> tile widgets and last shown result version
+        self.closed = False
+
+        theme = config.CYBERPUNK_THEME
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f"{config.WINDOW_TITLE} - Multi-Feed")
+        self.window.configure(bg=theme["bg_color"])
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window, bg=theme["bg_color"])
+        controls.pack(fill=tk.X, padx=10, pady=10)
+
+        tk.Label(controls, text="🛰️ SOURCE:", font=('Consolas', 10, 'bold'),
+                 fg=theme["primary_color"], bg=theme["bg_color"]).pack(side=tk.LEFT)
+
+        self.source_entry = tk.Entry(controls, width=40, font=('Consolas', 10),
+                                     fg=theme["text_color"], bg=theme["button_color"],
+                                     insertbackground=theme["text_color"])
+        self.source_entry.insert(0, str(config.DEFAULT_DRONE_FEED))
+        self.source_entry.pack(side=tk.LEFT, padx=(10, 0))
+
+        for text, command in (("➕ ADD SOURCE", self.add_source), ("📁 ADD FILE", self.add_file),
+                              ("⏹️ STOP ALL", self.close)):
+            tk.Button(controls, text=text, command=command, font=('Consolas', 9, 'bold'),
+                      fg=theme["accent_color"], bg=theme["button_color"]).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.grid_frame = tk.Frame(self.window, bg=theme["bg_color"])
+        self.grid_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.scheduler.start()
+        self.refresh()
+
+    def add_source(self):
+        """Add the camera index or stream URL typed in the source field"""
+        text = self.source_entry.get().strip()
+        if text:
+            self._add_feed(int(text) if text.isdigit() else text)
+
+    def add_file(self):
+        """Add a video file as a feed"""
+        file_path = filedialog.askopenfilename(
+            parent=self.window,
+            title="Select Video File",
+            filetypes=[
+                ("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv *.flv *.webm"),
+                ("All files", "*.*")
+            ]
+        )
+        if file_path:
+            self._add_feed(file_path)
+
+    def _add_feed(self, source):
+        """Open a feed and give it a tile"""
+        feed = self.scheduler.add_feed(source, backend=self.app.capture_backend)
+        if feed is None:
+            messagebox.showerror("Error", f"Could not add feed: {source}", parent=self.window)
+            return
+        self._build_tile(feed)
+        self._layout()
+        self.app.update_status(f"🛰️ {feed.name} added ({len(self.tiles)} feeds)")
+
+    def _build_tile(self, feed):
+        """Create the widgets of one feed"""
+        theme = config.CYBERPUNK_THEME
+        frame = tk.Frame(self.grid_frame, bg=theme["bg_color"], highlightthickness=2,
+                         highlightbackground=theme["border_color"])
+
+        header = tk.Frame(frame, bg=theme["bg_color"])
+        header.pack(fill=tk.X)
+        tk.Label(header, text=f"🚁 {feed.name}", font=('Consolas', 10, 'bold'),
+                 fg=theme["primary_color"], bg=theme["bg_color"]).pack(side=tk.LEFT)
+        tk.Button(header, text="✖", command=lambda: self.remove_feed(feed), font=('Consolas', 8, 'bold'),
+                  fg=theme["secondary_color"], bg=theme["button_color"]).pack(side=tk.RIGHT)
+
+        priority_var = tk.DoubleVar(value=feed.priority)
+        tk.Spinbox(header, from_=0.5, to=10.0, increment=0.5, width=4, textvariable=priority_var,
+                   command=lambda: self.scheduler.set_priority(feed, priority_var.get()),
+                   font=('Consolas', 9)).pack(side=tk.RIGHT, padx=(0, 5))
+        tk.Label(header, text="PRIORITY", font=('Consolas', 8),
+                 fg=theme["accent_color"], bg=theme["bg_color"]).pack(side=tk.RIGHT, padx=(0, 5))
+
+        image_label = tk.Label(frame, bg="#000000")
+        image_label.pack()
+
+        stats_label = tk.Label(frame, text="⏳ Waiting for frames...", font=('Consolas', 9),
+                               fg=theme["text_color"], bg=theme["bg_color"], anchor=tk.W)
+        stats_label.pack(fill=tk.X)
+
+        self.tiles[feed] = {'frame': frame, 'image': image_label, 'stats': stats_label, 'version': 0}
+
+    def _layout(self):
+        """Arrange tiles in a near-square grid"""
+        columns = max(1, math.ceil(math.sqrt(len(self.tiles))))
+        for index, tile in enumerate(self.tiles.values()):
+            tile['frame'].grid(row=index // columns, column=index % columns, padx=5, pady=5)
+
+    def remove_feed(self, feed):
+        """Stop one feed and drop its tile"""
+        tile = self.tiles.pop(feed, None)
+        if tile:
+            tile['frame'].destroy()
+        self.scheduler.remove_feed(feed)
+        self._layout()
+
+    def refresh(self):
+        """Show the newest result of each feed and its statistics"""
+        if self.closed:
+            return
+
+        theme = config.CYBERPUNK_THEME
+        self.scheduler.set_confidence_threshold(self.app.confidence_threshold)
+        width, height = config.MULTI_FEED_TILE_SIZE
+
+        for feed, tile in list(self.tiles.items()):
+            try:
+                version, latest = feed.get_latest()
+                if latest is not None and version != tile['version']:
+                    frame, detections, _ = latest
+                    annotated = feed.renderer.render(frame, detections)
+                    display = utils.resize_frame_for_display(annotated, width, height)
+                    if display is not None:
+                        photo = ImageTk.PhotoImage(Image.fromarray(cv2.cvtColor(display, cv2.COLOR_BGR2RGB)))
+                        tile['image'].configure(image=photo)
+                        tile['image'].image = photo
+                    tile['version'] = version
+
+                stats = feed.get_stats()
+                status = "🏁 ENDED" if stats['ended'] else f"{stats['fps']:.1f} FPS"
+                tile['stats'].config(text=f"{status} | {stats['avg_latency_ms']:.0f}ms | "
+                                          f"dropped {stats['dropped']:,} | weight {stats['weight']:.1f}"
+                                          f"{' | 🚨 ALERT' if stats['alert'] else ''}")
+                tile['frame'].config(highlightbackground=theme["secondary_color"] if stats['alert']
+                                     else theme["border_color"])
+            except Exception as e:
+                print(f"Multi-feed display error: {e}")
+
+        self.app.performance_monitor.record_feeds(self.scheduler.get_stats())
+        self.window.after(config.MULTI_FEED_REFRESH_MS, self.refresh)
+
+    def close(self):
+        """Stop every feed and close the window"""
+        if self.closed:
+            return
+        self.closed = True
+        self.scheduler.stop()
+        self.app.performance_monitor.record_feeds(None)
+        self.app.multi_feed_window = None
+        self.window.destroy()
+        self.app.update_status("🛰️ Multi-feed surveillance stopped")
@@ -3,33 +3,113 @@ DivyaDrishti Multi-Model Object Detector
 Support for multiple YOLO models with dynamic switching
 """
 
-import cv2
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zipfile
 import torch
 import numpy as np
 from ultralytics import YOLO
-from pathlib import Path
 import config
 import utils
+from model_pool import WarmModelPool
+from model_registry import ModelRegistry
+from detections import Detections
+from annotation_renderer import AnnotationRenderer
+from tiled_inference import TiledInference
+from zone_inference import ZoneInference
+from adaptive_resolution import AdaptiveResolution
+from preprocessing import FramePreprocessor
+from cascade import DetectionCascade
+from box_propagation import KeyframePropagator
+from inference_backends import get_backend, get_model_task
+from quantization import get_quantized_variants
+from object_tracker import ObjectTracker
+from stage_profiler import PROFILER
+
+# torch.load messages for a truncated or damaged checkpoint (as opposed to CUDA, export or argument errors)
+CORRUPT_WEIGHTS_MESSAGES = ("PytorchStreamReader", "invalid load key", "unexpected EOF", "zip archive")
+
+def is_corrupt_weights_error(error):
+    """Check if a load error (or anything it was raised from) means the weights file can't be deserialized"""
+    while error is not None:
+        if isinstance(error, (pickle.UnpicklingError, EOFError, zipfile.BadZipFile)):
+            return True
+        if isinstance(error, RuntimeError) and any(message in str(error) for message in CORRUPT_WEIGHTS_MESSAGES):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
 
 class MultiModelDetector:
     def __init__(self):
         self.model = None
         self.device = self._get_device()
         self.current_mode = config.DETECTION_MODE
+        self.mode_return_model = None  # Detection model to restore when leaving segment mode
         self.is_loaded = False
         self.class_names = []
 
         # Multi-model support
         self.current_model_key = config.DEFAULT_MODEL_KEY
-        self.available_models = config.AVAILABLE_MODELS
-        self.loaded_models = {}  # Cache for loaded models
+        self.available_models = dict(config.AVAILABLE_MODELS)
+        if config.SHOW_QUANTIZED_MODELS:
+            self.available_models.update(get_quantized_variants())
+        self.backend = get_backend(config.INFERENCE_BACKEND)
+        self.loaded_models = WarmModelPool()  # LRU pool of warmed models
+        self.registry = ModelRegistry()  # Checksums and cached metadata per model
+        self._model_lock = threading.Lock()
+        self._prewarm_thread = None
+        self._prewarm_key = None
 
         # Performance tracking
         self.inference_times = []
         self.frame_count = 0
 
+        # Annotation
+        self.renderer = AnnotationRenderer()
+        self.last_render_time = 0.0
+
+        # Tiled high-resolution inference
+        self.tiling_enabled = config.TILED_INFERENCE
+        self.tiler = TiledInference()
+
+        # Zone-restricted inference
+        self.zones_enabled = config.ZONE_INFERENCE
+        self.zones = ZoneInference()
+
+        # Letterbox/normalize into reused buffers instead of per-call ultralytics allocations
+        self.preprocess_enabled = config.PREALLOCATED_PREPROCESS
+        self.preprocessor = FramePreprocessor(self.device)
+
+        self.cascade_enabled = False  # CASCADE_MODE turns it on once the active model is loaded
+        self.cascade_enabled = False
+        self.cascade = DetectionCascade()
+        self.gate_model = None
+
+        # Keyframe inference with optical-flow propagation in between
+        self.keyframe_enabled = config.KEYFRAME_MODE
+        self.propagator = KeyframePropagator()
+        self.last_frame_propagated = False
+
+        # Latency-budget input size controller
+        self.adaptive_imgsz = config.ADAPTIVE_IMGSZ
+        self.resolution = AdaptiveResolution()
+
+        # Per-video sidecar of raw detections (attached by the GUI for file sources)
+        self.detection_cache = None
+
+        # BoT-SORT tracking (divyadrishti_tracker.yaml)
+        self.tracking_enabled = config.USE_TRACKING
+        self.tracker = ObjectTracker(config.CUSTOM_TRACKER_CONFIG)
+        self.last_tracker_time = 0.0
+
         # Load the default model
-        self.load_model(self.current_model_key)
+        if self.load_model(self.current_model_key):
+            self._schedule_prewarm()
+            if config.CASCADE_MODE:
+                self.set_cascade(True)
 
     def _get_device(self):
         """Determine the best device for inference"""
@@ -55,38 +135,214 @@ class MultiModelDetector:
         return self.is_loaded and self.model is not None
 
     def switch_model(self, model_key):
-        """Switch to a different model"""
+        """Switch to a different model, reusing a warmed model from the pool when possible"""
         if model_key == self.current_model_key:
             print(f"✓ Already using {self.available_models[model_key]['name']}")
             return True
 
+        if model_key not in self.available_models:
+            print(f"✗ Unknown model key: {model_key}")
+            return False
+
         print(f"🔄 Switching from {self.get_current_model_name()} to {self.available_models[model_key]['name']}...")
 
-        # Clear current model completely
-        self.model = None
-        self.is_loaded = False
-        self.class_names = []
+        previous_key = self.current_model_key
+        start_time = time.perf_counter()
 
-        # Clear GPU cache if using CUDA
-        if self.device != "cpu":
-            import torch
-            torch.cuda.empty_cache()
+        # A pre-warm of this exact model may already be in flight
+        self._wait_for_prewarm(model_key)
 
-        # Load the new model fresh (no caching for model switching)
-        success = self._load_model_fresh(model_key)
+        entry = self.loaded_models.get(model_key)
+        if entry is not None:
+            self._activate_model(model_key, entry['model'], entry['class_names'])
+            switch_ms = (time.perf_counter() - start_time) * 1000
+            print(f"⚡ Switched from warm pool in {switch_ms:.1f}ms")
+            success = True
+        else:
+            # Cold load - the current model keeps serving detect() until the new one is ready
+            success = self._load_model_fresh(model_key)
 
         if success:
+            self.loaded_models.record_switch(previous_key, model_key)
             print(f"✓ Successfully switched to {self.available_models[model_key]['name']}")
             print(f"✓ Model type: {self.available_models[model_key]['type']}")
             print(f"✓ Classes loaded: {len(self.class_names)}")
             print(f"✓ First 5 classes: {self.class_names[:5] if len(self.class_names) > 5 else self.class_names}")
+            self._schedule_prewarm()
         else:
             print(f"✗ Failed to switch to {self.available_models[model_key]['name']}")
 
         return success
 
+    def _build_model(self, model_key, verbose=True, warmup=False):
+        """Load a model without making it the active one
+
+        Class names and input shape come from the registry when the weights are
+        unchanged since they were registered; only unregistered (or changed)
+        models get a warm-up inference, which is measured and recorded.
+        """
+        model_info = self.available_models[model_key]
+
+        start_time = time.perf_counter()
+        if "quantization" in model_info:
+            # INT8 variants are prebuilt ONNX artifacts, independent of the selected backend
+            model = YOLO(model_info["path"], task=get_model_task(model_info))
+        else:
+            # Backend handles export/caching and device placement
+            model = self.backend.load(model_key, model_info, self.device, self._registered_weights_hash(model_key))
+        load_time = time.perf_counter() - start_time
+
+        weights_path = self._weights_path(model_info, model)
+        cached = self.registry.cached_metadata(model_key, weights_path) if weights_path else None
+
+        if cached and not warmup:
+            self.registry.record_load(model_key, load_time)
+            class_names = cached['class_names']
+            if verbose:
+                print(f"✓ Loaded {model_info['name']} in {load_time:.2f}s "
+                      f"({len(class_names)} classes from registry, no warm-up)")
+            return model, class_names
+
+        # Warm-up initializes the predictor; timed so the registry can report it
+        start_time = time.perf_counter()
+        imgsz = (getattr(model, 'overrides', None) or {}).get('imgsz') or config.EXPORT_IMGSZ
+        model(np.zeros((imgsz, imgsz, 3), dtype=np.uint8), verbose=False)
+        warmup_time = time.perf_counter() - start_time
+
+        if cached:
+            return model, cached['class_names']
+
+        # Get class names from the model after initialization
+        if hasattr(model, 'names') and model.names:
+            class_names = list(model.names.values())
+            if verbose:
+                print(f"✓ Extracted {len(class_names)} classes from model.names")
+                print(f"✓ Model classes: {class_names}")
+        else:
+            # Fallback to predefined classes
+            class_names = model_info["classes"]
+            if verbose:
+                print(f"✓ Using predefined {len(class_names)} classes")
+                print(f"✓ Predefined classes: {class_names}")
+
+        if weights_path:
+            self.registry.register(model_key, weights_path, class_names, (1, 3, imgsz, imgsz),
+                                   get_model_task(model_info), load_time, warmup_time)
+            print(f"📝 Registered {model_info['name']} (load {load_time:.2f}s, warm-up {warmup_time:.2f}s)")
+
+        return model, class_names
+
+    def _registered_weights_hash(self, model_key):
+        """Registry SHA-256 of a model's weights if the file is unchanged since registration (O(1) stat)"""
+        entry = self.registry.get(model_key)
+        if entry is None:
+            return None
+        cached = self.registry.cached_metadata(model_key, entry['path'])
+        return cached['sha256'] if cached else None
+
+    def _weights_path(self, model_info, model=None):
+        """Get the local file a model was loaded from (official weights may have just been downloaded)"""
+        candidates = [model_info["path"]]
+        if model is not None:
+            candidates.append(getattr(model, 'ckpt_path', None))
+        for path in candidates:
+            if path and os.path.isfile(path):
+                return path
+        return None
+
+    def _activate_model(self, model_key, model, class_names):
+        """Make a loaded model the active one (atomic with respect to detect)"""
+        with self._model_lock:
+            self.model = model
+            self.class_names = list(class_names)
+            self.current_model_key = model_key
+            self.is_loaded = True
+            # Latency measured on the previous model no longer applies
+            self.resolution.reset()
+            if self.detection_cache is not None:
+                # Cached detections belong to the previous model
+                print("⚠️ Model changed, detaching detection cache")
+                self.detection_cache.close()
+                self.detection_cache = None
+
+    def _add_to_pool(self, model_key, model, class_names):
+        """Add a warmed model to the pool, releasing GPU memory of evicted models"""
+        evicted = self.loaded_models.put(model_key, model, class_names,
+                                         protect=(self.current_model_key,))
+        if evicted and self.device == "cuda":
+            torch.cuda.empty_cache()
+
+    def _schedule_prewarm(self):
+        """Pre-warm the next likely model in a background thread"""
+        if not config.MODEL_POOL_PREWARM:
+            return
+
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+
+        next_key = self.loaded_models.predict_next(self.current_model_key)
+        if next_key is None or next_key not in self.available_models or next_key in self.loaded_models:
+            return
+
+        # Never trigger a download from the background thread
+        if not os.path.exists(self.available_models[next_key]["path"]):
+            return
+
+        self._prewarm_key = next_key
+        self._prewarm_thread = threading.Thread(target=self._prewarm_model, args=(next_key,), daemon=True)
+        self._prewarm_thread.start()
+
+    def _prewarm_model(self, model_key):
+        """Load and warm a model into the pool (background thread)"""
+        model_name = self.available_models[model_key]['name']
+        try:
+            start_time = time.perf_counter()
+            model, class_names = self._build_model(model_key, verbose=False, warmup=True)
+            self._add_to_pool(model_key, model, class_names)
+            print(f"🔥 Pre-warmed {model_name} in {time.perf_counter() - start_time:.2f}s")
+        except Exception as e:
+            print(f"⚠️ Pre-warm failed for {model_name}: {e}")
+        finally:
+            self._prewarm_key = None
+
+    def _wait_for_prewarm(self, model_key):
+        """Wait for an in-flight pre-warm of the requested model instead of loading it twice"""
+        thread = self._prewarm_thread
+        if thread is not None and thread.is_alive() and self._prewarm_key == model_key:
+            print(f"⏳ Waiting for background pre-warm of {self.available_models[model_key]['name']}...")
+            thread.join()
+
+    def set_backend(self, backend_name):
+        """Switch inference backend and reload the current model on it"""
+        backend = get_backend(backend_name)
+        if backend.name == self.backend.name:
+            print(f"✓ Already using {backend.name} backend")
+            return True
+
+        previous_backend = self.backend
+        self.backend = backend
+        print(f"🔄 Switching inference backend to {backend.name}...")
+
+        # Pooled models belong to the old backend
+        self.loaded_models.clear()
+        if self._load_model_fresh(self.current_model_key):
+            return True
+
+        self.backend = previous_backend
+        self.loaded_models.clear()
+        self._load_model_fresh(self.current_model_key)
+        return False
+
+    def get_backend_info(self):
+        """Get active backend details, including export parity results"""
+        return self.backend.get_info(self.current_model_key)
+
+    def get_pool_stats(self):
+        """Get warm model pool statistics"""
+        return self.loaded_models.get_stats()
+
     def _load_model_fresh(self, model_key):
-        """Load a model fresh without using cache"""
+        """Load a model from disk, make it active and add it to the warm pool"""
         if model_key not in self.available_models:
             print(f"✗ Unknown model key: {model_key}")
             return False
@@ -97,43 +353,18 @@ class MultiModelDetector:
         try:
             print(f"🔄 Loading {model_info['name']} fresh from: {model_path}")
 
-            # Validate model file before loading
-            if not self._validate_model_file(model_path, model_info['name']):
+            # Validate model file against the registry before loading
+            if not self._validate_model_file(model_key):
                 print(f"🔄 Attempting to re-download {model_info['name']}...")
                 if not self._redownload_model(model_path, model_info['name']):
                     print(f"✗ Failed to re-download {model_info['name']}")
                     return False
+                self.registry.remove(model_key)
 
-            # Load new model (force fresh load - don't use any cache)
-            self.model = YOLO(model_path)
-
-            # Move model to device
-            if self.device != "cpu":
-                self.model.to(self.device)
-
-            # Update current model key FIRST
-            self.current_model_key = model_key
-
-            # Force model to initialize by running a dummy prediction
-            import numpy as np
-            dummy_img = np.zeros((640, 640, 3), dtype=np.uint8)
-            _ = self.model(dummy_img, verbose=False)
+            model, class_names = self._build_model(model_key)
+            self._activate_model(model_key, model, class_names)
+            self._add_to_pool(model_key, model, class_names)
 
-            # Get class names from the model after initialization
-            if hasattr(self.model, 'names') and self.model.names:
-                self.class_names = list(self.model.names.values())
-                print(f"✓ Extracted {len(self.class_names)} classes from model.names")
-                print(f"✓ Model classes: {self.class_names}")
-            else:
-                # Fallback to predefined classes
-                self.class_names = model_info["classes"]
-                print(f"✓ Using predefined {len(self.class_names)} classes")
-                print(f"✓ Predefined classes: {self.class_names}")
-
-            # DON'T cache the model - always load fresh for switching
-            # self.loaded_models[model_key] = self.model
-
-            self.is_loaded = True
             print(f"✓ {model_info['name']} loaded successfully on {self.device.upper()}")
 
             return True
@@ -141,9 +372,11 @@ class MultiModelDetector:
         except Exception as e:
             print(f"✗ Error loading {model_info['name']}: {e}")
 
-            # If it's a corrupted file error, try to fix it
-            if "PytorchStreamReader failed" in str(e) or "failed finding central directory" in str(e):
-                print(f"🔧 Detected corrupted model file. Attempting to fix...")
+            # Official weights that were never loaded successfully have no known hash yet;
+            # only a failure to deserialize them marks the download as damaged
+            if self.registry.get(model_key) is None and not os.path.isabs(model_path) and \
+                    is_corrupt_weights_error(e):
+                print(f"🔧 Unverified model file could not be deserialized. Attempting to fix...")
                 if self._fix_corrupted_model(model_path, model_info['name']):
                     print(f"🔄 Retrying model load after fixing corruption...")
                     # Retry once with a flag to prevent infinite recursion
@@ -151,54 +384,32 @@ class MultiModelDetector:
 
             import traceback
             traceback.print_exc()
-            self.is_loaded = False
+            # Any previously active model keeps serving detections
             return False
 
-    def _validate_model_file(self, model_path, model_name):
-        """Validate if model file exists and is not corrupted"""
-        import os
+    def _validate_model_file(self, model_key):
+        """Validate a model file by registry checksum (O(1) stat check when unchanged)"""
+        model_info = self.available_models[model_key]
+        model_path = model_info["path"]
+        status = self.registry.validate(model_key, model_path)
 
-        # For custom models (absolute paths), check if file exists
-        if os.path.isabs(model_path):
-            if not os.path.exists(model_path):
+        if status == "missing":
+            if os.path.isabs(model_path):
                 print(f"✗ Model file not found: {model_path}")
                 return False
-
-            # Check if file size is reasonable (not empty)
-            file_size = os.path.getsize(model_path)
-            if file_size < 1024:  # Less than 1KB is definitely corrupted
-                print(f"✗ Model file too small ({file_size} bytes): {model_path}")
-                return False
-
-            print(f"✓ Custom model file validated: {model_path} ({file_size:,} bytes)")
+            # Official weights are downloaded by YOLO
+            print(f"ℹ️ Model file will be downloaded: {model_path}")
             return True
 
-        # For YOLO models (relative paths), check if they exist in current directory
-        if os.path.exists(model_path):
-            file_size = os.path.getsize(model_path)
-            if file_size < 1024:  # Less than 1KB is definitely corrupted
-                print(f"✗ Model file too small ({file_size} bytes): {model_path}")
-                return False
-
-            # Try to read the file as a zip to check if it's corrupted
-            try:
-                import torch
-                # Just try to load the file structure without loading the model
-                with open(model_path, 'rb') as f:
-                    # Read first few bytes to check if it's a valid zip/torch file
-                    header = f.read(4)
-                    if len(header) < 4:
-                        print(f"✗ Model file header too short: {model_path}")
-                        return False
-
-                print(f"✓ Model file validated: {model_path} ({file_size:,} bytes)")
-                return True
-            except Exception as e:
-                print(f"✗ Model file validation failed: {e}")
-                return False
+        if status == "corrupted":
+            print(f"✗ Model file failed checksum validation: {model_path}")
+            return False
 
-        # File doesn't exist, will be downloaded by YOLO
-        print(f"ℹ️ Model file will be downloaded: {model_path}")
+        if status == "changed":
+            print(f"🔄 Model file changed since it was registered, re-registering: {model_path}")
+            self.registry.remove(model_key)
+        elif status == "unchanged":
+            print(f"✓ Model file validated: {model_path}")
         return True
 
     def _redownload_model(self, model_path, model_name):
@@ -240,40 +451,16 @@ class MultiModelDetector:
         try:
             print(f"🔄 Retry loading {model_info['name']} from: {model_path}")
 
-            # Load new model (force fresh load - don't use any cache)
-            self.model = YOLO(model_path)
-
-            # Move model to device
-            if self.device != "cpu":
-                self.model.to(self.device)
-
-            # Update current model key FIRST
-            self.current_model_key = model_key
-
-            # Force model to initialize by running a dummy prediction
-            import numpy as np
-            dummy_img = np.zeros((640, 640, 3), dtype=np.uint8)
-            _ = self.model(dummy_img, verbose=False)
+            model, class_names = self._build_model(model_key)
+            self._activate_model(model_key, model, class_names)
+            self._add_to_pool(model_key, model, class_names)
 
-            # Get class names from the model after initialization
-            if hasattr(self.model, 'names') and self.model.names:
-                self.class_names = list(self.model.names.values())
-                print(f"✓ Extracted {len(self.class_names)} classes from model.names")
-                print(f"✓ Model classes: {self.class_names}")
-            else:
-                # Fallback to predefined classes
-                self.class_names = model_info["classes"]
-                print(f"✓ Using predefined {len(self.class_names)} classes")
-                print(f"✓ Predefined classes: {self.class_names}")
-
-            self.is_loaded = True
             print(f"✓ {model_info['name']} loaded successfully on retry!")
 
             return True
 
         except Exception as e:
             print(f"✗ Retry failed for {model_info['name']}: {e}")
-            self.is_loaded = False
             return False
 
     def get_current_model_info(self):
@@ -299,124 +486,538 @@ class MultiModelDetector:
             models.append((key, display_name))
         return models
 
-    def detect(self, frame, confidence_threshold=None, enable_tracking=None):
-        """Detect objects in frame using standard YOLO detection"""
+    def refresh_quantized_models(self):
+        """Pick up INT8 variants built since startup (python quantization.py)"""
+        if config.SHOW_QUANTIZED_MODELS:
+            self.available_models.update(get_quantized_variants())
+        return self.get_model_list_for_gui()
+
+    def _snapshot_model(self):
+        """Get the active model and its class names as a consistent pair"""
+        # A concurrent switch can't mix models mid-frame
+        with self._model_lock:
+            return self.model, self.class_names
+
+    def detect(self, frame, confidence_threshold=None, enable_tracking=None, annotate=True,
+               frame_number=None):
+        """Detect (and optionally track) objects in frame
+
+        With annotate=False the input frame is returned untouched instead of an annotated copy.
+        frame_number (video files) lets an attached detection cache replay or record this frame.
+        """
         if not self.is_model_loaded():
-            return frame, []
+            return frame, Detections.empty()
 
         if confidence_threshold is None:
             confidence_threshold = config.CONFIDENCE_THRESHOLD
+        if enable_tracking is None:
+            enable_tracking = self.tracking_enabled
 
-        try:
-            # Standard YOLO detection without tracking
-            results = self.model(
-                frame,
-                conf=confidence_threshold,
-                iou=config.IOU_THRESHOLD,
-                max_det=config.MAX_DETECTIONS,
-                device=self.device,
-                verbose=False
-            )
-
-            # Process results
-            detections = []
-            annotated_frame = frame.copy()
-
-            if results and len(results) > 0:
-                result = results[0]
+        model, class_names = self._snapshot_model()
 
-                if result.boxes is not None and len(result.boxes) > 0:
-                    boxes = result.boxes.xyxy.cpu().numpy()
-                    confidences = result.boxes.conf.cpu().numpy()
-                    class_ids = result.boxes.cls.cpu().numpy().astype(int)
-
-                    for i, (box, conf, cls_id) in enumerate(zip(boxes, confidences, class_ids)):
-                        x1, y1, x2, y2 = box
-
-                        # Get class name
-                        class_name = self.class_names[cls_id] if cls_id < len(self.class_names) else f"class_{cls_id}"
-
-                        # Create detection info
-                        detection = {
-                            'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                            'confidence': float(conf),
-                            'class_id': int(cls_id),
-                            'class_name': class_name,
-                            'area': utils.calculate_box_area(x1, y1, x2, y2),
-                            'center': utils.calculate_box_center(x1, y1, x2, y2)
-                        }
-
-                        detections.append(detection)
+        try:
+            if self.keyframe_enabled and not self.propagator.needs_keyframe():
+                # Between keyframes boxes follow the optical flow (track IDs carry over)
+                detections = self.propagator.propagate(frame)
+                self.last_frame_propagated = True
+                self.last_tracker_time = 0.0
+                self.frame_count += 1
+                return self._render(frame, detections, annotate), detections
+            self.last_frame_propagated = False
+
+            # Tracking needs low-confidence boxes for its second association stage
+            inference_conf = min(confidence_threshold, self.tracker.track_low_thresh) if enable_tracking \
+                else confidence_threshold
+
+            start_time = time.perf_counter()
+            cache = self._active_cache(frame_number, inference_conf)
+            cached = cache.get(frame_number, inference_conf) if cache is not None else None
+            if cached is not None:
+                # Replayed from the sidecar: no forward pass at all
+                detections = cached
+            elif cache is not None:
+                # Record at the cache floor so later runs can lower the threshold for free
+                detections = self._infer(frame, cache.conf_floor, model, class_names)
+                cache.put(frame_number, detections)
+                detections = detections.filter_by_confidence(inference_conf)
+            elif self.tiling_enabled:
+                detections = self._infer_tiled(frame, inference_conf, model, class_names)
+            elif self.zones_enabled:
+                detections = self._infer_zones(frame, inference_conf, model, class_names)
+            elif self.cascade_enabled:
+                detections = self._infer_cascade(frame, inference_conf, model, class_names)
+            else:
+                detections = self._infer(frame, inference_conf, model, class_names)
+
+            detections = self._apply_zones(detections, frame.shape, inference_conf)
+            if cached is None:
+                self._record_inference_time(time.perf_counter() - start_time)
+                if self.adaptive_imgsz and not self.tiling_enabled:
+                    self.resolution.update(self.inference_times)
+
+            if enable_tracking:
+                start_time = time.perf_counter()
+                detections = self.tracker.update(detections, frame)
+                # Low-confidence boxes survive only when they continue a track
+                detections = detections.filter((detections.conf >= confidence_threshold) |
+                                               (detections.extras['track_id'] >= 0))
+                self.last_tracker_time = time.perf_counter() - start_time
+                PROFILER.record("track", self.last_tracker_time)
+            else:
+                self.last_tracker_time = 0.0
 
-                        # Draw bounding box and label
-                        annotated_frame = self._draw_detection(annotated_frame, detection)
+            if self.keyframe_enabled:
+                detections = self.propagator.set_keyframe(frame, detections)
 
             self.frame_count += 1
-            return annotated_frame, detections
+            return self._render(frame, detections, annotate), detections
 
         except Exception as e:
             print(f"✗ Detection error: {e}")
-            return frame, []
-
-
-
-    def _draw_detection(self, frame, detection):
-        """Draw detection on frame with cyberpunk styling"""
-        x1, y1, x2, y2 = detection['bbox']
-        confidence = detection['confidence']
-        class_name = detection['class_name']
+            return frame, Detections.empty()
+
+    def _apply_zones(self, detections, frame_shape, confidence_threshold):
+        """Keep boxes in enabled zones and weight them (no-op when zones are off)"""
+        if not self.zones_enabled:
+            return detections
+        # Zone weights scale confidences, so re-apply the threshold afterwards
+        detections = self.zones.apply(detections, frame_shape)
+        return detections.filter_by_confidence(confidence_threshold)
+
+    def _active_cache(self, frame_number, confidence_threshold):
+        """Get the detection cache if this frame can use it
+
+        Only plain full-frame detection is cached; tiling, zones, the cascade,
+        masks and adaptive input size all change the raw detections. A threshold
+        below the cache floor needs boxes the cache never stored.
+        """
+        with self._model_lock:
+            cache = self.detection_cache  # Swapped and closed under this lock by model switches
+        if cache is None or frame_number is None or confidence_threshold < cache.conf_floor:
+            return None
+        if self.tiling_enabled or self.zones_enabled or self.cascade_enabled or \
+                self.adaptive_imgsz or self.masks_enabled():
+            return None
+        return cache
+
+    def get_model_hash(self):
+        """Identify the active weights and backend (None if the weights file is unknown)"""
+        entry = self.registry.get(self.current_model_key)
+        weights_hash = entry['sha256'] if entry else None
+        if weights_hash is None:
+            model_info = self.available_models.get(self.current_model_key, {})
+            weights_path = self._weights_path(model_info, self.model) if model_info else None
+            if weights_path is None:
+                return None
+            weights_hash = utils.calculate_file_hash(weights_path)
+        return hashlib.sha256(f"{weights_hash}:{self.backend.name}".encode()).hexdigest()
+
+    def set_detection_cache(self, cache):
+        """Attach (or with None, detach and close) a per-video detection cache"""
+        with self._model_lock:
+            if self.detection_cache is not None and self.detection_cache is not cache:
+                self.detection_cache.close()
+            self.detection_cache = cache
+
+    def get_detection_cache_stats(self):
+        """Get detection cache statistics (None when no cache is attached)"""
+        cache = self.detection_cache
+        return cache.get_stats() if cache is not None else None
+
+    def annotate(self, frame, detections):
+        """Draw existing detections onto a frame (e.g. reused results on a skipped frame)"""
+        return self._render(frame, detections)
+
+    def _render(self, frame, detections, annotate=True, reuse_buffer=True):
+        """Draw detections, timing the annotation separately from inference"""
+        if not annotate:
+            self.last_render_time = 0.0
+            return frame
+        start_time = time.perf_counter()
+        annotated_frame = self.renderer.render(frame, detections, reuse_buffer)
+        self.last_render_time = time.perf_counter() - start_time
+        PROFILER.record("annotate", self.last_render_time)
+        return annotated_frame
+
+    def _profile_result(self, result, preprocess=True):
+        """Split a forward pass into stages using ultralytics' per-result speed (ms)"""
+        speed = getattr(result, 'speed', None)
+        if not PROFILER.enabled or not speed:
+            return
+        if preprocess:
+            PROFILER.record("preprocess", (speed.get('preprocess') or 0) / 1000)
+        PROFILER.record("forward", (speed.get('inference') or 0) / 1000)
+        PROFILER.record("postprocess", (speed.get('postprocess') or 0) / 1000)
+
+    def _infer(self, frame, confidence_threshold, model, class_names):
+        """Run a single full-frame forward pass"""
+        if self.preprocess_enabled:
+            return self._infer_preprocessed(frame, confidence_threshold, model, class_names)
+
+        results = model(
+            frame,
+            conf=confidence_threshold,
+            iou=config.IOU_THRESHOLD,
+            max_det=config.MAX_DETECTIONS,
+            device=self.device,
+            verbose=False,
+            **self._imgsz_args()
+        )
+
+        if results and len(results) > 0:
+            self._profile_result(results[0])
+            return Detections.from_result(results[0], class_names, with_masks=self.masks_enabled())
+        return Detections.empty(class_names)
+
+    def _infer_preprocessed(self, frame, confidence_threshold, model, class_names):
+        """Forward pass on a ready tensor from the preallocated preprocessing buffers"""
+        dynamic = self.supports_dynamic_imgsz()
+        imgsz = self._imgsz_args().get('imgsz') or self._model_input_size(model, dynamic)
+        with PROFILER.span("preprocess"):
+            tensor, scale, pad = self.preprocessor.prepare(frame, imgsz, rect=dynamic)
+
+        results = model(
+            tensor,
+            conf=confidence_threshold,
+            iou=config.IOU_THRESHOLD,
+            max_det=config.MAX_DETECTIONS,
+            device=self.device,
+            verbose=False
+        )
+
+        if results and len(results) > 0:
+            # Letterboxing already happened above; ultralytics only timed a no-op
+            self._profile_result(results[0], preprocess=False)
+            detections = Detections.from_result(results[0], class_names, with_masks=self.masks_enabled())
+            return self.preprocessor.restore(detections, scale, pad, frame.shape)
+        return Detections.empty(class_names)
+
+    def _model_input_size(self, model, dynamic=True):
+        """Get the input size a model expects (fixed for static-shape exports)"""
+        if not dynamic:
+            return self.backend.imgsz
+        return (getattr(model, 'overrides', None) or {}).get('imgsz') or config.EXPORT_IMGSZ
+
+    def get_preprocess_stats(self):
+        """Get preprocessing buffer and allocation statistics"""
+        stats = self.preprocessor.get_stats()
+        stats['enabled'] = self.preprocess_enabled
+        return stats
+
+    def _imgsz_args(self):
+        """Get the imgsz argument for a forward pass ({} keeps the model's own size)"""
+        if self.adaptive_imgsz and self.supports_dynamic_imgsz():
+            return {'imgsz': self.resolution.imgsz}
+        return {}
+
+    def supports_dynamic_imgsz(self):
+        """Check if the active model accepts a different input size per call"""
+        model_info = self.available_models.get(self.current_model_key, {})
+        if "quantization" in model_info:
+            return False
+        if self.backend.name == "pytorch":
+            return True
+        # What the loaded artifact was exported with, not what config says now
+        return bool(self.backend.get_info(self.current_model_key).get('dynamic', config.EXPORT_DYNAMIC))
+
+    def set_adaptive_imgsz(self, enabled, budget_ms=None):
+        """Enable or disable the latency-budget input size controller"""
+        self.adaptive_imgsz = bool(enabled)
+        if budget_ms is not None:
+            self.resolution.set_budget(budget_ms)
+        self.resolution.reset()
+        if self.adaptive_imgsz and not self.supports_dynamic_imgsz():
+            print(f"⚠️ {self.backend.name.upper()} model has a static input shape, imgsz stays fixed")
+        print(f"✓ Adaptive resolution {'enabled' if self.adaptive_imgsz else 'disabled'} "
+              f"(budget {self.resolution.budget * 1000:.0f}ms)")
+
+    def get_resolution_stats(self):
+        """Get adaptive resolution statistics"""
+        stats = self.resolution.get_stats()
+        stats['enabled'] = self.adaptive_imgsz and self.supports_dynamic_imgsz()
+        return stats
+
+    def _record_inference_time(self, inference_time):
+        """Keep recent inference times (bounded)"""
+        self.inference_times.append(inference_time)
+        if len(self.inference_times) > 1000:
+            del self.inference_times[:-100]
+
+    def detect_batch(self, frames, confidence_threshold=None, max_batch_size=None, annotate=True):
+        """Detect objects in several frames with one forward pass per batch
+
+        Accepts a list of frames or a stacked (N, H, W, 3) array and returns a
+        list of (annotated_frame, detections) tuples in the same order.
+
+        Shares detect()'s full-frame path: the same thresholds, adaptive imgsz,
+        zone filtering/weighting, stage profiling and inference_times (each
+        frame records its share of the batch time). Zones are applied to the
+        full-frame boxes rather than by cropping. Per-frame features that need
+        one forward pass per frame are not used: tiling, the cascade gate, the
+        preallocated letterbox (ultralytics letterboxes the batch itself),
+        keyframe propagation, the detection cache and tracking, which the
+        caller runs per source (see FeedScheduler).
+        """
+        frames = list(frames)
+        if not frames:
+            return []
 
-        # Grey color scheme as requested
-        color = (128, 128, 128)  # Grey for all detections
+        if not self.is_model_loaded():
+            return [(frame, Detections.empty()) for frame in frames]
 
-        # Draw bounding box with cyberpunk style
-        thickness = 2
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+        if confidence_threshold is None:
+            confidence_threshold = config.CONFIDENCE_THRESHOLD
+        if max_batch_size is None:
+            max_batch_size = config.BATCH_MAX_SIZE
+        max_batch_size = max(1, int(max_batch_size))
 
-        # Draw corner accents
-        corner_length = 20
-        corner_thickness = 3
+        model, class_names = self._snapshot_model()
 
-        # Top-left corner
-        cv2.line(frame, (x1, y1), (x1 + corner_length, y1), color, corner_thickness)
-        cv2.line(frame, (x1, y1), (x1, y1 + corner_length), color, corner_thickness)
+        try:
+            outputs = []
+            for start in range(0, len(frames), max_batch_size):
+                chunk = frames[start:start + max_batch_size]
+                start_time = time.perf_counter()
+                results = model(
+                    chunk,
+                    conf=confidence_threshold,
+                    iou=config.IOU_THRESHOLD,
+                    max_det=config.MAX_DETECTIONS,
+                    device=self.device,
+                    verbose=False,
+                    **self._imgsz_args()
+                )
+
+                chunk_outputs = []
+                for frame, result in zip(chunk, results):
+                    self._profile_result(result)
+                    detections = Detections.from_result(result, class_names, with_masks=self.masks_enabled())
+                    chunk_outputs.append((frame, self._apply_zones(detections, frame.shape, confidence_threshold)))
+
+                per_frame_time = (time.perf_counter() - start_time) / len(chunk)
+                for _ in chunk:
+                    self._record_inference_time(per_frame_time)
+                if self.adaptive_imgsz:
+                    self.resolution.update(self.inference_times)
+
+                for frame, detections in chunk_outputs:
+                    # Batch outputs are alive together, so they can't share the renderer's buffer ring
+                    outputs.append((self._render(frame, detections, annotate, reuse_buffer=False), detections))
+
+            self.frame_count += len(frames)
+            return outputs
 
-        # Top-right corner
-        cv2.line(frame, (x2, y1), (x2 - corner_length, y1), color, corner_thickness)
-        cv2.line(frame, (x2, y1), (x2, y1 + corner_length), color, corner_thickness)
+        except Exception as e:
+            print(f"✗ Batch detection error: {e}")
+            return [(frame, Detections.empty()) for frame in frames]
 
-        # Bottom-left corner
-        cv2.line(frame, (x1, y2), (x1 + corner_length, y2), color, corner_thickness)
-        cv2.line(frame, (x1, y2), (x1, y2 - corner_length), color, corner_thickness)
+    def detect_tiled(self, frame, confidence_threshold=None, annotate=True):
+        """Detect objects on overlapping tiles in one batch and merge with cross-tile NMS"""
+        if not self.is_model_loaded():
+            return frame, Detections.empty()
 
-        # Bottom-right corner
-        cv2.line(frame, (x2, y2), (x2 - corner_length, y2), color, corner_thickness)
-        cv2.line(frame, (x2, y2), (x2, y2 - corner_length), color, corner_thickness)
+        if confidence_threshold is None:
+            confidence_threshold = config.CONFIDENCE_THRESHOLD
 
-        # Label without track ID
-        label = f"{class_name} {confidence:.2%}"
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
-        font_thickness = 2
+        model, class_names = self._snapshot_model()
 
-        (label_width, label_height), baseline = cv2.getTextSize(label, font, font_scale, font_thickness)
+        try:
+            detections = self._infer_tiled(frame, confidence_threshold, model, class_names)
+            self.frame_count += 1
+            annotated_frame = self.renderer.render(frame, detections) if annotate else frame
+            return annotated_frame, detections
 
-        # Draw label background
-        cv2.rectangle(frame,
-                     (x1, y1 - label_height - 10),
-                     (x1 + label_width + 10, y1),
-                     (0, 0, 0), -1)
+        except Exception as e:
+            print(f"✗ Tiled detection error: {e}")
+            return frame, Detections.empty()
+
+    def _infer_tiled(self, frame, confidence_threshold, model, class_names):
+        """Run all selected tiles as one batch and merge into frame coordinates"""
+        height, width = frame.shape[:2]
+        run_tiles = self.tiler.select_tiles(frame, self.tiler.plan_tiles(width, height))
+
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in run_tiles]
+        if self.tiler.include_full_frame:
+            crops.append(frame)
+
+        start_time = time.perf_counter()
+        results = []
+        if crops:
+            results = model(
+                crops,
+                conf=confidence_threshold,
+                iou=config.IOU_THRESHOLD,
+                max_det=config.MAX_DETECTIONS,
+                imgsz=self.tiler.tile_size,
+                device=self.device,
+                verbose=False
+            )
+        batch_time = time.perf_counter() - start_time
+
+        tile_detections = [Detections.from_result(result, class_names) for result in results]
+        self.tiler.record(run_tiles, tile_detections, results, batch_time)
+        return self.tiler.merge(run_tiles, tile_detections, class_names)
+
+    def _infer_zones(self, frame, confidence_threshold, model, class_names):
+        """Run inference only on crops covering the enabled detection zones (through the cascade if it is on)"""
+        crops = self.zones.get_crops(frame)
+        if not crops:
+            return Detections.empty(class_names)
+
+        if self.cascade_enabled and self.gate_model is not None:
+            # Each zone crop is screened by the gate on its own (cascade stats count crops, not frames)
+            crop_detections = [self._infer_cascade(frame[y1:y2, x1:x2], confidence_threshold, model, class_names)
+                               for x1, y1, x2, y2 in crops]
+            return self.zones.remap(crops, crop_detections, class_names)
+
+        results = model(
+            [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in crops],
+            conf=confidence_threshold,
+            iou=config.IOU_THRESHOLD,
+            max_det=config.MAX_DETECTIONS,
+            device=self.device,
+            verbose=False,
+            **self._imgsz_args()
+        )
+        crop_detections = [Detections.from_result(result, class_names, with_masks=self.masks_enabled())
+                           for result in results]
+        return self.zones.remap(crops, crop_detections, class_names)
+
+    def _infer_cascade(self, frame, confidence_threshold, model, class_names):
+        """Screen the frame with the gate model; run the active model only where it finds candidates"""
+        gate_model = self.gate_model
+        if gate_model is None:
+            return self._infer(frame, confidence_threshold, model, class_names)
+
+        start_time = time.perf_counter()
+        gate_results = gate_model(
+            frame,
+            conf=self.cascade.gate_threshold,
+            iou=config.IOU_THRESHOLD,
+            max_det=config.MAX_DETECTIONS,
+            device=self.device,
+            verbose=False
+        )
+        gate_detections = Detections.from_result(gate_results[0]) if gate_results else Detections.empty()
+        gate_time = time.perf_counter() - start_time
+
+        plan = self.cascade.plan_escalation(gate_detections, frame.shape)
+        if plan is None:
+            self.cascade.record(gate_time, 0.0)
+            return Detections.empty(class_names)
+
+        start_time = time.perf_counter()
+        if plan == "frame":
+            detections = self._infer(frame, confidence_threshold, model, class_names)
+        else:
+            results = model(
+                [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in plan],
+                conf=confidence_threshold,
+                iou=config.IOU_THRESHOLD,
+                max_det=config.MAX_DETECTIONS,
+                device=self.device,
+                verbose=False
+            )
+            # Crops never overlap, so no cross-crop suppression is needed
+            detections = Detections.concatenate(
+                [Detections.from_result(result, class_names, with_masks=self.masks_enabled()).offset(x1, y1)
+                 for result, (x1, y1, _, _) in zip(results, plan)], class_names)
+        self.cascade.record(gate_time, time.perf_counter() - start_time)
+        return detections
+
+    def set_cascade(self, enabled, gate_model_key=None):
+        """Enable or disable cascade mode, loading the gate model on first use"""
+        if gate_model_key is not None and gate_model_key != self.cascade.gate_model_key:
+            self.cascade.gate_model_key = gate_model_key
+            self.gate_model = None
+
+        if enabled and self.gate_model is None:
+            gate_key = self.cascade.gate_model_key
+            if gate_key not in self.available_models:
+                print(f"✗ Unknown cascade gate model: {gate_key}")
+                return False
+            if gate_key == self.current_model_key:
+                print(f"⚠️ Cascade gate and active model are both {gate_key} - escalation adds no accuracy")
 
-        # Draw label border
-        cv2.rectangle(frame,
-                     (x1, y1 - label_height - 10),
-                     (x1 + label_width + 10, y1),
-                     color, 1)
+            entry = self.loaded_models.get(gate_key)
+            try:
+                if entry is not None:
+                    self.gate_model = entry['model']
+                else:
+                    self.gate_model, class_names = self._build_model(gate_key, verbose=False, warmup=True)
+                    self._add_to_pool(gate_key, self.gate_model, class_names)
+            except Exception as e:
+                print(f"✗ Could not load cascade gate {gate_key}: {e}")
+                return False
 
-        # Draw label text
-        cv2.putText(frame, label, (x1 + 5, y1 - 5), font, font_scale, color, font_thickness)
+        self.cascade_enabled = bool(enabled)
+        self.cascade.reset_stats()
+        print(f"✓ Cascade {'enabled' if self.cascade_enabled else 'disabled'} "
+              f"({self.cascade.gate_model_key} → {self.current_model_key}, "
+              f"gate threshold {self.cascade.gate_threshold:.2f})")
+        return True
 
-        return frame
+    def get_cascade_stats(self):
+        """Get cascade escalation rate and per-stage cost"""
+        stats = self.cascade.get_stats()
+        stats['enabled'] = self.cascade_enabled
+        stats['final_model'] = self.current_model_key
+        return stats
+
+    def set_tiling(self, enabled, tile_size=None, overlap=None):
+        """Enable or disable tiled inference"""
+        self.tiling_enabled = bool(enabled)
+        if tile_size is not None or overlap is not None:
+            self.tiler.configure(tile_size, overlap)
+        print(f"✓ Tiled inference {'enabled' if self.tiling_enabled else 'disabled'} "
+              f"(tile {self.tiler.tile_size}px, overlap {self.tiler.overlap:.0%})")
+
+    def set_zones(self, enabled, zones=None):
+        """Enable or disable zone-restricted inference, optionally with new zone definitions"""
+        self.zones_enabled = bool(enabled)
+        if zones is not None:
+            self.zones.configure(zones)
+        print(f"✓ Zone inference {'enabled' if self.zones_enabled else 'disabled'} "
+              f"(zones: {', '.join(self.zones.zone_names) or 'none'})")
+
+    def get_zone_stats(self):
+        """Get zone statistics for the last frame"""
+        return self.zones.get_stats()
+
+    def set_keyframe_mode(self, enabled, interval=None):
+        """Enable or disable keyframe inference with optical-flow propagation"""
+        self.keyframe_enabled = bool(enabled)
+        if interval is not None:
+            self.propagator.base_interval = int(interval)
+        self.propagator.reset()
+        print(f"✓ Keyframe mode {'enabled' if self.keyframe_enabled else 'disabled'} "
+              f"(K={self.propagator.base_interval}, adaptive "
+              f"{self.propagator.min_interval}-{self.propagator.max_interval})")
+
+    def get_keyframe_stats(self):
+        """Get keyframe interval and propagation statistics"""
+        stats = self.propagator.get_stats()
+        stats['enabled'] = self.keyframe_enabled
+        return stats
+
+    def set_tracking(self, enabled):
+        """Enable or disable tracking, starting from a clean track set"""
+        self.tracking_enabled = bool(enabled)
+        self.tracker.reset()
+        print(f"✓ Tracking {'enabled' if self.tracking_enabled else 'disabled'}")
+
+    def reset_tracker(self):
+        """Forget all tracks (e.g. when the video source changes)"""
+        self.tracker.reset()
+        self.propagator.reset()
+
+    def get_tracker_stats(self):
+        """Get tracker statistics (cost is reported separately from detection)"""
+        return self.tracker.get_stats()
+
+    def get_tile_stats(self):
+        """Get tiling statistics (tiles run/skipped, batch and per-tile timing)"""
+        return self.tiler.get_stats()
 
     def get_performance_stats(self):
         """Get performance statistics"""
@@ -432,6 +1033,7 @@ class MultiModelDetector:
 
         return {
             'avg_inference_time': avg_time * 1000,  # Convert to ms
+            'avg_tracker_time': self.tracker.get_stats()['avg_tracker_time'],  # ms
             'fps': fps,
             'total_frames': self.frame_count
         }
@@ -441,13 +1043,36 @@ class MultiModelDetector:
         self.inference_times.clear()
         self.frame_count = 0
 
+    def masks_enabled(self):
+        """Check if instance masks should be extracted from results"""
+        return self.current_mode == "segment"
+
+    def is_segmentation_model(self, model_key=None):
+        """Check if a model produces instance masks"""
+        model_info = self.available_models.get(model_key or self.current_model_key, {})
+        return model_info.get("type") == "segmentation"
+
     def switch_mode(self, mode):
-        """Switch between detection and segmentation modes"""
+        """Switch between detection and segmentation modes
+
+        Segment mode needs a segmentation model; if a detection model is active,
+        SEGMENTATION_MODEL is loaded and the detection model is restored on the
+        way back to detect mode.
+        """
         if mode not in ["detect", "segment"]:
             return False
 
         try:
-            # For hiking trail model, we'll use the same model but different inference
+            if mode == "segment" and not self.is_segmentation_model():
+                previous_key = self.current_model_key
+                if not self.switch_model(config.SEGMENTATION_MODEL):
+                    return False
+                self.mode_return_model = previous_key
+            elif mode == "detect" and self.mode_return_model:
+                if self.is_segmentation_model() and not self.switch_model(self.mode_return_model):
+                    return False
+                self.mode_return_model = None
+
             self.current_mode = mode
             print(f"✓ Switched to {mode} mode")
             return True
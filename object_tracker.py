@@ -0,0 +1,292 @@
+"""
+DivyaDrishti Object Tracker
+BoT-SORT style multi-object tracking driven by divyadrishti_tracker.yaml
+
+Track state lives in parallel NumPy arrays (ids, Kalman mean/covariance,
+class, score, last seen frame, appearance features) instead of one Python
+object per track, so prediction and association are vectorized.
+"""
+
+import time
+from collections import deque
+from pathlib import Path
+import cv2
+import numpy as np
+import yaml
+from scipy.optimize import linear_sum_assignment
+import config
+import utils
+
+FEATURE_BINS = (16, 8)  # Hue x saturation histogram used as the appearance embedding
+FEATURE_DIM = FEATURE_BINS[0] * FEATURE_BINS[1]
+
+def load_tracker_config(config_path=None):
+    """Load tracker settings from the custom tracker YAML"""
+    config_path = Path(config_path or config.CUSTOM_TRACKER_CONFIG)
+    if not config_path.is_absolute():
+        config_path = config.BASE_DIR / config_path
+
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        print(f"⚠️ Could not load tracker config {config_path}: {e} - using defaults")
+        return {}
+
+class ObjectTracker:
+    def __init__(self, config_path=None):
+        settings = load_tracker_config(config_path)
+
+        self.track_high_thresh = settings.get('track_high_thresh', 0.5)
+        self.track_low_thresh = settings.get('track_low_thresh', 0.1)
+        self.new_track_thresh = settings.get('new_track_thresh', 0.6)
+        self.match_thresh = settings.get('match_thresh', 0.8)
+        self.min_box_area = settings.get('min_box_area', 10)
+        self.max_lost = int(settings.get('frame_rate', 30) / 30.0 * settings.get('track_buffer', 30))
+
+        self.with_reid = settings.get('with_reid', False)
+        self.proximity_thresh = settings.get('proximity_thresh', 0.5)
+        self.appearance_thresh = settings.get('appearance_thresh', 0.25)
+        self.ema_alpha = settings.get('ema_alpha', 0.9)
+
+        # YAML weights scale the standard BoT-SORT Kalman noise
+        self.std_position = settings.get('std_weight_position', 1.0) / 20
+        self.std_velocity = settings.get('std_weight_velocity', 1.0) / 160
+
+        self._motion = np.eye(8)
+        self._motion[:4, 4:] = np.eye(4)
+
+        # ReID CPU budget
+        self.reid_budget_ms = config.TRACKER_REID_BUDGET_MS
+        self.reid_cooldown = config.TRACKER_REID_COOLDOWN_FRAMES
+
+        self.tracker_times = deque(maxlen=100)
+        self.reid_times = deque(maxlen=100)
+
+        self.reset()
+
+    def reset(self):
+        """Drop all tracks"""
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros((0, 8))
+        self.cov = np.zeros((0, 8, 8))
+        self.cls = np.zeros(0, dtype=np.int32)
+        self.score = np.zeros(0, dtype=np.float32)
+        self.last_seen = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int32)
+        self.features = np.zeros((0, FEATURE_DIM), dtype=np.float32)
+
+        self.frame_index = 0
+        self.next_id = 1
+        self.reid_suspended_until = 0
+        self.reid_skipped_frames = 0
+
+    def update(self, detections, frame=None):
+        """Associate detections with tracks and attach a 'track_id' array (-1 = untracked)"""
+        start_time = time.perf_counter()
+        self.frame_index += 1
+        self._predict()
+
+        track_ids = np.full(len(detections), -1, dtype=np.int64)
+
+        features = None
+        if len(detections) > 0 and frame is not None and self._reid_active():
+            reid_start = time.perf_counter()
+            features = self._extract_features(frame, detections.xyxy)
+            reid_ms = (time.perf_counter() - reid_start) * 1000
+            self.reid_times.append(reid_ms)
+            if reid_ms > self.reid_budget_ms:
+                self.reid_suspended_until = self.frame_index + self.reid_cooldown
+
+        high = np.flatnonzero(detections.conf >= self.track_high_thresh)
+        low = np.flatnonzero((detections.conf >= self.track_low_thresh) &
+                             (detections.conf < self.track_high_thresh))
+        track_boxes = self._track_boxes()
+        all_tracks = np.arange(len(self.ids))
+
+        # First association: all tracks against high-confidence detections
+        cost = self._association_cost(track_boxes, all_tracks, detections, high, features)
+        tracks_1, dets_1 = self._assign(cost, self.match_thresh)
+        matched_tracks = all_tracks[tracks_1]
+        matched_dets = high[dets_1]
+
+        # Second association: tracks seen last frame against low-confidence detections (IoU only)
+        remaining = np.setdiff1d(all_tracks, matched_tracks)
+        recent = remaining[self.last_seen[remaining] == self.frame_index - 1]
+        cost = self._association_cost(track_boxes, recent, detections, low, None)
+        tracks_2, dets_2 = self._assign(cost, 0.5)
+
+        matched_tracks = np.concatenate([matched_tracks, recent[tracks_2]])
+        matched_dets = np.concatenate([matched_dets, low[dets_2]])
+
+        if len(matched_tracks) > 0:
+            self._update_tracks(matched_tracks, detections, matched_dets, features)
+            track_ids[matched_dets] = self.ids[matched_tracks]
+
+        # Unmatched confident detections start new tracks
+        unmatched = np.setdiff1d(high, matched_dets)
+        unmatched = unmatched[(detections.conf[unmatched] >= self.new_track_thresh) &
+                              (detections.area[unmatched] >= self.min_box_area)]
+        if len(unmatched) > 0:
+            track_ids[unmatched] = self._start_tracks(detections, unmatched, features)
+
+        self._prune()
+
+        self.tracker_times.append((time.perf_counter() - start_time) * 1000)
+        return detections.with_extra('track_id', track_ids)
+
+    def _reid_active(self):
+        """Check if appearance features should be extracted this frame"""
+        if not self.with_reid:
+            return False
+        if self.frame_index < self.reid_suspended_until:
+            self.reid_skipped_frames += 1
+            return False
+        return True
+
+    def _extract_features(self, frame, boxes):
+        """Compute normalized hue/saturation histograms of each box as appearance embeddings"""
+        height, width = frame.shape[:2]
+        clipped = np.clip(boxes, 0, [width, height, width, height]).astype(np.int32)
+        features = np.zeros((len(boxes), FEATURE_DIM), dtype=np.float32)
+
+        for i, (x1, y1, x2, y2) in enumerate(clipped):
+            if x2 - x1 < 2 or y2 - y1 < 2:
+                continue
+            crop = cv2.resize(frame[y1:y2, x1:x2], (16, 32), interpolation=cv2.INTER_AREA)
+            hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+            features[i] = cv2.calcHist([hsv], [0, 1], None, list(FEATURE_BINS), [0, 180, 0, 256]).ravel()
+
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return features / np.maximum(norms, 1e-6)
+
+    def _association_cost(self, track_boxes, track_index, detections, det_index, features):
+        """IoU distance, fused with appearance distance when features are available"""
+        if len(track_index) == 0 or len(det_index) == 0:
+            return np.zeros((len(track_index), len(det_index)))
+
+        iou_dist = 1.0 - utils.calculate_box_iou_matrix(track_boxes[track_index], detections.xyxy[det_index])
+
+        # Never associate across classes
+        class_mismatch = self.cls[track_index][:, None] != detections.cls[det_index][None, :]
+        iou_dist[class_mismatch] = 1.0
+
+        if features is None:
+            return iou_dist
+
+        track_features = self.features[track_index]
+        emb_dist = 1.0 - np.clip(track_features @ features[det_index].T, 0, 1)
+        emb_dist[np.linalg.norm(track_features, axis=1) < 1e-6] = 1.0
+        emb_dist[(emb_dist > self.appearance_thresh) | (iou_dist > self.proximity_thresh)] = 1.0
+        return np.minimum(iou_dist, emb_dist)
+
+    def _assign(self, cost, threshold):
+        """Linear assignment keeping only pairs with cost within threshold"""
+        if cost.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        rows, cols = linear_sum_assignment(cost)
+        keep = cost[rows, cols] <= threshold
+        return rows[keep], cols[keep]
+
+    def _track_boxes(self):
+        """Predicted track boxes as xyxy"""
+        center, size = self.mean[:, :2], self.mean[:, 2:4]
+        return np.concatenate([center - size / 2, center + size / 2], axis=1)
+
+    def _noise(self, sizes, weight):
+        """Per-track diagonal noise scaled by box width/height"""
+        std = weight * np.concatenate([sizes, sizes], axis=1)
+        return np.einsum('ki,ij->kij', std ** 2, np.eye(4))
+
+    def _predict(self):
+        """Kalman predict for all tracks at once (constant velocity)"""
+        if len(self.ids) == 0:
+            return
+
+        sizes = self.mean[:, 2:4]
+        process_noise = np.zeros_like(self.cov)
+        process_noise[:, :4, :4] = self._noise(sizes, self.std_position)
+        process_noise[:, 4:, 4:] = self._noise(sizes, self.std_velocity)
+
+        self.mean = self.mean @ self._motion.T
+        self.cov = self._motion @ self.cov @ self._motion.T + process_noise
+
+    def _update_tracks(self, track_index, detections, det_index, features):
+        """Kalman update of matched tracks with their detections"""
+        boxes = detections.xyxy[det_index].astype(np.float64)
+        measurement = np.concatenate([(boxes[:, :2] + boxes[:, 2:]) / 2, boxes[:, 2:] - boxes[:, :2]], axis=1)
+
+        mean = self.mean[track_index]
+        cov = self.cov[track_index]
+
+        innovation_cov = cov[:, :4, :4] + self._noise(mean[:, 2:4], self.std_position)
+        gain = cov[:, :, :4] @ np.linalg.inv(innovation_cov)
+        self.mean[track_index] = mean + np.einsum('kij,kj->ki', gain, measurement - mean[:, :4])
+        self.cov[track_index] = cov - gain @ innovation_cov @ np.transpose(gain, (0, 2, 1))
+
+        self.score[track_index] = detections.conf[det_index]
+        self.last_seen[track_index] = self.frame_index
+        self.hits[track_index] += 1
+
+        if features is not None:
+            blended = self.ema_alpha * self.features[track_index] + (1 - self.ema_alpha) * features[det_index]
+            # Tracks without an embedding yet take the new one directly
+            empty = np.linalg.norm(self.features[track_index], axis=1) < 1e-6
+            blended[empty] = features[det_index][empty]
+            self.features[track_index] = blended / np.maximum(np.linalg.norm(blended, axis=1, keepdims=True), 1e-6)
+
+    def _start_tracks(self, detections, det_index, features):
+        """Create tracks for unmatched detections, returns their new ids"""
+        count = len(det_index)
+        boxes = detections.xyxy[det_index].astype(np.float64)
+        sizes = boxes[:, 2:] - boxes[:, :2]
+
+        mean = np.zeros((count, 8))
+        mean[:, :2] = (boxes[:, :2] + boxes[:, 2:]) / 2
+        mean[:, 2:4] = sizes
+
+        cov = np.zeros((count, 8, 8))
+        cov[:, :4, :4] = self._noise(sizes, 2 * self.std_position)
+        cov[:, 4:, 4:] = self._noise(sizes, 10 * self.std_velocity)
+
+        new_ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self.next_id += count
+
+        self.ids = np.concatenate([self.ids, new_ids])
+        self.mean = np.concatenate([self.mean, mean])
+        self.cov = np.concatenate([self.cov, cov])
+        self.cls = np.concatenate([self.cls, detections.cls[det_index]])
+        self.score = np.concatenate([self.score, detections.conf[det_index]])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, self.frame_index, dtype=np.int64)])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int32)])
+        new_features = features[det_index] if features is not None else np.zeros((count, FEATURE_DIM), dtype=np.float32)
+        self.features = np.concatenate([self.features, new_features])
+        return new_ids
+
+    def _prune(self):
+        """Drop tracks lost for longer than the track buffer"""
+        keep = self.frame_index - self.last_seen <= self.max_lost
+        if keep.all():
+            return
+
+        self.ids = self.ids[keep]
+        self.mean = self.mean[keep]
+        self.cov = self.cov[keep]
+        self.cls = self.cls[keep]
+        self.score = self.score[keep]
+        self.last_seen = self.last_seen[keep]
+        self.hits = self.hits[keep]
+        self.features = self.features[keep]
+
+    def get_stats(self):
+        """Get tracker statistics"""
+        return {
+            'active_tracks': int((self.last_seen == self.frame_index).sum()),
+            'total_tracks': len(self.ids),
+            'avg_tracker_time': sum(self.tracker_times) / len(self.tracker_times) if self.tracker_times else 0,
+            'avg_reid_time': sum(self.reid_times) / len(self.reid_times) if self.reid_times else 0,
+            'reid_enabled': self.with_reid,
+            'reid_active': self.with_reid and self.frame_index >= self.reid_suspended_until,
+            'reid_skipped_frames': self.reid_skipped_frames
+        }
@@ -9,11 +9,21 @@ import threading
 from collections import deque
 from datetime import datetime
 import config
+from stage_profiler import PROFILER
 
 class PerformanceMonitor:
     def __init__(self):
         self.fps_history = deque(maxlen=100)
         self.inference_times = deque(maxlen=100)
+        self.tracker_times = deque(maxlen=100)
+        self.inference_flags = deque(maxlen=100)  # True = detector ran, False = results reused
+        self.capture_latencies = deque(maxlen=100)  # Capture-to-processing delay (seconds)
+        self.dropped_frames = 0
+        self.pipeline_stats = None  # Latest queue depths and stage occupancy
+        self.pacing_stats = None  # Latest achieved cadence and missed deadlines
+        self.feed_stats = None  # Latest multi-feed scheduler and per-feed statistics
+        self.tile_stats = None  # Latest tiled-inference tile counts and timing (None when tiling is off)
+        self.cascade_stats = None  # Latest cascade escalation rate and per-stage cost (None when off)
         self.cpu_usage = deque(maxlen=100)
         self.memory_usage = deque(maxlen=100)
         self.gpu_usage = deque(maxlen=100)
@@ -31,8 +41,8 @@ class PerformanceMonitor:
         self.cpu_count = psutil.cpu_count()
         self.memory_total = psutil.virtual_memory().total / (1024**3)  # GB
         
-        # GPU monitoring (if available)
-        self.gpu_available = self._check_gpu_availability()
+        # GPU monitoring (if available) - checked on the monitor thread so torch isn't imported at startup
+        self.gpu_available = False
     
     def _check_gpu_availability(self):
         """Check if GPU monitoring is available"""
@@ -59,6 +69,7 @@ class PerformanceMonitor:
     
     def _monitor_loop(self):
         """Main monitoring loop"""
+        self.gpu_available = self._check_gpu_availability()
         while self.monitoring:
             try:
                 # CPU usage
@@ -112,6 +123,49 @@ class PerformanceMonitor:
         if inference_time is not None:
             self.inference_times.append(inference_time)
     
+    def record_tracker_time(self, tracker_time):
+        """Record per-frame tracker cost (seconds), kept separate from inference time"""
+        self.tracker_times.append(tracker_time)
+
+    def record_capture(self, latency, dropped=0):
+        """Record how long a frame waited after capture and how many were dropped before it"""
+        self.capture_latencies.append(latency)
+        self.dropped_frames += dropped
+
+    def record_pipeline(self, pipeline_stats):
+        """Record a snapshot of pipeline queue depths and stage occupancy"""
+        self.pipeline_stats = pipeline_stats
+
+    def record_pacing(self, pacing_stats):
+        """Record a snapshot of frame pacing (cadence and missed deadlines)"""
+        self.pacing_stats = pacing_stats
+
+    def record_feeds(self, feed_stats):
+        """Record a snapshot of multi-feed scheduling (None when multi-feed is off)"""
+        self.feed_stats = feed_stats
+
+    def record_tiling(self, tile_stats):
+        """Record a snapshot of tiled inference (None when tiling is off)"""
+        self.tile_stats = tile_stats
+
+    def record_cascade(self, cascade_stats):
+        """Record a snapshot of cascade escalation (None when cascade mode is off)"""
+        self.cascade_stats = cascade_stats
+
+    def record_inference(self, inferred):
+        """Record whether the detector ran on a frame or its last results were reused"""
+        self.inference_flags.append(bool(inferred))
+
+    def get_skip_ratio(self):
+        """Fraction of recent frames that reused detections instead of running the detector"""
+        if not self.inference_flags:
+            return 0
+        return 1 - sum(self.inference_flags) / len(self.inference_flags)
+
+    def get_inference_fps(self):
+        """Effective detector passes per second"""
+        return self.get_current_fps() * (1 - self.get_skip_ratio())
+
     def get_current_fps(self):
         """Get current FPS"""
         return self.fps_history[-1] if self.fps_history else 0
@@ -133,7 +187,12 @@ class PerformanceMonitor:
             'cpu_usage': self.cpu_usage[-1] if self.cpu_usage else 0,
             'memory_usage': self.memory_usage[-1] if self.memory_usage else 0,
             'gpu_usage': self.gpu_usage[-1] if self.gpu_usage else 0,
-            'avg_inference_time': self._get_avg_inference_time()
+            'avg_inference_time': self._get_avg_inference_time(),
+            'avg_tracker_time': self._get_avg_tracker_time(),
+            'inference_fps': self.get_inference_fps(),
+            'skip_ratio': self.get_skip_ratio(),
+            'avg_capture_latency': self._get_avg_capture_latency(),
+            'dropped_frames': self.dropped_frames
         }
         return stats
     
@@ -144,6 +203,20 @@ class PerformanceMonitor:
         recent_times = list(self.inference_times)[-30:]  # Last 30 frames
         return (sum(recent_times) / len(recent_times)) * 1000  # Convert to ms
     
+    def _get_avg_tracker_time(self):
+        """Get average tracker time in milliseconds"""
+        if not self.tracker_times:
+            return 0
+        recent_times = list(self.tracker_times)[-30:]  # Last 30 frames
+        return (sum(recent_times) / len(recent_times)) * 1000  # Convert to ms
+
+    def _get_avg_capture_latency(self):
+        """Get average capture-to-processing delay in milliseconds"""
+        if not self.capture_latencies:
+            return 0
+        recent_times = list(self.capture_latencies)[-30:]  # Last 30 frames
+        return (sum(recent_times) / len(recent_times)) * 1000  # Convert to ms
+
     def get_performance_summary(self):
         """Get formatted performance summary"""
         stats = self.get_current_stats()
@@ -157,6 +230,9 @@ class PerformanceMonitor:
 🎯 Current FPS: {stats['fps']:.1f}
 📈 Average FPS: {stats['avg_fps']:.1f}
 ⚡ Inference Time: {stats['avg_inference_time']:.1f}ms
+📍 Tracker Time: {stats['avg_tracker_time']:.1f}ms
+🧠 Inference FPS: {stats['inference_fps']:.1f} (skipped {stats['skip_ratio']:.0%})
+📷 Capture Latency: {stats['avg_capture_latency']:.1f}ms (dropped {stats['dropped_frames']:,})
 
 💻 System Resources:
    CPU Usage: {stats['cpu_usage']:.1f}%
@@ -169,8 +245,59 @@ class PerformanceMonitor:
    GPU Available: {'Yes' if self.gpu_available else 'No'}
 ═══════════════════════════════════════
         """
-        return summary.strip()
+        summary = summary.strip()
+        if self.pacing_stats:
+            pacing = self.pacing_stats
+            summary += (f"\n🎞️ Pacing ({pacing['mode']}): {pacing['cadence_fps']:.1f} FPS, "
+                        f"missed {pacing['missed_deadlines']:,} deadlines "
+                        f"(avg {pacing['avg_lateness_ms']:.0f}ms late)")
+        if self.tile_stats:
+            summary += "\n" + self._format_tiling(self.tile_stats)
+        if self.cascade_stats:
+            cascade = self.cascade_stats
+            summary += (f"\n🪜 Cascade ({cascade['gate_model']} → {cascade['final_model']}): "
+                        f"escalated {cascade['escalation_rate']:.0%} of {cascade['frames']:,} frames, "
+                        f"gate {cascade['avg_gate_ms']:.1f}ms, final {cascade['avg_final_ms_when_escalated']:.1f}ms "
+                        f"when escalated, avg {cascade['avg_cost_ms']:.1f}ms/frame")
+        if self.pipeline_stats:
+            summary += "\n\n" + self._format_pipeline(self.pipeline_stats)
+        if self.feed_stats:
+            summary += "\n\n" + self._format_feeds(self.feed_stats)
+        if PROFILER.enabled:
+            summary += "\n\n" + PROFILER.get_summary()
+        return summary
     
+    def _format_pipeline(self, pipeline_stats):
+        """Format stage occupancy and queue depths"""
+        lines = ["🔀 Pipeline (stage busy, queue depth):"]
+        for name, stage in pipeline_stats['stages'].items():
+            lines.append(f"   {name:<10} {stage['occupancy']:5.0%} busy")
+        for name, queue in pipeline_stats['queues'].items():
+            lines.append(f"   → {name:<8} {queue['depth']}/{queue['maxsize']} ({queue['policy']}, "
+                         f"avg {queue['avg_depth']:.1f}, dropped {queue['dropped']:,})")
+        return "\n".join(lines)
+
+    def _format_tiling(self, tile_stats):
+        """Format tiles run/skipped and per-tile cost"""
+        per_tile = tile_stats.get('per_tile_ms') or []
+        avg_tile = sum(per_tile) / len(per_tile) if per_tile else 0
+        return (f"🧩 Tiling ({tile_stats['tile_size']}px, {tile_stats['overlap']:.0%} overlap): "
+                f"{tile_stats.get('tiles_run', 0)}/{tile_stats.get('tiles_total', 0)} tiles run "
+                f"(skipped {tile_stats.get('tiles_skipped_flat', 0)} flat, "
+                f"{tile_stats.get('tiles_skipped_static', 0)} static), "
+                f"batch {tile_stats['avg_batch_ms']:.1f}ms, {avg_tile:.1f}ms/tile, "
+                f"merge {tile_stats.get('merge_ms', 0):.1f}ms")
+
+    def _format_feeds(self, feed_stats):
+        """Format per-feed FPS, latency and drops"""
+        lines = [f"🛰️ Feeds (avg batch {feed_stats['avg_batch_size']:.1f}/{feed_stats['batch_size']}, "
+                 f"{feed_stats['avg_batch_time']:.1f}ms):"]
+        for feed in feed_stats['feeds']:
+            lines.append(f"   {feed['name']:<10} {feed['fps']:5.1f} FPS  {feed['avg_latency_ms']:5.0f}ms  "
+                         f"dropped {feed['dropped']:,}  weight {feed['weight']:.1f}"
+                         f"{'  🚨' if feed['alert'] else ''}")
+        return "\n".join(lines)
+
     def _format_uptime(self, seconds):
         """Format uptime in human readable format"""
         hours = int(seconds // 3600)
@@ -201,9 +328,19 @@ class PerformanceMonitor:
         """Reset all performance statistics"""
         self.fps_history.clear()
         self.inference_times.clear()
+        self.tracker_times.clear()
+        self.inference_flags.clear()
+        self.capture_latencies.clear()
+        self.dropped_frames = 0
+        self.pipeline_stats = None
+        self.pacing_stats = None
+        self.feed_stats = None
+        self.tile_stats = None
+        self.cascade_stats = None
         self.cpu_usage.clear()
         self.memory_usage.clear()
         self.gpu_usage.clear()
+        PROFILER.reset()
         
         self.frame_count = 0
         self.start_time = time.time()
@@ -235,11 +372,18 @@ class PerformanceMonitor:
                 'performance_data': {
                     'fps_history': list(self.fps_history),
                     'inference_times': list(self.inference_times),
+                    'tracker_times': list(self.tracker_times),
                     'cpu_usage': list(self.cpu_usage),
                     'memory_usage': list(self.memory_usage),
                     'gpu_usage': list(self.gpu_usage)
                 },
-                'current_stats': self.get_current_stats()
+                'current_stats': self.get_current_stats(),
+                'pipeline': self.pipeline_stats,
+                'pacing': self.pacing_stats,
+                'feeds': self.feed_stats,
+                'tiling': self.tile_stats,
+                'cascade': self.cascade_stats,
+                'stage_profile': PROFILER.get_stats()
             }
             
             with open(filepath, 'w') as f:
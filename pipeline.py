@@ -0,0 +1,211 @@
+"""
+DivyaDrishti Processing Pipeline
+Stages connected by bounded queues with block / drop / coalesce backpressure
+"""
+
+import threading
+import time
+from collections import deque
+import config
+
+BACKPRESSURE_POLICIES = ("block", "drop", "coalesce")
+
+class StageQueue:
+    """Bounded queue between two stages
+
+    When full, "block" makes the producer wait (lossless), "drop" discards the
+    new item and "coalesce" discards the oldest so the newest always gets in.
+    get() returns None once the queue is closed and drained.
+    """
+
+    def __init__(self, name, maxsize=None, policy="block"):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}', expected one of {BACKPRESSURE_POLICIES}")
+        self.name = name
+        self.maxsize = maxsize or config.PIPELINE_QUEUE_SIZE
+        self.policy = policy
+        self.items = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Statistics
+        self.put_count = 0
+        self.dropped = 0
+        self.depths = deque(maxlen=100)  # Depth seen by each put
+
+    def put(self, item):
+        """Add an item according to the policy; returns False if it was dropped"""
+        with self.condition:
+            if self.closed:
+                return False
+            self.depths.append(len(self.items))
+
+            if len(self.items) >= self.maxsize:
+                if self.policy == "block":
+                    self.condition.wait_for(lambda: len(self.items) < self.maxsize or self.closed)
+                    if self.closed:
+                        return False
+                elif self.policy == "drop":
+                    self.dropped += 1
+                    return False
+                else:
+                    self.items.popleft()
+                    self.dropped += 1
+
+            self.items.append(item)
+            self.put_count += 1
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Take the oldest item; None once closed and drained
+
+        Raises TimeoutError if nothing arrives within timeout.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items or self.closed, timeout=timeout):
+                raise TimeoutError(f"Queue '{self.name}' is empty")
+            if not self.items:
+                return None
+            item = self.items.popleft()
+            self.condition.notify_all()
+            return item
+
+    def close(self):
+        """Stop accepting items and wake all waiters (remaining items can still be taken)"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get_stats(self):
+        """Get depth and drop statistics"""
+        with self.condition:
+            depths = list(self.depths)
+            return {
+                'policy': self.policy,
+                'depth': len(self.items),
+                'maxsize': self.maxsize,
+                'avg_depth': sum(depths) / len(depths) if depths else 0,
+                'items': self.put_count,
+                'dropped': self.dropped
+            }
+
+class PipelineStage:
+    """Applies func to every item of its input and forwards non-None results to its outputs
+
+    The input is anything with get(timeout) that returns None at the end and
+    raises TimeoutError when empty: a StageQueue, or a FrameCapture through
+    its get() alias of read(). Non-threaded stages are driven by calling
+    process() from their owner, e.g. a Tk after() callback on the main thread.
+    """
+
+    def __init__(self, name, func, input_queue, outputs=(), threaded=True):
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.outputs = list(outputs)
+        self.threaded = threaded
+        self.thread = None
+        self.running = False
+        self.finished = False
+
+        # Occupancy: share of wall time spent inside func
+        self.items = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.window_start = time.perf_counter()
+
+    def start(self):
+        """Start the stage thread (non-threaded stages only become runnable)"""
+        self.running = True
+        if self.threaded:
+            self.thread = threading.Thread(target=self._run, name=f"stage-{self.name}", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the stage after its current item"""
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+
+    def _run(self):
+        """Thread body"""
+        while self.running and self.process(timeout=0.1):
+            pass
+
+    def process(self, timeout=None):
+        """Handle one input item; returns False once the input has ended"""
+        if self.finished:
+            return False
+        try:
+            item = self.input_queue.get(timeout=timeout)
+        except TimeoutError:
+            return True
+
+        if item is None:
+            self.finished = True
+            for output in self.outputs:
+                output.close()
+            return False
+
+        start_time = time.perf_counter()
+        try:
+            result = self.func(item)
+        except Exception as e:
+            self.errors += 1
+            print(f"✗ Pipeline stage '{self.name}' error: {e}")
+            result = None
+        self.busy_time += time.perf_counter() - start_time
+        self.items += 1
+
+        if result is not None:
+            for output in self.outputs:
+                output.put(result)
+        return True
+
+    def get_stats(self):
+        """Get occupancy since the previous call"""
+        now = time.perf_counter()
+        occupancy = self.busy_time / max(now - self.window_start, 1e-9)
+        self.busy_time = 0.0
+        self.window_start = now
+        return {'occupancy': min(occupancy, 1.0), 'items': self.items, 'errors': self.errors}
+
+class Pipeline:
+    """A set of stages and the queues between them, started and stopped together"""
+
+    def __init__(self):
+        self.queues = {}
+        self.stages = {}
+
+    def add_queue(self, name, maxsize=None, policy=None):
+        """Create a queue (policy defaults to config.PIPELINE_POLICIES, then "block")"""
+        policy = policy or config.PIPELINE_POLICIES.get(name, "block")
+        queue = StageQueue(name, maxsize, policy)
+        self.queues[name] = queue
+        return queue
+
+    def add_stage(self, name, func, input_queue, outputs=(), threaded=True):
+        """Create a stage reading input_queue"""
+        stage = PipelineStage(name, func, input_queue, outputs, threaded)
+        self.stages[name] = stage
+        return stage
+
+    def start(self):
+        """Start every stage"""
+        for stage in self.stages.values():
+            stage.start()
+
+    def stop(self):
+        """Close all queues (unblocking producers and consumers) and stop every stage"""
+        for queue in self.queues.values():
+            queue.close()
+        for stage in self.stages.values():
+            stage.stop()
+
+    def get_stats(self):
+        """Get queue depths and stage occupancy"""
+        return {
+            'queues': {name: queue.get_stats() for name, queue in self.queues.items()},
+            'stages': {name: stage.get_stats() for name, stage in self.stages.items()}
+        }
@@ -0,0 +1,123 @@
+"""
+DivyaDrishti Frame Preprocessing
+Letterbox, BGR-to-RGB and normalization into reused per-shape buffers
+"""
+
+import math
+import cv2
+import numpy as np
+import torch
+import config
+
+class FramePreprocessor:
+    def __init__(self, device="cpu", stride=32, pad_color=114):
+        self.device = device
+        self.stride = stride
+        self.pad_color = pad_color
+
+        # (frame_h, frame_w, imgsz, rect) -> reusable buffers and letterbox geometry
+        self.plans = {}
+
+        # Debug counters: buffers allocated in total and during the last frame
+        self.allocations = 0
+        self.last_frame_allocations = 0
+        self.frames = 0
+
+    def _plan(self, frame_shape, imgsz, rect):
+        """Get (and on first use allocate) the buffers for a frame shape and input size"""
+        height, width = frame_shape[:2]
+        key = (height, width, imgsz, rect)
+        plan = self.plans.get(key)
+        if plan is not None:
+            return plan
+
+        scale = min(imgsz / height, imgsz / width)
+        new_width, new_height = int(round(width * scale)), int(round(height * scale))
+        if rect:
+            # Smallest stride-aligned canvas, like ultralytics' auto letterbox
+            input_width = math.ceil(new_width / self.stride) * self.stride
+            input_height = math.ceil(new_height / self.stride) * self.stride
+        else:
+            input_width = input_height = imgsz
+        pad_x, pad_y = (input_width - new_width) // 2, (input_height - new_height) // 2
+
+        # Border stays at pad_color; only the image area is rewritten each frame
+        padded = np.full((input_height, input_width, 3), self.pad_color, dtype=np.uint8)
+        plan = {
+            'scale': scale,
+            'pad': (pad_x, pad_y),
+            'resize_to': (new_width, new_height),
+            'resized': np.empty((new_height, new_width, 3), dtype=np.uint8),
+            'padded': padded,
+            'image_area': padded[pad_y:pad_y + new_height, pad_x:pad_x + new_width],
+            'host': torch.from_numpy(padded),
+            'input': torch.empty((1, 3, input_height, input_width), dtype=torch.float32, device=self.device)
+        }
+        if self.device != "cpu":
+            plan['staging'] = torch.empty((input_height, input_width, 3), dtype=torch.uint8,
+                                          device=self.device)
+
+        allocated = 4 if self.device != "cpu" else 3
+        self.allocations += allocated
+        self.last_frame_allocations += allocated
+        if config.PREPROCESS_DEBUG and self.frames > 0:
+            print(f"⚠️ Preprocessing allocated {allocated} buffers for new shape "
+                  f"{width}x{height} -> {input_width}x{input_height}")
+
+        self.plans[key] = plan
+        return plan
+
+    def prepare(self, frame, imgsz, rect=True):
+        """Letterbox frame into a reused (1, 3, H, W) RGB 0-1 tensor
+
+        Returns (tensor, scale, (pad_x, pad_y)) for mapping boxes back with restore().
+        The tensor is overwritten by the next call with the same shape.
+        """
+        self.last_frame_allocations = 0
+        plan = self._plan(frame.shape, imgsz, rect)
+
+        if plan['resize_to'] == (frame.shape[1], frame.shape[0]):
+            np.copyto(plan['image_area'], frame)
+        else:
+            cv2.resize(frame, plan['resize_to'], dst=plan['resized'], interpolation=cv2.INTER_LINEAR)
+            np.copyto(plan['image_area'], plan['resized'])
+
+        source = plan['host']
+        if self.device != "cpu":
+            plan['staging'].copy_(source, non_blocking=True)
+            source = plan['staging']
+
+        # BGR HWC uint8 -> RGB CHW float, channel by channel into the preallocated input
+        tensor = plan['input']
+        for channel in range(3):
+            tensor[0, channel].copy_(source[:, :, 2 - channel])
+        tensor.mul_(1.0 / 255.0)
+
+        self.frames += 1
+        return tensor, plan['scale'], plan['pad']
+
+    def restore(self, detections, scale, pad, frame_shape):
+        """Map letterboxed boxes (and mask polygons) back to original frame coordinates"""
+        if len(detections) == 0:
+            return detections
+
+        height, width = frame_shape[:2]
+        pad_x, pad_y = pad
+        xyxy = (detections.xyxy - np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)) / scale
+        np.clip(xyxy, 0, [width, height, width, height], out=xyxy)
+
+        for polygon in detections.extras.get('polygon', ()):
+            polygon -= np.array([pad_x, pad_y], dtype=np.float32)
+            polygon /= scale
+
+        return type(detections)(xyxy, detections.conf, detections.cls, detections.class_names,
+                                **detections.extras)
+
+    def get_stats(self):
+        """Get buffer statistics"""
+        return {
+            'buffer_shapes': len(self.plans),
+            'allocations': self.allocations,
+            'last_frame_allocations': self.last_frame_allocations,
+            'frames': self.frames
+        }
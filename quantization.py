@@ -0,0 +1,242 @@
+"""
+DivyaDrishti INT8 Quantization
+Builds INT8 ONNX variants calibrated on recorded footage for CPU-only deployments
+
+Usage:
+  python quantization.py [model_key ...]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+import cv2
+import numpy as np
+from ultralytics import YOLO
+import config
+import utils
+from detections import Detections
+from inference_backends import OnnxBackend, get_model_task, resolve_weights_path
+
+QUANTIZED_SUFFIX = "_int8"
+
+def get_manifest_path():
+    """Get the path of the quantized model manifest"""
+    return Path(config.EXPORT_CACHE_DIR) / "quantized_models.json"
+
+def load_manifest():
+    """Load measured results for all built INT8 variants"""
+    manifest_path = get_manifest_path()
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read quantization manifest: {e}")
+        return {}
+
+def save_manifest(manifest):
+    """Save the quantized model manifest"""
+    manifest_path = get_manifest_path()
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+def get_quantized_variants(available_models=None):
+    """Get model entries for built INT8 variants, ready to merge into AVAILABLE_MODELS"""
+    if available_models is None:
+        available_models = config.AVAILABLE_MODELS
+
+    variants = {}
+    for base_key, record in load_manifest().items():
+        base_info = available_models.get(base_key)
+        if base_info is None or not Path(record['artifact']).exists():
+            continue
+
+        info = dict(base_info)
+        info.update({
+            "name": f"{base_info['name']} INT8",
+            "description": f"CPU INT8 {record['speedup']:.1f}x, "
+                           f"accuracy {-record['accuracy_delta'] * 100:+.1f}%",
+            "path": record['artifact'],
+            "base_model": base_key,
+            "quantization": record
+        })
+        variants[base_key + QUANTIZED_SUFFIX] = info
+    return variants
+
+def sample_calibration_frames(num_frames=None, video_dir=None):
+    """Sample frames evenly across the recorded videos"""
+    num_frames = num_frames or config.QUANTIZATION_CALIBRATION_FRAMES
+    videos = utils.list_video_files(video_dir or config.SAVED_VIDEOS_DIR)
+    if not videos:
+        return []
+
+    frames = []
+    per_video = max(1, num_frames // len(videos))
+    for video in videos:
+        cap = cv2.VideoCapture(str(video))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or per_video
+        for index in np.linspace(0, max(total - 1, 0), per_video).astype(int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ret, frame = cap.read()
+            if ret and frame is not None:
+                frames.append(frame)
+        cap.release()
+
+    print(f"✓ Sampled {len(frames)} calibration frames from {len(videos)} videos")
+    return frames[:num_frames]
+
+def preprocess_for_onnx(frame, imgsz):
+    """Letterbox, BGR to RGB, HWC to NCHW and scale to 0-1 like the ultralytics predictor"""
+    image, _, _ = utils.letterbox_image(frame, imgsz)
+    image = image[:, :, ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(image, dtype=np.float32)[None] / 255.0
+
+def _make_calibration_reader(frames, input_name, imgsz):
+    """Build an ONNX Runtime calibration reader over recorded frames"""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self.batches = iter([{input_name: preprocess_for_onnx(frame, imgsz)} for frame in frames])
+
+        def get_next(self):
+            return next(self.batches, None)
+
+    return FrameCalibrationReader()
+
+def _copy_metadata(source_path, target_path):
+    """Copy ultralytics metadata (names, stride, imgsz) into the quantized model"""
+    import onnx
+
+    source = onnx.load(str(source_path))
+    target = onnx.load(str(target_path))
+    del target.metadata_props[:]
+    target.metadata_props.extend(source.metadata_props)
+    onnx.save(target, str(target_path))
+
+def benchmark_model(model, frames, imgsz):
+    """Get mean latency in ms and per-frame detections"""
+    model(frames[0], imgsz=imgsz, verbose=False)  # warm-up
+
+    outputs = []
+    start_time = time.perf_counter()
+    for frame in frames:
+        outputs.append(Detections.from_result(
+            model(frame, conf=config.CONFIDENCE_THRESHOLD, imgsz=imgsz, verbose=False)[0]))
+    return (time.perf_counter() - start_time) / len(frames) * 1000, outputs
+
+def detection_agreement(reference, candidate, iou_threshold=0.5):
+    """F1 agreement of candidate detections with reference detections over many frames"""
+    matched = 0
+    reference_total = 0
+    candidate_total = 0
+    for ref, cand in zip(reference, candidate):
+        reference_total += len(ref)
+        candidate_total += len(cand)
+        if len(ref) == 0 or len(cand) == 0:
+            continue
+
+        ious = utils.calculate_box_iou_matrix(ref.xyxy, cand.xyxy)
+        ious[ref.cls[:, None] != cand.cls[None, :]] = 0
+
+        # Greedy one-to-one matching, best pairs first
+        for _ in range(min(len(ref), len(cand))):
+            i, j = np.unravel_index(ious.argmax(), ious.shape)
+            if ious[i, j] < iou_threshold:
+                break
+            matched += 1
+            ious[i, :] = 0
+            ious[:, j] = 0
+
+    if reference_total + candidate_total == 0:
+        return 1.0
+    return 2 * matched / (reference_total + candidate_total)
+
+def quantize_model(model_key, frames=None):
+    """Build, measure and register an INT8 variant of a model"""
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+    import onnxruntime
+
+    model_info = config.AVAILABLE_MODELS[model_key]
+    imgsz = config.EXPORT_IMGSZ
+
+    frames = frames if frames is not None else sample_calibration_frames()
+    if not frames:
+        print(f"✗ No calibration frames - record footage into {config.SAVED_VIDEOS_DIR} first")
+        return None
+
+    print(f"🔧 Quantizing {model_info['name']} to INT8...")
+
+    # FP32 ONNX export is shared with the ONNX backend cache
+    backend = OnnxBackend(imgsz)
+    weights_hash = utils.calculate_file_hash(resolve_weights_path(model_info))
+    fp32_path = backend.get_artifact(model_key, model_info, weights_hash)
+    int8_path = backend.artifact_dir(model_key, weights_hash) / f"{fp32_path.stem}{QUANTIZED_SUFFIX}.onnx"
+
+    input_name = onnxruntime.InferenceSession(str(fp32_path), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    calibration_frames = frames[:config.QUANTIZATION_CALIBRATION_FRAMES]
+
+    start_time = time.perf_counter()
+    quantize_static(str(fp32_path), str(int8_path),
+                    _make_calibration_reader(calibration_frames, input_name, imgsz),
+                    quant_format=QuantFormat.QDQ,
+                    per_channel=True,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8)
+    _copy_metadata(fp32_path, int8_path)
+    build_time = time.perf_counter() - start_time
+
+    # Measure on the CPU against the FP32 ONNX reference
+    task = get_model_task(model_info)
+    benchmark_frames = frames[:config.QUANTIZATION_BENCHMARK_FRAMES]
+    fp32_ms, fp32_detections = benchmark_model(YOLO(str(fp32_path), task=task), benchmark_frames, imgsz)
+    int8_ms, int8_detections = benchmark_model(YOLO(str(int8_path), task=task), benchmark_frames, imgsz)
+    agreement = detection_agreement(fp32_detections, int8_detections)
+
+    record = {
+        'artifact': str(int8_path),
+        'fp32_artifact': str(fp32_path),
+        'weights_sha256': weights_hash,
+        'imgsz': imgsz,
+        'calibration_frames': len(calibration_frames),
+        'fp32_ms': fp32_ms,
+        'int8_ms': int8_ms,
+        'speedup': fp32_ms / int8_ms if int8_ms > 0 else 0,
+        'agreement_f1': agreement,
+        'accuracy_delta': 1.0 - agreement,
+        'build_time': build_time,
+        'built_at': datetime.now().isoformat()
+    }
+
+    manifest = load_manifest()
+    manifest[model_key] = record
+    save_manifest(manifest)
+
+    print(f"✓ {model_info['name']} INT8: {fp32_ms:.1f}ms → {int8_ms:.1f}ms "
+          f"({record['speedup']:.2f}x), agreement with FP32 {agreement:.1%}")
+    return record
+
+def main():
+    """Quantize the requested models (default: QUANTIZATION_DEFAULT_MODELS)"""
+    model_keys = sys.argv[1:] or config.QUANTIZATION_DEFAULT_MODELS
+
+    frames = sample_calibration_frames()
+    if not frames:
+        print(f"✗ No videos found in {config.SAVED_VIDEOS_DIR}")
+        return
+
+    for model_key in model_keys:
+        if model_key not in config.AVAILABLE_MODELS:
+            print(f"✗ Unknown model key: {model_key}")
+            continue
+        try:
+            quantize_model(model_key, frames)
+        except Exception as e:
+            print(f"✗ Quantization failed for {model_key}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+DivyaDrishti Stage Profiler
+Named timing spans and counters for the capture -> infer -> annotate -> display -> log path
+"""
+
+import threading
+import time
+from collections import deque
+import config
+
+# Display order of the pipeline stages; anything else is listed after these
+STAGE_ORDER = ("capture", "preprocess", "forward", "postprocess", "track", "annotate",
+               "display", "log", "screenshot")
+
+class _NullSpan:
+    """Shared do-nothing span handed out while profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    """Times one `with` block into a profiler stage"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class StageProfiler:
+    """Per-stage timings (rolling window and totals) plus named counters
+
+    Disabled, span() returns a shared no-op context and record()/count() return
+    immediately, so instrumented code pays one attribute check per call site.
+    """
+
+    def __init__(self, enabled=None, window=None):
+        self.enabled = config.STAGE_PROFILING if enabled is None else enabled
+        self.window = window or config.STAGE_PROFILING_WINDOW
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all timings and counters"""
+        with self.lock:
+            self.durations = {}  # stage -> deque of recent durations (seconds)
+            self.totals = {}  # stage -> [calls, seconds]
+            self.counters = {}
+            self.start_time = time.perf_counter()
+
+    def set_enabled(self, enabled):
+        """Turn profiling on or off (statistics restart when turned on)"""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def span(self, name):
+        """Context manager timing a block into stage `name`"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        """Add a duration measured elsewhere (e.g. ultralytics' per-result speed)"""
+        if not self.enabled:
+            return
+        with self.lock:
+            times = self.durations.get(name)
+            if times is None:
+                times = self.durations[name] = deque(maxlen=self.window)
+                self.totals[name] = [0, 0.0]
+            times.append(seconds)
+            totals = self.totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def count(self, name, amount=1):
+        """Increment a named counter"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get_stats(self):
+        """Get per-stage latency (recent window) and share of wall time, plus counters"""
+        with self.lock:
+            elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+            names = [name for name in STAGE_ORDER if name in self.durations] + \
+                    sorted(name for name in self.durations if name not in STAGE_ORDER)
+            stages = {}
+            for name in names:
+                times = self.durations[name]
+                calls, total = self.totals[name]
+                stages[name] = {
+                    'calls': calls,
+                    'avg_ms': (sum(times) / len(times)) * 1000,
+                    'max_ms': max(times) * 1000,
+                    'total_s': total,
+                    'share': total / elapsed
+                }
+            return {'enabled': self.enabled, 'stages': stages, 'counters': dict(self.counters)}
+
+    def get_summary(self):
+        """Get the per-stage breakdown as text lines for the performance panel"""
+        stats = self.get_stats()
+        lines = ["🔬 Stage Breakdown (avg / max, share of wall time):"]
+        for name, stage in stats['stages'].items():
+            lines.append(f"   {name:<12} {stage['avg_ms']:6.1f}ms / {stage['max_ms']:6.1f}ms  "
+                         f"{stage['share']:5.1%}")
+        if len(lines) == 1:
+            lines.append("   (no samples yet)")
+        if stats['counters']:
+            lines.append("   " + ", ".join(f"{name}: {value:,}" for name, value in stats['counters'].items()))
+        return "\n".join(lines)
+
+# Shared by the detector, the GUI loop and the performance monitor
+PROFILER = StageProfiler()
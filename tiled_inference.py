@@ -0,0 +1,154 @@
+"""
+DivyaDrishti Tiled Inference
+Overlapping tile planning, tile skipping and cross-tile merging for high-resolution feeds
+"""
+
+import time
+from collections import deque
+import cv2
+import numpy as np
+import torch
+import torchvision
+import config
+from detections import Detections
+
+class TiledInference:
+    def __init__(self, tile_size=None, overlap=None):
+        self.tile_size = tile_size or config.TILE_SIZE
+        self.overlap = overlap if overlap is not None else config.TILE_OVERLAP
+        self.include_full_frame = config.TILE_INCLUDE_FULL_FRAME
+        self.min_texture = config.TILE_MIN_TEXTURE
+        self.min_motion = config.TILE_MIN_MOTION
+        self.refresh_interval = config.TILE_REFRESH_INTERVAL
+        self.analysis_scale = config.TILE_ANALYSIS_SCALE
+
+        # Tile plan cache keyed by frame size
+        self.tile_plans = {}
+
+        # Per-tile state for skipping static, empty tiles
+        self.prev_gray = None
+        self.tile_had_detections = {}
+        self.tile_last_run = {}
+        self.frame_index = 0
+
+        # Timing statistics
+        self.last_stats = {}
+        self.batch_times = deque(maxlen=100)
+
+    def configure(self, tile_size=None, overlap=None):
+        """Change tile size or overlap"""
+        if tile_size is not None:
+            self.tile_size = int(tile_size)
+        if overlap is not None:
+            self.overlap = float(overlap)
+        self.reset()
+
+    def reset(self):
+        """Forget cached plans and per-tile state"""
+        self.tile_plans.clear()
+        self.prev_gray = None
+        self.tile_had_detections.clear()
+        self.tile_last_run.clear()
+        self.frame_index = 0
+
+    def plan_tiles(self, width, height):
+        """Get overlapping (x1, y1, x2, y2) tiles covering a frame"""
+        key = (width, height)
+        if key not in self.tile_plans:
+            stride = max(1, int(self.tile_size * (1 - self.overlap)))
+            self.tile_plans[key] = [
+                (x, y, min(x + self.tile_size, width), min(y + self.tile_size, height))
+                for y in self._tile_starts(height, stride)
+                for x in self._tile_starts(width, stride)
+            ]
+        return self.tile_plans[key]
+
+    def _tile_starts(self, length, stride):
+        """Get tile start offsets along one axis, with the last tile flush to the edge"""
+        last = max(length - self.tile_size, 0)
+        starts = list(range(0, last + 1, stride))
+        if starts[-1] != last:
+            starts.append(last)
+        return starts
+
+    def select_tiles(self, frame, tiles):
+        """Drop tiles with no texture, and static tiles that were empty last time they ran"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, None, fx=self.analysis_scale, fy=self.analysis_scale,
+                           interpolation=cv2.INTER_AREA)
+
+        motion = None
+        if self.prev_gray is not None and self.prev_gray.shape == small.shape:
+            motion = cv2.absdiff(small, self.prev_gray)
+        self.prev_gray = small
+
+        run_tiles = []
+        skipped_flat = 0
+        skipped_static = 0
+        for tile in tiles:
+            x1, y1, x2, y2 = (int(v * self.analysis_scale) for v in tile)
+            region = small[y1:max(y2, y1 + 1), x1:max(x2, x1 + 1)]
+
+            if region.size > 0 and region.std() < self.min_texture:
+                skipped_flat += 1
+                continue
+
+            stale = self.frame_index - self.tile_last_run.get(tile, -self.refresh_interval) >= self.refresh_interval
+            if motion is not None and not stale and not self.tile_had_detections.get(tile, True):
+                if motion[y1:max(y2, y1 + 1), x1:max(x2, x1 + 1)].mean() < self.min_motion:
+                    skipped_static += 1
+                    continue
+
+            run_tiles.append(tile)
+
+        self.last_stats = {
+            'tiles_total': len(tiles),
+            'tiles_run': len(run_tiles),
+            'tiles_skipped_flat': skipped_flat,
+            'tiles_skipped_static': skipped_static
+        }
+        return run_tiles
+
+    def merge(self, run_tiles, tile_detections, class_names, iou_threshold=None):
+        """Shift tile detections into frame coordinates and suppress cross-tile duplicates"""
+        start_time = time.perf_counter()
+        if iou_threshold is None:
+            iou_threshold = config.IOU_THRESHOLD
+
+        # Full-frame view (if any) is the last item and needs no offset.
+        # Boxes are shifted before concatenation so the merged area/center are in frame space.
+        offsets = [(tile[0], tile[1]) for tile in run_tiles]
+        offsets += [(0, 0)] * (len(tile_detections) - len(offsets))
+        for detections, (dx, dy) in zip(tile_detections, offsets):
+            if len(detections) > 0:
+                detections.xyxy += np.array([dx, dy, dx, dy], dtype=np.float32)
+
+        merged = Detections.concatenate(tile_detections, class_names)
+        if len(merged) > 0:
+            keep = torchvision.ops.batched_nms(torch.from_numpy(merged.xyxy),
+                                               torch.from_numpy(merged.conf),
+                                               torch.from_numpy(merged.cls.astype(np.int64)),
+                                               iou_threshold)
+            merged = merged[keep[:config.MAX_DETECTIONS].numpy()]
+
+        self.last_stats['merge_ms'] = (time.perf_counter() - start_time) * 1000
+        return merged
+
+    def record(self, run_tiles, tile_detections, results, batch_time):
+        """Remember which tiles produced detections and collect per-tile timing"""
+        for tile, detections in zip(run_tiles, tile_detections):
+            self.tile_had_detections[tile] = len(detections) > 0
+            self.tile_last_run[tile] = self.frame_index
+        self.frame_index += 1
+
+        self.batch_times.append(batch_time)
+        self.last_stats['batch_ms'] = batch_time * 1000
+        self.last_stats['per_tile_ms'] = [sum(v for v in result.speed.values() if v) for result in results]
+
+    def get_stats(self):
+        """Get tiling statistics for the last frame and recent batch timing"""
+        stats = dict(self.last_stats)
+        stats['tile_size'] = self.tile_size
+        stats['overlap'] = self.overlap
+        stats['avg_batch_ms'] = (sum(self.batch_times) / len(self.batch_times)) * 1000 if self.batch_times else 0
+        return stats
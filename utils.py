@@ -5,6 +5,7 @@ Independent Hiking Trail Detection System
 
 import os
 import cv2
+import json
 import time
 import requests
 import numpy as np
@@ -203,3 +204,98 @@ def log_system_info():
     print(f"Detection Mode: {config.DETECTION_MODE.upper()}")
     print(f"Confidence Threshold: {config.CONFIDENCE_THRESHOLD}")
     print("=" * 60)
+
+def calculate_box_iou_matrix(boxes_a, boxes_b):
+    """Calculate pairwise IoU between two (N, 4) and (M, 4) xyxy box arrays"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return intersection / np.maximum(union, 1e-9)
+
+def calculate_file_hash(file_path, chunk_size=1024 * 1024):
+    """Calculate SHA-256 of a file"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def letterbox_image(image, new_size=640, color=(114, 114, 114)):
+    """Resize keeping aspect ratio and pad to a square, returns (image, scale, (pad_x, pad_y))"""
+    height, width = image.shape[:2]
+    scale = min(new_size / height, new_size / width)
+    new_width, new_height = int(round(width * scale)), int(round(height * scale))
+    pad_x, pad_y = (new_size - new_width) // 2, (new_size - new_height) // 2
+
+    if (new_width, new_height) != (width, height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    padded = np.full((new_size, new_size, 3), color, dtype=np.uint8)
+    padded[pad_y:pad_y + new_height, pad_x:pad_x + new_width] = image
+    return padded, scale, (pad_x, pad_y)
+
+def merge_overlapping_rects(rects):
+    """Union overlapping (x1, y1, x2, y2) rectangles until none overlap"""
+    rects = [list(rect) for rect in rects]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    rects[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    rects.pop(j)
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(rect) for rect in rects]
+
+def list_video_files(directory):
+    """List supported video files in a directory"""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return sorted(path for path in directory.iterdir()
+                  if path.is_file() and path.suffix.lower() in config.SUPPORTED_FORMATS)
+
+class PhaseTimer:
+    """Named phase timings measured from a common start (e.g. application startup)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """Record the time elapsed since start when a phase completes"""
+        elapsed = time.perf_counter() - self.start
+        self.phases.append((phase, elapsed))
+        print(f"⏱️ {self.name}: {phase} at {elapsed:.2f}s")
+        return elapsed
+
+    def save(self, log_file=None):
+        """Append the recorded phases as one JSON line"""
+        log_file = Path(log_file or config.STARTUP_LOG_FILE)
+        record = {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(),
+            'phases': {phase: round(elapsed, 4) for phase, elapsed in self.phases}
+        }
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"⚠️ Could not save {self.name} timings: {e}")
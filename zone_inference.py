@@ -0,0 +1,101 @@
+"""
+DivyaDrishti Zone Inference
+Polygon detection zones: ROI crops for inference, zone masks and confidence weights
+"""
+
+import cv2
+import numpy as np
+import config
+import utils
+from detections import Detections
+
+NO_ZONE = 255  # Zone map value for pixels outside every enabled zone
+
+class ZoneInference:
+    def __init__(self, zones=None):
+        self.configure(zones if zones is not None else config.DETECTION_ZONES)
+
+    def configure(self, zones):
+        """Set zone definitions (normalized polygons, weights, enabled flags)"""
+        # Disabled zones are dropped here so they never reach crops or masks
+        enabled = [(name, zone) for name, zone in zones.items() if zone.get("enabled", True)]
+        # Lowest weight first so higher-weight zones win where polygons overlap
+        enabled.sort(key=lambda item: item[1].get("weight", 1.0))
+
+        self.zones = zones
+        self.zone_names = [name for name, _ in enabled]
+        self.polygons = [np.asarray(zone["polygon"], dtype=np.float32).reshape(-1, 2) for _, zone in enabled]
+        self.weights = np.array([zone.get("weight", 1.0) for _, zone in enabled], dtype=np.float32)
+
+        # Plans are cached per frame size: (zone map, crop rectangles)
+        self.plans = {}
+        self.last_stats = {}
+
+    def set_zone_enabled(self, name, enabled):
+        """Enable or disable a single zone"""
+        zones = {key: dict(value) for key, value in self.zones.items()}
+        zones[name]["enabled"] = bool(enabled)
+        self.configure(zones)
+
+    def plan(self, width, height):
+        """Get the zone map and disjoint crop rectangles covering all enabled zones"""
+        key = (width, height)
+        if key in self.plans:
+            return self.plans[key]
+
+        scale = np.array([width, height], dtype=np.float32)
+        zone_map = np.full((height, width), NO_ZONE, dtype=np.uint8)
+        rects = []
+        for zone_id, polygon in enumerate(self.polygons):
+            points = np.round(polygon * scale).astype(np.int32)
+            cv2.fillPoly(zone_map, [points], zone_id)
+            x, y, w, h = cv2.boundingRect(points)
+            x1, y1 = max(0, x), max(0, y)
+            x2, y2 = min(width, x + w), min(height, y + h)
+            if x2 > x1 and y2 > y1:
+                rects.append([x1, y1, x2, y2])
+
+        self.plans[key] = (zone_map, utils.merge_overlapping_rects(rects))
+        return self.plans[key]
+
+    def get_crops(self, frame):
+        """Get the crop rectangles to run inference on for this frame"""
+        height, width = frame.shape[:2]
+        _, rects = self.plan(width, height)
+        return rects
+
+    def remap(self, crops, crop_detections, class_names):
+        """Shift per-crop detections into frame coordinates and join them"""
+        for item, (x1, y1, _, _) in zip(crop_detections, crops):
+            item.offset(x1, y1)
+        return Detections.concatenate(crop_detections, class_names)
+
+    def apply(self, detections, frame_shape):
+        """Drop boxes outside enabled zones, weight confidences and tag each box with its zone"""
+        height, width = frame_shape[:2]
+        zone_map, rects = self.plan(width, height)
+
+        if len(detections) == 0:
+            detections.with_extra('zone', np.zeros(0, dtype=object))
+        else:
+            # Zone membership by box center, looked up in the rasterized zone map
+            cx = np.clip(detections.center[:, 0].astype(np.int32), 0, width - 1)
+            cy = np.clip(detections.center[:, 1].astype(np.int32), 0, height - 1)
+            zone_ids = zone_map[cy, cx]
+            detections = detections.filter(zone_ids != NO_ZONE)
+            zone_ids = zone_ids[zone_ids != NO_ZONE]
+
+            detections.conf *= self.weights[zone_ids]
+            detections.with_extra('zone', np.array(self.zone_names, dtype=object)[zone_ids])
+
+        covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+        self.last_stats = {
+            'zones': list(self.zone_names),
+            'crops': len(rects),
+            'inferred_area_ratio': covered / float(width * height) if width * height else 0
+        }
+        return detections
+
+    def get_stats(self):
+        """Get zone statistics for the last frame"""
+        return dict(self.last_stats)